@@ -51,6 +51,29 @@ configuration.add('codegen', 'parametric', ['parametric', 'explicit'])
 # and will instead use the custom kernel
 configuration.add('jit-backdoor', 0, [0, 1], lambda i: bool(i), False)
 
+# How should Clusters be fused? Either greedily, whenever legal, or only if the
+# memory traffic does not increase according to a cost model
+configuration.add('fusion', 'greedy', ['greedy', 'traffic'])
+
+# How should the DSE eliminate common sub-expressions? Either in a single pass
+# over a hashed expression DAG, or through repeated counting of the redundancies
+configuration.add('cse', 'dag', ['dag', 'iterative'])
+
+# May the DSE trade bitwise reproducibility for performance? If 'relaxed', the
+# divisions by time-invariant sub-expressions become multiplications by
+# reciprocals, which are precomputed outside of the time loop
+configuration.add('dse-accuracy', 'strict', ['strict', 'relaxed'])
+
+# Should Operators keep the time-invariant Arrays produced by the DSE across runs?
+# If so, such Arrays are only recomputed when the data they depend on changes.
+# Note: changes made through `np.copyto`, plain `numpy.ndarray` views or the raw
+# data pointer go unnoticed; use item assignment (e.g., `f.data[:] = ...`) instead
+configuration.add('cache-invariants', 0, [0, 1], lambda i: bool(i))
+
+# Should the temporary Arrays be drawn from a pool of buffers reused across runs,
+# rather than being allocated and freed by the generated code at each run?
+configuration.add('pool-arrays', 0, [0, 1], lambda i: bool(i))
+
 # (Undocumented) escape hatch for cross-compilation
 configuration.add('cross-compile', None)
 
@@ -7,6 +7,8 @@ from mpmath.libmp import prec_to_dps, to_str
 from sympy import Function
 from sympy.printing.ccode import C99CodePrinter
 
+from devito.tools import bfloat16
+
 
 class Allocator(object):
 
@@ -155,11 +157,20 @@ class CodePrinter(C99CodePrinter):
     def _print_ListInitializer(self, expr):
         return "{%s}" % ', '.join([self._print(i) for i in expr.params])
 
+    def _print_DefFunction(self, expr):
+        arguments = [self._print(i) for i in expr.arguments]
+        return "%s(%s)" % (expr.name, ', '.join(arguments))
+
     def _print_IntDiv(self, expr):
+        if expr.lhs.is_Atom:
+            return expr.__str__()
+        # Parenthesize, or C's operator precedence would break the integer division
+        return "((%s) / %s)" % (self._print(expr.lhs), self._print(expr.rhs))
+
+    def _print_Byref(self, expr):
         return expr.__str__()
 
-    _print_Byref = _print_IntDiv
-    _print_IndexedPointer = _print_IntDiv
+    _print_IndexedPointer = _print_Byref
 
     def _print_TrigonometricFunction(self, expr):
         func_name = str(expr.func)
@@ -196,3 +207,93 @@ DOUBLE = Function('DOUBLE')
 FLOOR = Function('floor')
 
 cast_mapper = {np.float32: FLOAT, float: DOUBLE, np.float64: DOUBLE}
+
+
+# Conversions between compact storage data types and single precision
+
+HALF_CONVERSIONS = c.LiteralLines("""
+static inline float half_to_float(unsigned short h)
+{
+  union { unsigned int u; float f; } v;
+  unsigned int sign = (unsigned int)(h & 0x8000) << 16;
+  unsigned int exp = (h >> 10) & 0x1f;
+  unsigned int mant = h & 0x3ff;
+  if (exp == 0x1f)
+  {
+    v.u = sign | 0x7f800000 | (mant << 13);
+  }
+  else if (exp == 0)
+  {
+    v.f = mant*5.9604644775390625e-8F;
+    v.u |= sign;
+  }
+  else
+  {
+    v.u = sign | ((exp + 112) << 23) | (mant << 13);
+  }
+  return v.f;
+}
+
+static inline unsigned short float_to_half(float f)
+{
+  union { unsigned int u; float f; } v, magic;
+  unsigned int sign, o;
+  v.f = f;
+  sign = v.u & 0x80000000;
+  v.u ^= sign;
+  if (v.u >= 0x47800000)
+  {
+    o = v.u > 0x7f800000 ? 0x7e00 : 0x7c00;
+  }
+  else if (v.u < 0x38800000)
+  {
+    magic.u = 0x3f000000;
+    v.f += magic.f;
+    o = v.u - magic.u;
+  }
+  else
+  {
+    unsigned int odd = (v.u >> 13) & 1;
+    v.u += 0xc8000fff + odd;
+    o = v.u >> 13;
+  }
+  return (unsigned short)(o | (sign >> 16));
+}
+""")
+"""C routines converting IEEE 754 half precision values to and from single
+precision. Rounding is to the nearest, ties to even."""
+
+BF16_CONVERSIONS = c.LiteralLines("""
+static inline float bf16_to_float(unsigned short h)
+{
+  union { unsigned int u; float f; } v;
+  v.u = (unsigned int)h << 16;
+  return v.f;
+}
+
+static inline unsigned short float_to_bf16(float f)
+{
+  union { unsigned int u; float f; } v;
+  v.f = f;
+  if ((v.u & 0x7fffffff) > 0x7f800000)
+  {
+    return (unsigned short)((v.u >> 16) | 0x40);
+  }
+  v.u += 0x7fff + ((v.u >> 16) & 1);
+  return (unsigned short)(v.u >> 16);
+}
+""")
+"""C routines converting bfloat16 values to and from single precision. Rounding
+is to the nearest, ties to even."""
+
+
+def compact_conversions(dtype):
+    """
+    Return the names of the C routines converting values of the compact storage
+    data type ``dtype`` into single precision values and vice versa, as well as
+    the definition of such routines.
+    """
+    if dtype is bfloat16:
+        return 'bf16_to_float', 'float_to_bf16', BF16_CONVERSIONS
+    else:
+        return 'half_to_float', 'float_to_half', HALF_CONVERSIONS
@@ -362,6 +362,11 @@ def jit_compile(soname, code, compiler):
         The source code to be JIT compiled.
     compiler : Compiler
         The toolchain used for JIT compilation.
+
+    Returns
+    -------
+    bool
+        False if the shared object was found in the cache, True otherwise.
     """
     target = str(get_jit_dir().joinpath(soname))
     src_file = "%s.%s" % (target, compiler.src_ext)
@@ -408,6 +413,8 @@ def jit_compile(soname, code, compiler):
     else:
         debug("%s: cache hit `%s` [%.2f s]" % (compiler, src_file, toc-tic))
 
+    return recompiled
+
 
 def make(loc, args):
     """Invoke the ``make`` command from within ``loc`` with arguments ``args``."""
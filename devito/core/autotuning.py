@@ -10,6 +10,7 @@ from devito.mpi import MPI
 from devito.parameters import configuration
 from devito.symbolics import evaluate
 from devito.tools import filter_ordered, flatten, prod
+from devito.tracing import trace
 
 __all__ = ['autotune']
 
@@ -132,8 +133,10 @@ def autotune(operator, args, level, mode):
         timer = operator._profiler.timer.reset()
         at_args[operator._profiler.name] = timer
 
-        operator.cfunction(*list(at_args.values()))
-        elapsed = sum(getattr(timer._obj, k) for k, _ in timer._obj._fields_)
+        with trace('autotuning run', cat='autotuning',
+                   run=','.join('%s=%s' % (k, v) for k, v in mapper.items())):
+            operator.cfunction(*list(at_args.values()))
+        elapsed = sum(getattr(timer._obj, k) for k in operator._profiler.sections)
         timings[run] = elapsed
         log("run <%s> took %f (s) in %d timesteps" %
             (','.join('%s=%s' % (k, v) for k, v in mapper.items()), elapsed, timesteps))
@@ -1,7 +1,9 @@
 import abc
+from collections import OrderedDict, namedtuple
 from functools import reduce
 from operator import mul
 import mmap
+import weakref
 
 import numpy as np
 import ctypes
@@ -13,7 +15,7 @@ from devito.tools import dtype_to_ctype
 
 __all__ = ['ALLOC_FLAT', 'ALLOC_NUMA_LOCAL', 'ALLOC_NUMA_ANY',
            'ALLOC_KNL_MCDRAM', 'ALLOC_KNL_DRAM', 'ALLOC_GUARD',
-           'default_allocator']
+           'default_allocator', 'allocator_stats']
 
 
 class MemoryAllocator(object):
@@ -31,6 +33,23 @@ class MemoryAllocator(object):
     guaranteed_alignment = 64
     """Guaranteed data alignment."""
 
+    _instances = weakref.WeakSet()
+
+    def __init__(self):
+        # The sizes of the live allocations, by address
+        self._live = {}
+        self._nbytes = 0
+        self.nbytes_peak = 0
+        MemoryAllocator._instances.add(self)
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+    @property
+    def nbytes(self):
+        """The amount of memory, in bytes, currently allocated via ``self.alloc``."""
+        return self._nbytes
+
     @classmethod
     def available(cls):
         if cls._attempted_init is False:
@@ -74,6 +93,11 @@ class MemoryAllocator(object):
         if c_pointer is None:
             raise RuntimeError("Unable to allocate %d elements in memory", str(size))
 
+        nbytes = size*ctypes.sizeof(ctype)
+        self._live[memfree_args[0].value] = nbytes
+        self._nbytes += nbytes
+        self.nbytes_peak = max(self.nbytes_peak, self._nbytes)
+
         # cast to 1D array of the specified size
         ctype_1d = ctype * size
         buf = ctypes.cast(c_pointer, ctypes.POINTER(ctype_1d)).contents
@@ -94,13 +118,20 @@ class MemoryAllocator(object):
         """
         return
 
-    @abc.abstractmethod
     def free(self, *args):
         """
         Free memory previously allocated with ``self.alloc``.
 
         Arguments are provided exactly as returned in the second element of the
         tuple returned by _alloc_C_libcall
+        """
+        self._nbytes -= self._live.pop(args[0].value, 0)
+        self._free_C_libcall(*args)
+
+    @abc.abstractmethod
+    def _free_C_libcall(self, *args):
+        """
+        Perform the actual memory deallocation by calling a C function.
 
         Notes
         -----
@@ -137,7 +168,7 @@ class PosixAllocator(MemoryAllocator):
         else:
             return None, None
 
-    def free(self, c_pointer):
+    def _free_C_libcall(self, c_pointer):
         self.lib.free(c_pointer)
 
 
@@ -153,6 +184,7 @@ class GuardAllocator(PosixAllocator):
     """
 
     def __init__(self, padding_bytes=1024*1024):
+        super(GuardAllocator, self).__init__()
         self.padding_bytes = padding_bytes
 
     def _alloc_C_libcall(self, size, ctype):
@@ -205,7 +237,7 @@ class GuardAllocator(PosixAllocator):
 
         return c_pointer, (padleft_pointer, c_bytesize)
 
-    def free(self, c_pointer, total_size):
+    def _free_C_libcall(self, c_pointer, total_size):
         # unprotect it, since free() accesses it, I think...
         self.lib.mprotect(c_pointer, total_size,
                           ctypes.c_int(mmap.PROT_READ | mmap.PROT_WRITE))
@@ -283,9 +315,12 @@ class NumaAllocator(MemoryAllocator):
             c_pointer = ctypes.c_void_p(c_pointer)
             return c_pointer, (c_pointer, c_bytesize)
 
-    def free(self, c_pointer, c_bytesize):
+    def _free_C_libcall(self, c_pointer, c_bytesize):
         self.lib.numa_free(c_pointer, c_bytesize)
 
+    def __repr__(self):
+        return "NumaAllocator(node=%s)" % self._node
+
     @property
     def node(self):
         return self._node
@@ -342,3 +377,26 @@ def default_allocator():
             return ALLOC_NUMA_LOCAL
     else:
         return ALLOC_FLAT
+
+
+AllocatorStats = namedtuple('AllocatorStats', 'nbytes nbytes_peak')
+"""
+The amount of memory, in bytes, currently allocated through a MemoryAllocator,
+and its maximum so far.
+"""
+
+
+def allocator_stats():
+    """
+    Return the :class:`AllocatorStats` of all MemoryAllocators that have been
+    used so far, as a mapper from their names (e.g., ``NumaAllocator(node=local)``
+    for an allocator attempting allocation on the local NUMA node) to stats.
+    """
+    stats = OrderedDict()
+    for i in sorted(MemoryAllocator._instances, key=repr):
+        if i.nbytes_peak:
+            # E.g., multiple PosixAllocators
+            v = stats.get(repr(i), AllocatorStats(0, 0))
+            stats[repr(i)] = AllocatorStats(v.nbytes + i.nbytes,
+                                            v.nbytes_peak + i.nbytes_peak)
+    return stats
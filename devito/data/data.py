@@ -4,7 +4,7 @@ import numpy as np
 
 from devito.data.allocators import ALLOC_FLAT
 from devito.parameters import configuration
-from devito.tools import Tag, as_tuple, is_integer
+from devito.tools import Tag, as_tuple, bfloat16, is_integer
 
 __all__ = ['Data']
 
@@ -19,7 +19,10 @@ class Data(np.ndarray):
     shape : tuple of ints
         Shape of created array.
     dtype : numpy.dtype
-        The data type of the raw data.
+        The data type of the raw data. If ``bfloat16``, the raw data are bfloat16
+        bit patterns, and floating point values are encoded upon assignment.
+        Ufuncs other than ``==`` and ``!=`` raise TypeError on bfloat16 data;
+        use :meth:`as_float` to read them as single precision values.
     decomposition : tuple of Decomposition, optional
         The data decomposition, for each dimension.
     modulo : tuple of bool, optional
@@ -46,6 +49,7 @@ class Data(np.ndarray):
         obj._memfree_args = memfree_args
         obj._decomposition = decomposition or (None,)*len(shape)
         obj._modulo = modulo or (False,)*len(shape)
+        obj._encode = dtype is bfloat16
 
         # This cannot be a property, as Data objects constructed from this
         # object might not have any `decomposition`, but they would still be
@@ -56,6 +60,9 @@ class Data(np.ndarray):
         # to reconstruct information about the computed view (e.g., `decomposition`)
         obj._index_stash = None
 
+        # Bumped whenever the data values are modified from Python-land
+        obj._version = DataVersion()
+
         # Sanity check -- A Dimension can't be at the same time modulo-iterated
         # and MPI-distributed
         assert all(i is None for i, j in zip(obj._decomposition, obj._modulo)
@@ -78,6 +85,14 @@ class Data(np.ndarray):
 
         self._index_stash = None
 
+        # Views, copies, etc. of bfloat16 Data still hold bfloat16 bit patterns,
+        # unlike, e.g., the boolean outcome of a comparison
+        self._encode = getattr(obj, '_encode', False) and self.dtype == np.uint16
+
+        # Views share the version of `obj`. So do copies, which at worst leads
+        # to spurious version bumps
+        self._version = getattr(obj, '_version', None) or DataVersion()
+
         # Views or references created via operations on `obj` do not get an
         # explicit reference to the underlying data (`_memfree_args`). This makes sure
         # that only one object (the "root" Data) will free the C-allocated memory
@@ -151,7 +166,53 @@ class Data(np.ndarray):
             self._index_stash = None
             return retval
 
+    def __array_prepare__(self, out_arr, context=None):
+        if context is not None:
+            ufunc, inputs = context[:2]
+            if ufunc not in (np.equal, np.not_equal) and \
+                    any(getattr(i, '_encode', False) for i in inputs):
+                # Arithmetic on bfloat16 bit patterns would silently yield garbage
+                raise TypeError("Cannot apply `%s` to bfloat16 bit patterns; use "
+                                "`as_float()` to obtain single precision values"
+                                % ufunc.__name__)
+        return super(Data, self).__array_prepare__(out_arr, context)
+
+    def __array_wrap__(self, out_arr, context=None):
+        if out_arr is self:
+            # In-place ufunc, such as `np.add(self, 1, out=self)` or `self += 1`
+            self._version.bump()
+        return super(Data, self).__array_wrap__(out_arr, context)
+
+    def as_float(self):
+        """
+        A read-only copy of the data values in single precision. The bit patterns
+        of bfloat16 Data are decoded, while half precision values are converted.
+        For any other data type, this is simply a read-only view.
+        """
+        ret = self._local.view(np.ndarray)
+        if self._encode:
+            ret = bfloat16.decode(ret)
+        elif self.dtype == np.float16:
+            ret = ret.astype(np.float32)
+        else:
+            ret = ret.view()
+        ret.flags.writeable = False
+        return ret
+
+    def fill(self, value):
+        self._version.bump()
+        if self._encode and np.result_type(value) != np.uint16:
+            value = bfloat16.encode(value)
+        super(Data, self).fill(value)
+
     def __setitem__(self, glb_idx, val):
+        self._version.bump()
+        if self._encode:
+            # Unless they're bfloat16 bit patterns already, values must be encoded
+            if isinstance(val, Iterable) and not isinstance(val, np.ndarray):
+                val = np.array(val)
+            if np.result_type(val) != np.uint16:
+                val = bfloat16.encode(val)
         loc_idx = self._convert_index(glb_idx)
         if loc_idx is NONLOCAL:
             # no-op
@@ -265,6 +326,30 @@ class Data(np.ndarray):
         self[:] = 0.0
 
 
+class DataVersion(object):
+
+    """
+    A counter tracking the modifications to the data values of a Data.
+
+    All views of the same Data share the same DataVersion. Two DataVersions
+    compare equal only if they are the same object.
+
+    The counter is bumped by item assignment, ``fill`` and the ufuncs writing
+    into a Data (e.g., ``+=`` or ``out=...``). Modifications going through
+    functions such as ``np.copyto``, through plain ``numpy.ndarray`` views, or
+    through the raw data pointer (e.g., ``ctypes``) are not tracked.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def __repr__(self):
+        return "DataVersion(%d)" % self.value
+
+    def bump(self):
+        self.value += 1
+
+
 class Index(Tag):
     pass
 NONLOCAL = Index('nonlocal')  # noqa
@@ -159,10 +159,10 @@ def optimize_unfolded_tree(unfolded, root):
         assert len(tree) == len(root)
 
         # We can optimize the folded trees only if they compute temporary
-        # arrays, but not if they compute input data
+        # arrays, but not if they compute input data or Arrays allocated from Python
         exprs = FindNodes(Expression).visit(tree[-1])
         writes = [j.write for j in exprs if j.is_tensor]
-        if not all(j.is_Array for j in writes):
+        if not all(j.is_Array and not j._mem_external for j in writes):
             processed.append(compose_nodes(tree))
             root = compose_nodes(root)
             continue
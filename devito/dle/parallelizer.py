@@ -4,11 +4,15 @@ import numpy as np
 import cgen as c
 import psutil
 
+from devito.cgen_utils import ccode
+from devito.data import FULL
 from devito.ir.iet import (Conditional, Block, Element, Expression, List, FindSymbols,
                            FindNodes, Transformer, IsPerfectIteration, COLLAPSED,
                            retrieve_iteration_tree, filter_iterations)
+from devito.ir.support import Scope
 from devito.symbolics import CondEq
 from devito.parameters import configuration
+from devito.tools import is_compact_dtype
 from devito.types import Constant, Symbol
 
 
@@ -32,12 +36,20 @@ class Ompizer(object):
     """Use a collapse clause if the number of available physical cores is
     greater than this threshold."""
 
+    REDUCTION_MAXSIZE = 1024
+    """Use a reduction clause only for the Functions with at most this many
+    elements. Each thread gets its own private copy of a reduced Function,
+    possibly on the stack, so the larger ones are updated atomically instead."""
+
     lang = {
         'for': lambda i: c.Pragma('omp for collapse(%d) schedule(static)' % i),
+        'for-reduction': lambda i, j: c.Pragma('omp for collapse(%d) schedule(static) '
+                                               'reduction(+:%s)' % (i, j)),
         'par-region': lambda nt, i: c.Pragma('omp parallel num_threads(%s) %s' % (nt, i)),
         'simd-for': c.Pragma('omp simd'),
         'simd-for-aligned': lambda i, j: c.Pragma('omp simd aligned(%s:%d)' % (i, j)),
-        'atomic': c.Pragma('omp atomic update')
+        'atomic': c.Pragma('omp atomic update'),
+        'critical': c.Pragma('omp critical')
     }
     """
     Shortcuts for the OpenMP language.
@@ -79,24 +91,81 @@ class Ompizer(object):
         else:
             return nparallel
 
+    def _find_reductions(self, root, collapsed):
+        """
+        Return the Functions which are the target of a reduction along the
+        ``collapsed`` Iterations, that is the Functions that are only ever
+        incremented in ``root`` and that are not indexed by any of the collapsed
+        Dimensions. Unless larger than ``REDUCTION_MAXSIZE``, these can be handled
+        through an OpenMP ``reduction`` clause, rather than through (slow) atomic
+        updates.
+        """
+        exprs = FindNodes(Expression).visit(root)
+        scope = Scope([i.expr for i in exprs])
+
+        reductions = []
+        for i in exprs:
+            f = i.write
+            if not i.is_Increment or not f.is_DiscreteFunction or f in reductions:
+                continue
+            if is_compact_dtype(f.dtype):
+                # Can't reduce over raw storage bits
+                continue
+            if np.prod(f.shape_allocated) > self.REDUCTION_MAXSIZE:
+                continue
+            deps = scope.d_all.project(f)
+            if deps and all(d.is_reduce(j.dim) for d in deps for j in collapsed):
+                reductions.append(f)
+
+        return reductions
+
+    def _make_reduction_clause(self, reductions):
+        """
+        Build the array sections to be used in an OpenMP ``reduction`` clause.
+        The whole Function is reduced, e.g. ``f[0:f_vec->size[0]][0:f_vec->size[1]]``.
+        """
+        sections = []
+        for f in reductions:
+            shape = ''.join('[0:%s]' % ccode(f._C_get_field(FULL, d).size)
+                            for d in f.dimensions)
+            sections.append('%s%s' % (f.name, shape))
+        return ','.join(sections)
+
     def _make_parallel_tree(self, root, candidates):
         """Parallelize the IET rooted in `root`."""
         ncollapse = self._ncollapse(root, candidates)
         parallel = self.lang['for'](ncollapse)
 
-        pragmas = root.pragmas + (parallel,)
         properties = root.properties + (COLLAPSED(ncollapse),)
 
         # Introduce the `omp for` pragma
         mapper = OrderedDict()
         if root.is_ParallelAtomic:
-            # Introduce the `omp atomic` pragmas
             exprs = FindNodes(Expression).visit(root)
-            subs = {i: List(header=self.lang['atomic'], body=i)
-                    for i in exprs if i.is_Increment}
+
+            # Increments to Functions that aren't indexed by the collapsed Dimensions
+            # are turned into OpenMP reductions
+            reductions = self._find_reductions(root, candidates[:ncollapse])
+            if reductions:
+                clause = self._make_reduction_clause(reductions)
+                parallel = self.lang['for-reduction'](ncollapse, clause)
+            pragmas = root.pragmas + (parallel,)
+
+            # Introduce the `omp atomic` pragmas for all other increments. Increments
+            # to Functions with a compact storage data type are lowered to
+            # conversion-assignment pairs, which an `omp atomic` can't protect
+            subs = {}
+            for i in exprs:
+                if not i.is_Increment or i.write in reductions:
+                    continue
+                elif is_compact_dtype(i.write.dtype):
+                    subs[i] = List(header=self.lang['critical'], body=i)
+                else:
+                    subs[i] = List(header=self.lang['atomic'], body=i)
             handle = Transformer(subs).visit(root)
             mapper[root] = handle._rebuild(pragmas=pragmas, properties=properties)
         else:
+            pragmas = root.pragmas + (parallel,)
             mapper[root] = root._rebuild(pragmas=pragmas, properties=properties)
 
         root = Transformer(mapper).visit(root)
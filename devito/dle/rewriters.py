@@ -8,19 +8,26 @@ import cgen
 import numpy as np
 
 from devito.cgen_utils import ccode
+from devito.data import FULL
 from devito.dle.blocking_utils import (BlockDimension, fold_blockable_tree,
                                        unfold_blocked_tree)
 from devito.dle.parallelizer import Ompizer
+from devito.dle.unrolling_utils import unroll_time_loop
 from devito.dle.utils import complang_ALL, simdinfo, get_simd_flag, get_simd_items
+from devito.dle.wrapping_utils import min_time_buffers, shrink_time_buffers
 from devito.exceptions import DLEException
-from devito.ir.iet import (Call, Denormals, Expression, Iteration, List, HaloSpot,
-                           PARALLEL, FindSymbols, FindNodes, FindAdjacent,
-                           IsPerfectIteration, MapNodes, Transformer, compose_nodes,
-                           retrieve_iteration_tree, make_efunc)
+from devito.ir.iet import (Call, Callable, Conditional, Denormals, Element,
+                           Expression, Iteration, List, HaloSpot, PARALLEL,
+                           FindSymbols, FindNodes, FindAdjacent, IsPerfectIteration,
+                           MapNodes, Transformer, compose_nodes, retrieve_iteration_tree,
+                           make_efunc)
 from devito.logger import dle, perf_adv
 from devito.mpi import HaloExchangeBuilder
 from devito.parameters import configuration
-from devito.tools import DAG, as_tuple, flatten
+from devito.symbolics import (Byref, CondNe, FieldFromPointer, Macro,
+                              retrieve_indexed)
+from devito.tools import (DAG, as_tuple, dtype_to_mpitype, filter_ordered, flatten,
+                          is_compact_dtype, prod)
 
 __all__ = ['BasicRewriter', 'AdvancedRewriter', 'SpeculativeRewriter',
            'AdvancedRewriterSafeMath', 'CustomRewriter']
@@ -175,25 +182,76 @@ class AdvancedRewriter(BasicRewriter):
     def _pipeline(self, state):
         self._avoid_denormals(state)
         self._optimize_halospots(state)
+        if self.params['mpi'] and self.params.get('mpireduce'):
+            self._dist_reduce(state)
+        if self.params.get('shrinkbuffers'):
+            self._loop_wrapping(state)
         self._loop_blocking(state)
         if self.params['mpi']:
             self._dist_parallelize(state)
         self._simdize(state)
         if self.params['openmp']:
             self._shm_parallelize(state)
+        if self.params.get('unrolltime'):
+            self._unroll_time(state)
 
     @dle_pass
     def _loop_wrapping(self, iet):
         """
         Emit a performance warning if WRAPPABLE Iterations are found,
         as these are a symptom that unnecessary memory is being allocated.
+
+        With the ``shrinkbuffers`` option, the circular buffers of the default-buffered
+        TimeFunctions accessed within a time Iteration are shrunk, wherever this is
+        provably safe, as long as their data has not been allocated yet. Otherwise,
+        the TimeFunctions which may safely be allocated with a smaller circular
+        buffer are reported, while those allocated with a too small buffer (through
+        ``save=Buffer(...)``) cause a DLEException.
         """
+        mapper = {}
+        dimensions = []
         for i in FindNodes(Iteration).visit(iet):
-            if not i.is_Wrappable:
+            if not self.params.get('shrinkbuffers'):
+                if i.is_Wrappable:
+                    perf_adv("Functions using modulo iteration along Dimension `%s` "
+                             "may safely allocate a one slot smaller buffer" % i.dim)
                 continue
-            perf_adv("Functions using modulo iteration along Dimension `%s` "
-                     "may safely allocate a one slot smaller buffer" % i.dim)
-        return iet, {}
+            if not i.dim.is_Time or not i.uindices:
+                continue
+            found = min_time_buffers(iet, i)
+            for f, size in found.items():
+                if f._time_size < size and not f._time_buffering_default:
+                    raise DLEException("TimeFunction `%s` needs a circular buffer of "
+                                       "at least %d timeslots, but it only has %d"
+                                       % (f.name, size, f._time_size))
+            # The TimeFunctions sharing a time Dimension must have circular
+            # buffers of the same size, so either all or none of them can shrink
+            functions = [f for f in FindSymbols().visit(iet)
+                         if f.is_TimeFunction and f._time_buffering and
+                         f.time_dim.root is i.dim]
+            if not functions or any(found.get(f, f._time_size) >= f._time_size
+                                    for f in functions):
+                continue
+            size = max(found[f] for f in functions)
+            # Only the TimeFunctions whose data is yet to be allocated are shrunk,
+            # so that no Operator is ever run with a buffer other than that it was
+            # compiled for. The HaloSpots, if any, are built upon the original
+            # ModuloDimensions, hence shrinking is skipped under MPI
+            if all(f._time_buffering_default and f._data is None and
+                   f._time_size == functions[0]._time_size for f in functions) and \
+                    not self.params['mpi']:
+                dle("Shrinking the circular buffers of `%s` to %d timeslots"
+                    % (",".join(f.name for f in functions), size))
+                mapper[i], dims = shrink_time_buffers(i, functions, size)
+                dimensions.extend(dims)
+            else:
+                perf_adv("TimeFunctions `%s` may safely be allocated with "
+                         "`save=Buffer(%d)`" % (",".join(f.name for f in functions),
+                                                size))
+
+        iet = Transformer(mapper).visit(iet)
+
+        return iet, {'dimensions': dimensions}
 
     @dle_pass
     def _optimize_halospots(self, iet):
@@ -365,6 +423,73 @@ class AdvancedRewriter(BasicRewriter):
 
         return iet, {'includes': ['mpi.h'], 'efuncs': efuncs, 'input': msgs}
 
+    @dle_pass
+    def _dist_reduce(self, iet):
+        """
+        Add MPI_Allreduce calls so that the Functions which are the target of a
+        reduction along one or more MPI-distributed Dimensions (e.g., ``s`` in
+        ``Inc(s[0], f*f)``) carry the global value, on all ranks, upon returning
+        from the Operator. As the rank-local values are simply summed up together,
+        the reduction targets are zeroed on all ranks but the root one before
+        running the kernel, so that their initial value is only accounted once.
+        The global value is only available at the very end of the Operator, hence
+        the reduction targets must not be read anywhere in the Operator.
+        """
+        if iet.is_Callable:
+            # The reductions are performed at the very end of the Operator
+            return iet, {}
+
+        reductions = []
+        for tree in retrieve_iteration_tree(iet):
+            for e in FindNodes(Expression).visit(tree.root):
+                f = e.write
+                if not e.is_Increment or not f.is_DiscreteFunction or f.grid is None:
+                    continue
+                distributed = set(f.grid.distributor.dimensions)
+                if any(i.dim.root in distributed for i in tree) and\
+                        not distributed & e.expr.lhs.free_symbols:
+                    reductions.append(f)
+        if not reductions:
+            return iet, {}
+
+        reductions = filter_ordered(reductions)
+        for e in FindNodes(Expression).visit(iet):
+            for i in retrieve_indexed(e.expr.rhs):
+                if i.function in reductions:
+                    raise DLEException("Cannot MPI-reduce `%s` as it is read within "
+                                       "the Operator, where only its rank-local "
+                                       "value is available" % i.function.name)
+
+        zeros = []
+        calls = []
+        efuncs = OrderedDict()
+        for f in reductions:
+            if is_compact_dtype(f.dtype):
+                raise NotImplementedError("Cannot MPI-reduce `%s` as it uses a compact "
+                                          "storage data type" % f.name)
+            comm = f.grid.distributor._obj_comm
+            data = FieldFromPointer(f._C_field_data, f._C_name)
+            count = prod([f._C_get_field(FULL, d).size for d in f.dimensions])
+            nbytes = count*Macro('sizeof(%s)' % f._C_typedata)
+            zero = [Element(cgen.Value('int', 'rank')),
+                    Call('MPI_Comm_rank', [comm, Byref('rank')]),
+                    Conditional(CondNe(Macro('rank'), 0),
+                                Call('memset', [data, 0, nbytes]))]
+            efunc = Callable('zero_%s' % f.name, zero, 'void', [f, comm], ('static',))
+            zeros.append(Call(efunc.name, [f, comm]))
+            efuncs[efunc] = None
+            allreduce = Call('MPI_Allreduce', [
+                Macro('MPI_IN_PLACE'), data, count, Macro(dtype_to_mpitype(f.dtype)),
+                Macro('MPI_SUM'), comm
+            ])
+            efunc = Callable('allreduce_%s' % f.name, allreduce, 'void', [f, comm],
+                             ('static',))
+            calls.append(Call(efunc.name, [f, comm]))
+            efuncs[efunc] = None
+        iet = List(body=zeros + [iet] + calls)
+
+        return iet, {'includes': ['mpi.h', 'string.h'], 'efuncs': efuncs}
+
     @dle_pass
     def _simdize(self, nodes):
         """
@@ -395,6 +520,22 @@ class AdvancedRewriter(BasicRewriter):
 
         return processed, {}
 
+    @dle_pass
+    def _unroll_time(self, iet):
+        """
+        Unroll the time Iterations using modulo-buffered iteration by the size
+        of the circular buffers, so that the modulo indices become integer
+        constants within each unrolled body. A peeled loop and a remainder loop
+        handle the time indices that are not aligned with the unrolling factor.
+        """
+        mapper = {}
+        for i in FindNodes(Iteration).visit(iet):
+            if i.dim.is_Time and i.uindices:
+                mapper[i] = unroll_time_loop(i)
+        iet = Transformer(mapper).visit(iet)
+
+        return iet, {}
+
     @dle_pass
     def _shm_parallelize(self, iet):
         """
@@ -413,6 +554,8 @@ class AdvancedRewriterSafeMath(AdvancedRewriter):
 
     def _pipeline(self, state):
         self._optimize_halospots(state)
+        if self.params['mpi'] and self.params.get('mpireduce'):
+            self._dist_reduce(state)
         self._loop_wrapping(state)
         self._loop_blocking(state)
         if self.params['mpi']:
@@ -420,6 +563,8 @@ class AdvancedRewriterSafeMath(AdvancedRewriter):
         self._simdize(state)
         if self.params['openmp']:
             self._shm_parallelize(state)
+        if self.params.get('unrolltime'):
+            self._unroll_time(state)
 
 
 class SpeculativeRewriter(AdvancedRewriter):
@@ -427,6 +572,8 @@ class SpeculativeRewriter(AdvancedRewriter):
     def _pipeline(self, state):
         self._avoid_denormals(state)
         self._optimize_halospots(state)
+        if self.params['mpi'] and self.params.get('mpireduce'):
+            self._dist_reduce(state)
         self._loop_wrapping(state)
         self._loop_blocking(state)
         if self.params['mpi']:
@@ -434,6 +581,8 @@ class SpeculativeRewriter(AdvancedRewriter):
         self._simdize(state)
         if self.params['openmp']:
             self._shm_parallelize(state)
+        if self.params.get('unrolltime'):
+            self._unroll_time(state)
         self._minimize_remainders(state)
 
     @dle_pass
@@ -541,8 +690,10 @@ class CustomRewriter(SpeculativeRewriter):
         'blocking': SpeculativeRewriter._loop_blocking,
         'openmp': SpeculativeRewriter._shm_parallelize,
         'mpi': SpeculativeRewriter._dist_parallelize,
+        'mpireduce': SpeculativeRewriter._dist_reduce,
         'simd': SpeculativeRewriter._simdize,
-        'minrem': SpeculativeRewriter._minimize_remainders
+        'minrem': SpeculativeRewriter._minimize_remainders,
+        'unrolltime': SpeculativeRewriter._unroll_time
     }
 
     def __init__(self, passes, params):
@@ -18,7 +18,10 @@ This dictionary may be modified at backend-initialization time."""
 
 default_options = {
     'blockinner': False,
-    'blockalways': False
+    'blockalways': False,
+    'mpireduce': False,
+    'shrinkbuffers': False,
+    'unrolltime': False
 }
 """Default values for the supported optimization options.
 This dictionary may be modified at backend-initialization time."""
@@ -63,6 +66,20 @@ def transform(iet, mode='basic', options=None):
         - ``blockalways``: Pass True to unconditionally apply loop blocking, even when
                            the compiler heuristically thinks that it might not be
                            profitable and/or dangerous for performance.
+        - ``mpireduce``: Pass True to perform, in the generated code, an MPI
+                         Allreduce of all Functions that are the target of a
+                         reduction along an MPI-distributed Dimension. The
+                         reduction targets must not be read within the Operator.
+        - ``shrinkbuffers``: Pass True to shrink the circular buffer of the
+                             TimeFunctions whose data is not allocated yet, when
+                             this is provably safe; the final timeslot is then
+                             found at ``time % u._time_size``. Those already
+                             allocated are reported instead, while those
+                             allocated with a too small buffer (e.g.,
+                             ``save=Buffer(time_order)``) are rejected.
+        - ``unrolltime``: Pass True to unroll the time loop by the size of the
+                          circular buffers, so that the modulo indices of the
+                          TimeFunctions become integer constants.
     """
     assert isinstance(iet, Node)
 
@@ -0,0 +1,101 @@
+from functools import reduce
+
+from sympy import Le, ilcm
+
+from devito.ir.iet import Block, Conditional, Transformer
+from devito.ir.support import Forward
+from devito.symbolics import IntDiv
+from devito.types.basic import AbstractFunction
+
+__all__ = ['unroll_time_loop']
+
+
+class SubsIndices(Transformer):
+
+    """
+    Transformer performing the substitutions in ``mapper`` within the
+    Expressions, Calls and Conditionals of an Iteration/Expression tree.
+    """
+
+    def __init__(self, mapper):
+        super(SubsIndices, self).__init__()
+        self.subs = mapper
+
+    def _xreplace(self, v):
+        if isinstance(v, AbstractFunction) or not hasattr(v, 'xreplace'):
+            return v
+        return v.xreplace(self.subs)
+
+    def visit_Expression(self, o):
+        return o._rebuild(expr=o.expr.xreplace(self.subs))
+
+    def visit_Call(self, o):
+        return o._rebuild(arguments=[self._xreplace(i) for i in o.arguments])
+
+    def visit_Conditional(self, o):
+        then_body = self._visit(o.then_body)
+        else_body = self._visit(o.else_body)
+        return o._rebuild(condition=self._xreplace(o.condition),
+                          then_body=then_body, else_body=else_body)
+
+
+def unroll_time_loop(iteration):
+    """
+    Unroll the time ``iteration`` by the least common multiple, ``L``, of the
+    circular buffer sizes of its ModuloDimensions. Within each of the ``L``
+    unrolled bodies, the ModuloDimensions become integer constants. The
+    unrolled loop is preceded by a peeled loop, which aligns the time index to
+    a multiple of ``L``, and followed by a remainder loop. Example:
+
+        for (time = time_m, t0 = (time)%(2), t1 = (time + 1)%(2); time <= time_M; ...)
+          u[t1][x] = u[t0][x] + 1;
+
+    becomes
+
+        if (2*((time_m + 1)/2) <= time_M + 1)
+          for (time = time_m, ...; time <= 2*((time_m + 1)/2) - 1; ...)
+            u[t1][x] = u[t0][x] + 1;
+          for (time = 2*((time_m + 1)/2); time <= ...; time += 2)
+            { u[1][x] = u[0][x] + 1; }
+            { u[0][x] = u[1][x] + 1; }
+          for (time = ...; time <= time_M; ...)
+            u[t1][x] = u[t0][x] + 1;
+        else
+          <original loop>
+
+    Each unrolled body is wrapped in a Block, so any local declaration (e.g., the
+    profiling timers of a Section) is scoped to its own body.
+
+    Returns
+    -------
+    Node
+        The unrolled ``iteration``, or ``iteration`` itself if it can't be unrolled.
+    """
+    if not iteration.uindices or iteration.direction is not Forward \
+            or iteration.step != 1:
+        return iteration
+
+    factor = reduce(ilcm, [d.modulo for d in iteration.uindices], 1)
+    if factor == 1:
+        return iteration
+
+    dim = iteration.dim
+    _min, _max = iteration.symbolic_min, iteration.symbolic_max
+
+    # The first time index that is a multiple of `factor`, and the first
+    # time index of the remainder loop
+    start = factor*IntDiv(_min + factor - 1, factor)
+    end = start + factor*IntDiv(_max - start + 1, factor)
+
+    bodies = []
+    for k in range(factor):
+        mapper = {d: (k + d.offset) % d.modulo for d in iteration.uindices}
+        mapper[dim] = dim + k
+        bodies.append(Block(body=SubsIndices(mapper).visit(iteration.nodes)))
+
+    peel = iteration._rebuild(limits=(_min, start - 1, 1), offsets=None)
+    unrolled = iteration._rebuild(bodies, limits=(start, end - 1, factor),
+                                  offsets=None, uindices=None)
+    remainder = iteration._rebuild(limits=(end, _max, 1), offsets=None)
+
+    return Conditional(Le(start, _max + 1), [peel, unrolled, remainder], iteration)
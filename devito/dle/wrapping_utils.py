@@ -0,0 +1,102 @@
+from collections import OrderedDict
+
+from devito.ir.iet import Expression, FindNodes, FindSymbols, XSubs
+from devito.symbolics import retrieve_indexed, xreplace_indices
+from devito.tools import filter_ordered
+from devito.types import ModuloDimension
+
+__all__ = ['min_time_buffers', 'shrink_time_buffers']
+
+
+def min_time_buffers(iet, iteration):
+    """
+    Compute the smallest circular buffer that each TimeFunction accessed within
+    the time Iteration ``iteration`` may safely use. This is the number of
+    timeslots spanned by its accesses, ``back`` to ``front``, minus one if:
+
+        * it is not accessed outside of ``iteration``;
+        * its ``back`` timeslot is read exclusively by the first Expression
+          writing to its ``front`` timeslot, and at the very same point. Thus,
+          ``back`` is dead as soon as ``front`` gets written, so the two timeslots
+          can share the same storage.
+
+    Returns
+    -------
+    OrderedDict
+        A mapper from the TimeFunctions using a circular buffer to the smallest
+        number of timeslots they can safely be allocated with.
+    """
+    exprs = FindNodes(Expression).visit(iteration)
+    others = [i for i in FindNodes(Expression).visit(iet)
+              if all(i is not j for j in exprs)]
+    outside = set().union(*[set(i.functions) for i in others])
+
+    accesses = OrderedDict()
+    for e in exprs:
+        for i in retrieve_indexed(e.expr):
+            accesses.setdefault(i.function, []).append((e, i))
+
+    found = OrderedDict()
+    for f, v in accesses.items():
+        if not f.is_TimeFunction or not f._time_buffering:
+            continue
+
+        tpos = f._time_position
+        tindices = filter_ordered(i.indices[tpos] for _, i in v)
+        if any(d not in iteration.uindices for d in tindices):
+            continue
+        offsets = [d.offset for d in tindices]
+        found[f] = span = max(offsets) - min(offsets) + 1
+        if span < 2 or f in outside:
+            continue
+        back = [d for d in tindices if d.offset == min(offsets)]
+        front = [d for d in tindices if d.offset == max(offsets)]
+
+        writes = [e for e in exprs if e.write is f]
+        if not writes or writes[0].expr.lhs.indices[tpos] not in front:
+            continue
+        point = writes[0].expr.lhs.indices
+        if any(e is not writes[0] or
+               tuple(point[tpos] if d in back else d for d in i.indices) != point
+               for e, i in v if i.indices[tpos] in back):
+            continue
+
+        found[f] = span - 1
+
+    return found
+
+
+def shrink_time_buffers(iteration, functions, size):
+    """
+    Shrink the circular buffer of the TimeFunctions in ``functions``, which are
+    all accessed within the time ``iteration``, to ``size`` timeslots.
+
+    The Indexeds of such TimeFunctions are rewritten in terms of new
+    ModuloDimensions, which are attached to ``iteration``, while the
+    ModuloDimensions that are no longer used are dropped. The TimeFunctions
+    themselves are resized, so their data must not have been allocated yet.
+
+    Returns
+    -------
+    iteration : Iteration
+        The rebuilt ``iteration``.
+    dimensions : list of ModuloDimension
+        The newly created ModuloDimensions.
+    """
+    mapper = {}
+    for f in functions:
+        mapper.update({d: ModuloDimension(d.parent, d.offset, size)
+                       for d in iteration.uindices if d.modulo == f._time_size})
+    rule = lambda i: i.function in functions
+    replacer = lambda i: xreplace_indices(i, mapper, rule)
+    iteration = XSubs(replacer=replacer).visit(iteration)
+
+    for f in functions:
+        f._shrink_time_buffer(size)
+
+    used = FindSymbols('free-symbols').visit(iteration.nodes)
+    dimensions = filter_ordered(i for i in mapper.values() if i in used)
+    uindices = [d for d in iteration.uindices if d in used] + dimensions
+    iteration = iteration._rebuild(uindices=filter_ordered(uindices))
+
+    return iteration, dimensions
@@ -51,18 +51,19 @@ def collect(exprs):
             if handle:
                 candidates[expr.rhs] = ExprData(*handle)
 
+    # Group together the aliasing expressions. Two expressions alias each other
+    # if they have the same shape signature (see `compare`) and if their offsets
+    # are translated w.r.t. each other (see `is_translated`). Both properties
+    # are captured by a hash key, so aliasing expressions are found in linear time
+    buckets = OrderedDict()
+    for k, v in candidates.items():
+        key = (signature(k), translation_invariant(v.offsets))
+        buckets.setdefault(key, []).append(k)
+
     aliases = OrderedDict()
     mapper = OrderedDict()
-    unseen = list(candidates)
-    while unseen:
-        # Find aliasing expressions
-        handle = unseen.pop(0)
-        group = [handle]
-        for e in list(unseen):
-            if compare(handle, e) and\
-                    is_translated(candidates[handle].offsets, candidates[e].offsets):
-                group.append(e)
-                unseen.remove(e)
+    for group in buckets.values():
+        handle = group[0]
 
         # Try creating a basis for the aliasing expressions' offsets
         offsets = [tuple(candidates[e].offsets) for e in group]
@@ -213,6 +214,38 @@ def is_translated(ofs1, ofs2):
     return len(distance(ofs1, ofs2)) == 1
 
 
+def translation_invariant(ofs):
+    """
+    Return ``ofs`` translated such that its first element is the origin. Thus,
+    ``is_translated(ofs1, ofs2)`` if and only if ``ofs1`` and ``ofs2`` have the
+    same translation invariant.
+
+    For example: ::
+
+        ofs = [(1, 0), (1, 1)]
+
+    Return: ::
+
+        ((0, 0), (0, 1))
+    """
+    return tuple(tuple(i - j for i, j in zip(o, ofs[0])) for o in ofs)
+
+
+def signature(expr):
+    """
+    Return the shape signature of ``expr``, that is a hashable representation of
+    its operation tree in which the indexed objects are stripped of their indices.
+    Thus, ``compare(e1, e2)`` if and only if ``e1`` and ``e2`` have the same
+    signature.
+    """
+    if expr.is_Atom:
+        return (type(expr), expr)
+    elif isinstance(expr, Indexed):
+        return (type(expr), len(expr.args), expr.base)
+    else:
+        return (type(expr),) + tuple(signature(i) for i in expr.args)
+
+
 def compare(e1, e2):
     """
     Return True if the two expressions e1 and e2 alias each other, False otherwise.
@@ -4,9 +4,11 @@ from devito.ir import (DataSpace, IterationSpace, Interval, IntervalGroup, Clust
                        ClusterGroup, detect_accesses, build_intervals, groupby)
 from devito.dse.aliases import collect
 from devito.dse.backends import BasicRewriter, dse_pass
-from devito.symbolics import Eq, estimate_cost, xreplace_constrained, iq_timeinvariant
+from devito.parameters import configuration
+from devito.symbolics import (Eq, estimate_cost, retrieve_indexed, search,
+                              xreplace_constrained, iq_timeinvariant, q_reciprocal)
 from devito.dse.manipulation import (common_subexprs_elimination, collect_nested,
-                                     compact_temporaries)
+                                     compact_temporaries, fold_coefficients)
 from devito.types import Array, Indexed, Scalar
 
 
@@ -14,9 +16,11 @@ class AdvancedRewriter(BasicRewriter):
 
     def _pipeline(self, state):
         self._extract_time_invariants(state, costmodel=lambda e: e.is_Function)
+        self._extract_reciprocals(state)
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
+        self._fold_coefficients(state)
 
     @dse_pass
     def _extract_time_invariants(self, cluster, template, with_cse=True,
@@ -40,6 +44,63 @@ class AdvancedRewriter(BasicRewriter):
 
         return cluster.rebuild(processed)
 
+    @dse_pass
+    def _extract_reciprocals(self, cluster, template, **kwargs):
+        """
+        Extract the reciprocals of time-invariant, space-varying sub-expressions,
+        and assign them to temporaries, thus turning divisions into multiplications.
+        Being time-invariant, the reciprocals are later precomputed outside of the
+        time loop, as Arrays. As the result may differ from that of the original
+        divisions in the last bits, this pass is skipped if
+        ``configuration['dse-accuracy']`` is set to 'strict'. Note that the
+        trigonometric functions of time-invariant sub-expressions need no such
+        policy, as :meth:`_extract_time_invariants` precomputes them exactly.
+
+        Examples
+        ========
+        Let ``t`` be the time dimension, ``x, y, z`` the space dimensions. Then:
+
+            u[t+1,x,y,z] = (u[t,x,y,z] + v[t,x,y,z])/(2.0*m[x,y,z] + damp[x,y,z])
+            >>>
+            r0 = 1/(2.0*m[x,y,z] + damp[x,y,z])
+            u[t+1,x,y,z] = (u[t,x,y,z] + v[t,x,y,z])*r0
+        """
+        if cluster.is_sparse or configuration['dse-accuracy'] == 'strict':
+            return cluster
+        if not any(i.is_Time for i in cluster.ispace.dimensions):
+            # No time loop to precompute the reciprocals outside of
+            return cluster
+
+        make = lambda: Scalar(name=template(), dtype=cluster.dtype).indexify()
+        rule = iq_timeinvariant(cluster.trace)
+
+        def query(expr):
+            if not (q_reciprocal(expr) and retrieve_indexed(expr.base)):
+                return False
+            # Constants, such as `dt` or the grid spacing, can't change in time
+            constants = {i: 1 for i in expr.base.free_symbols
+                         if getattr(i, 'is_Constant', False)}
+            return rule(expr.base.xreplace(constants))
+
+        mapper = OrderedDict()
+        for e in cluster.exprs:
+            for i in search(e.rhs, query, 'all', 'dfs'):
+                if i not in mapper:
+                    mapper[i] = make()
+        if not mapper:
+            return cluster
+
+        # The reciprocals may be nested, but their definitions are not rewritten
+        # in terms of each other: one of them could later be lifted out of the
+        # time loop, while a cheaper one it depends on could not. The nested
+        # reciprocals left unused are dropped
+        exprs = [e.xreplace(mapper) for e in cluster.exprs]
+        used = set().union(*[e.free_symbols for e in exprs])
+        processed = [Eq(v, k) for k, v in mapper.items() if v in used]
+        processed.extend(exprs)
+
+        return cluster.rebuild(processed)
+
     @dse_pass
     def _factorize(self, cluster, *args, **kwargs):
         """
@@ -69,6 +130,29 @@ class AdvancedRewriter(BasicRewriter):
 
         return cluster.rebuild(processed)
 
+    @dse_pass
+    def _fold_coefficients(self, cluster, *args, **kwargs):
+        """
+        Fold the terms sharing the same weight, up to the sign, as in
+        finite-difference stencils with symmetric coefficients: ::
+
+            c*u[x+1] + c*u[x-1]
+            >>>
+            c*(u[x+1] + u[x-1])
+
+        The folded form of an expression is only retained if it reduces the
+        operation count.
+        """
+        processed = []
+        for expr in cluster.exprs:
+            handle = fold_coefficients(expr)
+            if estimate_cost(handle) < estimate_cost(expr):
+                processed.append(handle)
+            else:
+                processed.append(expr)
+
+        return cluster.rebuild(processed)
+
     @dse_pass
     def _eliminate_inter_stencil_redundancies(self, cluster, template, **kwargs):
         """
@@ -141,7 +225,8 @@ class AdvancedRewriter(BasicRewriter):
             # Build a symbolic function for /alias/
             intervals = ispace.intervals
             halo = [(abs(intervals[i].lower), abs(intervals[i].upper)) for i in indices]
-            function = Array(name=template(), dimensions=indices, halo=halo)
+            function = Array(name=template(), dimensions=indices, halo=halo,
+                             dtype=cluster.dtype)
             access = tuple(i - intervals[i].lower for i in indices)
             expression = Eq(Indexed(function.indexed, *access), origin)
 
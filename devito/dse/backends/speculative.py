@@ -9,6 +9,7 @@ class SpeculativeRewriter(AdvancedRewriter):
     def _pipeline(self, state):
         self._extract_time_varying(state)
         self._extract_time_invariants(state, costmodel=lambda e: e.is_Function)
+        self._extract_reciprocals(state)
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
@@ -1,13 +1,15 @@
 from collections import OrderedDict
 
-from sympy import collect, collect_const
+from sympy import Add, Mul, collect, collect_const
 
 from devito.ir import FlowGraph
-from devito.symbolics import Eq, count, estimate_cost, q_op, q_leaf, xreplace_constrained
+from devito.parameters import configuration
+from devito.symbolics import (Eq, count, estimate_cost, q_op, q_leaf, retrieve_indexed,
+                              xreplace_constrained)
 from devito.tools import as_mapper, flatten
 
-__all__ = ['collect_nested', 'common_subexprs_elimination', 'compact_temporaries',
-           'cross_cluster_cse']
+__all__ = ['collect_nested', 'fold_coefficients', 'common_subexprs_elimination',
+           'compact_temporaries', 'cross_cluster_cse']
 
 
 def collect_nested(expr, aggressive=False):
@@ -56,7 +58,67 @@ def collect_nested(expr, aggressive=False):
     return run(expr)[0]
 
 
-def common_subexprs_elimination(exprs, make, mode='default'):
+def fold_coefficients(expr):
+    """
+    Fold the terms of each sum in ``expr`` sharing the same weight, up to the
+    sign. The weight of a term is the product of its factors not involving any
+    Indexed, such as the numerical or symbolic coefficients and the grid spacing
+    of a finite-difference stencil. For example: ::
+
+        c*u[x+1]/h + c*u[x-1]/h - d*u[x+2] + d*u[x-2]
+        >>>
+        c*(u[x+1] + u[x-1])/h - d*(u[x+2] - u[x-2])
+
+    Parameters
+    ----------
+    expr : expr-like
+        The expression to be folded.
+    """
+    if q_leaf(expr) or expr.is_Atom:
+        return expr
+
+    args = [fold_coefficients(i) for i in expr.args]
+
+    if not expr.is_Add:
+        if all(i is j for i, j in zip(args, expr.args)):
+            return expr
+        elif expr.is_Mul or expr.is_Pow or expr.is_Equality:
+            return expr.func(*args, evaluate=False)
+        else:
+            return expr.func(*args)
+
+    # Group the terms by weight
+    groups = OrderedDict()
+    for i in args:
+        factors = Mul.make_args(i)
+        term = [j for j in factors if retrieve_indexed(j)]
+        coeff, weight = Mul(*[j for j in factors if j not in term]).as_coeff_Mul()
+        if not term or (abs(coeff) == 1 and weight == 1):
+            # Nothing to fold
+            groups[i] = [(i, coeff, i)]
+        else:
+            key = (abs(coeff), weight)
+            groups.setdefault(key, []).append((i, coeff, Mul(*term)))
+
+    terms = []
+    for k, v in groups.items():
+        if len(v) == 1:
+            terms.append(v[0][0])
+        else:
+            coeff, weight = k
+            if all(c < 0 for _, c, _ in v):
+                coeff = -coeff
+                folded = Add(*[term for _, _, term in v])
+            else:
+                folded = Add(*[-term if c < 0 else term for _, c, term in v])
+            factors = [coeff] if coeff != 1 else []
+            factors.extend(Mul.make_args(weight) if weight != 1 else [])
+            terms.append(Mul(*(factors + [folded]), evaluate=False))
+
+    return Add(*terms, evaluate=False)
+
+
+def common_subexprs_elimination(exprs, make, mode=None):
     """
     Perform common sub-expressions elimination, or CSE.
 
@@ -69,17 +131,31 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     make : callable
         Build symbols to store temporary, redundant values.
     mode : str, optional
-        The CSE algorithm applied. Accepted: ['default'].
+        The CSE algorithm applied. Accepted: ['dag', 'iterative']. Defaults to
+        ``configuration['cse']``.
+        - ``dag``: Single pass over a hashed DAG of the expressions, linear in the
+                   number of unique sub-expressions.
+        - ``iterative``: Repeatedly count the sub-expressions and extract the most
+                         expensive redundancies, until none is left. Quadratic in
+                         the worst case.
     """
 
     # Note: not defaulting to SymPy's CSE() function for three reasons:
     # - it also captures array index access functions (eg, i+1 in A[i+1] and B[i+1]);
     # - it sometimes "captures too much", losing factorization opportunities;
     # - very slow
-    # TODO: a second "sympy" mode will be provided, relying on SymPy's CSE() but
+    # TODO: a third "sympy" mode will be provided, relying on SymPy's CSE() but
     # also ensuring some sort of post-processing
-    assert mode == 'default'  # Only supported mode ATM
+    mode = mode or configuration['cse']
+    if mode == 'dag':
+        return _cse_dag(exprs, make)
+    elif mode == 'iterative':
+        return _cse_iterative(exprs, make)
+    else:
+        raise ValueError("Unknown CSE mode `%s`" % mode)
+
 
+def _cse_iterative(exprs, make):
     processed = list(exprs)
     mapped = []
     while True:
@@ -111,6 +187,59 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     return processed
 
 
+def _cse_dag(exprs, make):
+    exprs = list(exprs)
+
+    # Hash-cons the sub-expressions into a DAG. Like in `count`, the traversal
+    # stops at the leaves, so index arithmetic is never captured
+    children = OrderedDict()
+
+    def build(expr):
+        if expr in children:
+            return
+        args = () if q_leaf(expr) else expr.args
+        for a in args:
+            build(a)
+        children[expr] = args
+
+    for e in exprs:
+        build(e)
+    # `children` is in post-order, so the children precede their parents
+    dag = list(children)
+
+    # Count the occurrences of each sub-expression, processing the parents
+    # before their children. Once extracted, a sub-expression is computed only
+    # once, so its children are counted only once, regardless of how many times
+    # the sub-expression occurs. This is the counting performed by the
+    # `iterative` mode after each round, as the extracted sub-expressions are
+    # always at least as expensive as their children
+    occurrences = dict.fromkeys(dag, 0)
+    for e in exprs:
+        occurrences[e] += 1
+    for expr in reversed(dag):
+        v = occurrences[expr]
+        if v == 0:
+            continue
+        weight = 1 if (v > 1 and q_op(expr)) else v
+        for a in children[expr]:
+            occurrences[a] += weight
+
+    # Create the temporaries, in topological order
+    mapper = OrderedDict()
+    rebuilt = {}
+    for expr in dag:
+        args = [mapper.get(a, rebuilt.get(a, a)) for a in children[expr]]
+        if any(i is not j for i, j in zip(args, children[expr])):
+            rebuilt[expr] = expr.func(*args)
+        if occurrences[expr] > 1 and q_op(expr):
+            mapper[expr] = make()
+
+    temporaries = [Eq(v, rebuilt.get(k, k)) for k, v in mapper.items()]
+    processed = [rebuilt.get(e, e) for e in exprs]
+
+    return temporaries + processed
+
+
 def compact_temporaries(temporaries, leaves):
     """Drop temporaries consisting of single symbols."""
     exprs = temporaries + leaves
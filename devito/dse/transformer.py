@@ -1,10 +1,24 @@
+from io import BytesIO
+import multiprocessing
+import pickle
+
+import sympy
+
 from devito.ir.clusters import ClusterGroup, groupby
-from devito.dse.backends import (BasicRewriter, AdvancedRewriter, SpeculativeRewriter,
-                                 AggressiveRewriter)
+from devito.dse.backends import (AbstractRewriter, BasicRewriter, AdvancedRewriter,
+                                 SpeculativeRewriter, AggressiveRewriter)
 from devito.dse.manipulation import cross_cluster_cse
 from devito.logger import dse_warning
+from devito.mpi import MPI
 from devito.parameters import configuration
 from devito.tools import flatten
+from devito.types import Array, Scalar
+from devito.types.basic import IndexedData
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
 
 __all__ = ['rewrite']
 
@@ -19,6 +33,12 @@ modes = {
 
 configuration.add('dse', 'advanced', list(modes))
 
+# How many processes should the DSE use to optimize the Clusters? The output
+# is identical regardless of the number of processes. Ignored once MPI is
+# initialized, as forking an MPI process is unsafe
+configuration.add('dse-nprocs', 1, callback=lambda i: max(int(i), 1),
+                  impacts_jit=False)
+
 
 def rewrite(clusters, mode='advanced'):
     """
@@ -66,11 +86,12 @@ def rewrite(clusters, mode='advanced'):
     # to apply the more advanced DSE passes.
     # Note: the sparse rewriter uses the same template for temporaries as
     # the dense rewriter, thus temporaries are globally unique
-    rewriter = modes[mode]()
-    fallback = BasicRewriter(False, rewriter.template)
-
-    processed = ClusterGroup(flatten(rewriter.run(c) if c.is_dense else fallback.run(c)
-                                     for c in clusters))
+    nprocs = min(configuration['dse-nprocs'], len(clusters))
+    if nprocs > 1 and cloudpickle is not None and not MPI.Is_initialized() and \
+            'fork' in multiprocessing.get_all_start_methods():
+        processed = ClusterGroup(rewrite_parallel(clusters, mode, nprocs))
+    else:
+        processed = ClusterGroup(rewrite_local(clusters, mode))
 
     # 2) Cluster grouping
     # -------------------
@@ -86,3 +107,147 @@ def rewrite(clusters, mode='advanced'):
         processed = cross_cluster_cse(processed)
 
     return processed.finalize()
+
+
+def rewrite_local(clusters, mode, template=None):
+    """
+    Optimize each of the given Clusters in isolation.
+    """
+    rewriter = modes[mode](True, template)
+    fallback = BasicRewriter(False, rewriter.template)
+
+    return flatten(rewriter.run(c) if c.is_dense else fallback.run(c) for c in clusters)
+
+
+def rewrite_parallel(clusters, mode, nprocs):
+    """
+    Like ``rewrite_local``, but with the Clusters distributed over ``nprocs``
+    processes. The output is identical to that of ``rewrite_local``, names of
+    the temporaries included.
+
+    Notes
+    -----
+    The worker processes are forked, so they access ``clusters`` with no need
+    for serialization. The objects making up ``clusters`` live at the same
+    addresses in the parent and in the workers, which allows the optimized
+    Clusters to be shipped back by reference to such objects, thus preserving
+    their identity. The temporaries introduced by a worker are numbered from 0,
+    and renamed upon being shipped back so that, as in ``rewrite_local``, they
+    are numbered in Cluster order.
+
+    Forking a process in which MPI is initialized is unsafe (e.g., the children
+    share the parent's network resources), so under MPI ``rewrite`` always falls
+    back to ``rewrite_local``.
+    """
+    # The objects making up the Clusters. As `registry` keeps them alive, their
+    # addresses can't be reused by the workers for new objects
+    registry = {}
+    _Registrar(registry).dump(clusters)
+
+    _shared.update({'clusters': clusters, 'mode': mode, 'registry': registry})
+    try:
+        with multiprocessing.get_context('fork').Pool(nprocs) as pool:
+            results = pool.map(_rewrite_one, range(len(clusters)), chunksize=1)
+    finally:
+        _shared.clear()
+
+    processed = []
+    ntemps = 0
+    for data, n in results:
+        processed.extend(_Unpickler(BytesIO(data), registry, ntemps).load())
+        ntemps += n
+
+    return processed
+
+
+_shared = {}
+"""The state shared with the forked worker processes."""
+
+
+def _rewrite_one(i):
+    """Optimize the ``i``-th Cluster in ``_shared``. Runs in a worker process."""
+    temps = {}
+
+    def template():
+        name = "%s%d" % (AbstractRewriter.tempname, len(temps))
+        temps[name] = len(temps)
+        return name
+
+    processed = rewrite_local([_shared['clusters'][i]], _shared['mode'], template)
+
+    buf = BytesIO()
+    _Pickler(buf, _shared['registry'], temps).dump(processed)
+
+    return buf.getvalue(), len(temps)
+
+
+if cloudpickle is not None:
+    class _Registrar(cloudpickle.CloudPickler):
+
+        """Collect the (immutable) symbolic objects reachable from an object."""
+
+        def __init__(self, registry):
+            super(_Registrar, self).__init__(BytesIO(), pickle.HIGHEST_PROTOCOL)
+            self.registry = registry
+
+        def persistent_id(self, obj):
+            if isinstance(obj, sympy.Basic):
+                self.registry[id(obj)] = obj
+            return None
+
+    class _Pickler(cloudpickle.CloudPickler):
+
+        """
+        Serialize the objects in ``registry`` by reference, and the temporaries
+        in ``temps`` (a mapper from names to indices) by index.
+        """
+
+        def __init__(self, file, registry, temps):
+            super(_Pickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+            self.registry = registry
+            self.temps = temps
+
+        def is_shared(self, obj):
+            return id(obj) in self.registry and self.registry[id(obj)] is obj
+
+        def is_temp(self, obj):
+            return isinstance(obj, (Scalar, Array)) and obj.name in self.temps and \
+                not self.is_shared(obj)
+
+        def persistent_id(self, obj):
+            if self.is_shared(obj):
+                return ('ref', id(obj))
+            elif self.is_temp(obj):
+                _, kwargs = obj.__getnewargs_ex__()
+                kwargs.pop('name')
+                return ('temp', self.temps[obj.name], obj._pickle_reconstruct, kwargs)
+            elif isinstance(obj, IndexedData) and self.is_temp(obj.function):
+                return ('indexed', obj.function)
+            return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    """
+    Deserialize what ``_Pickler`` produces, renaming the temporaries so that
+    their numbering starts at ``offset``.
+    """
+
+    def __init__(self, file, registry, offset):
+        super(_Unpickler, self).__init__(file)
+        self.registry = registry
+        self.offset = offset
+        self.temps = {}
+
+    def persistent_load(self, pid):
+        if pid[0] == 'ref':
+            return self.registry[pid[1]]
+        elif pid[0] == 'temp':
+            _, index, cls, kwargs = pid
+            if index not in self.temps:
+                name = "%s%d" % (AbstractRewriter.tempname, self.offset + index)
+                self.temps[index] = cls(name=name, **kwargs)
+            return self.temps[index]
+        elif pid[0] == 'indexed':
+            return pid[1].indexed
+        raise pickle.UnpicklingError("Unknown persistent id `%s`" % str(pid))
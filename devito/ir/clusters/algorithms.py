@@ -1,37 +1,199 @@
+from collections import namedtuple
+from glob import glob
+import os
+import re
+
+import cpuinfo
+import numpy as np
+import psutil
 import sympy
 
 from devito.ir.support import (Scope, DataSpace, IterationSpace, detect_flow_directions,
                                force_directions)
 from devito.ir.clusters.cluster import PartialCluster, ClusterGroup
+from devito.logger import debug
+from devito.parameters import configuration
 from devito.symbolics import CondEq, xreplace_indices
-from devito.tools import flatten
+from devito.tools import flatten, is_integer, prod
 from devito.types import Scalar
 
-__all__ = ['clusterize', 'groupby']
+__all__ = ['clusterize', 'groupby', 'traffic_cost', 'FusionDecision']
 
 
-def groupby(clusters):
+FusionDecision = namedtuple('FusionDecision', 'source sink fused cost')
+"""
+A record of the decision taken by the Cluster fusion algorithm. ``source`` and
+``sink`` are the Functions written by the two candidate PartialClusters, ``fused``
+is True if the PartialClusters have been fused, while ``cost`` is a tuple
+``(unfused traffic, fused traffic)``, in bytes per iteration point.
+"""
+
+
+def parse_size(value):
+    """
+    Convert a cache size, either an integer number of bytes or a string such as
+    "256 KB", "2048K" or "1 MiB", into an integer number of bytes.
+    """
+    if is_integer(value):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+)\s*([KMG]?)(i?B)?\s*', str(value), re.IGNORECASE)
+    if match is None:
+        raise ValueError("Cannot parse cache size `%s`" % value)
+    size, unit = match.group(1, 2)
+    return int(size)*1024**' KMG'.index(unit.upper() or ' ')
+
+
+def cache_size():
+    """
+    The size of the cache, in bytes, used by the Cluster fusion cost model to
+    evaluate the layer condition. This is the per-core L2 cache size, or None
+    if it could not be determined.
+
+    The size is read from sysfs if available. Otherwise, it is retrieved through
+    py-cpuinfo; older versions report the per-core size as a string such as
+    "256 KB", while newer ones report, in bytes, the total size across all
+    physical cores.
+    """
+    if cache_size.value is False:
+        cache_size.value = None
+        for i in glob('/sys/devices/system/cpu/cpu0/cache/index*'):
+            try:
+                with open(os.path.join(i, 'level')) as f:
+                    level = f.read().strip()
+                with open(os.path.join(i, 'type')) as f:
+                    ctype = f.read().strip()
+                with open(os.path.join(i, 'size')) as f:
+                    size = parse_size(f.read())
+            except (OSError, ValueError):
+                continue
+            if level == '2' and ctype in ('Unified', 'Data'):
+                cache_size.value = size
+                return size
+        try:
+            size = cpuinfo.get_cpu_info()['l2_cache_size']
+            if is_integer(size):
+                size //= psutil.cpu_count(logical=False) or 1
+            cache_size.value = parse_size(size) or None
+        except (KeyError, TypeError, ValueError):
+            pass
+    return cache_size.value
+cache_size.value = False  # noqa
+
+
+def traffic_cost(cluster, cache=None):
+    """
+    Estimate the memory traffic, in bytes per iteration point, of a PartialCluster.
+
+    Each ``(Function, mode)`` entry in ``cluster.traffic`` is a stream costing
+    ``itemsize`` bytes per point. If ``cache`` is provided, the "layer condition"
+    is also taken into account: if the layers of the Functions read along the
+    outer Dimensions (e.g., the ``2*k + 1`` planes of a ``k``-radius stencil)
+    don't fit in half of the cache, then each layer is counted as a separate stream.
+    """
+    streams = []
+    working_set = 0
+    for (f, mode), intervals in cluster.traffic.items():
+        itemsize = np.dtype(f.dtype).itemsize
+        nlayers = 1
+        if mode == 'r' and all(is_integer(i) for i in f.shape_allocated):
+            for n, d in enumerate(f.dimensions[:-1]):
+                if d.is_Time:
+                    # Different time slots are different streams anyway
+                    continue
+                try:
+                    i = intervals[d]
+                    layers = i.upper - i.lower + 1
+                except (AttributeError, TypeError, ValueError):
+                    continue
+                if layers > nlayers:
+                    nlayers = layers
+                    layer_size = prod(f.shape_allocated[n+1:])*itemsize
+            if nlayers > 1:
+                working_set += nlayers*layer_size
+        streams.append((itemsize, nlayers))
+
+    if cache is not None and working_set > cache // 2:
+        return sum(i*j for i, j in streams)
+    else:
+        return sum(i for i, _ in streams)
+
+
+def is_profitable(candidate, c, report):
+    """
+    Return True if fusing the PartialClusters ``candidate`` and ``c`` does not
+    increase the memory traffic, False otherwise. Fusion may increase the memory
+    traffic if the working set of the fused PartialCluster breaks the layer
+    condition. Ties are broken in favour of fusion, as fusion doesn't change
+    the operation count. The decision is appended to ``report`` and logged at
+    DEBUG level.
+    """
+    cache = cache_size()
+    fused = PartialCluster(candidate.exprs + [i for i in c.exprs
+                                              if i not in candidate.exprs],
+                           IterationSpace.merge(candidate.ispace, c.ispace),
+                           DataSpace.merge(candidate.dspace, c.dspace))
+
+    unfused_traffic = traffic_cost(candidate, cache) + traffic_cost(c, cache)
+    fused_traffic = traffic_cost(fused, cache)
+
+    ret = fused_traffic <= unfused_traffic
+    cost = (unfused_traffic, fused_traffic)
+    decision = FusionDecision(tuple(i.lhs.function for i in candidate.exprs),
+                              tuple(i.lhs.function for i in c.exprs), ret, cost)
+    report.append(decision)
+    debug("Cluster fusion %s: [%s] -> [%s] (traffic: %d -> %d bytes/point)" %
+          (('performed' if ret else 'rejected',
+            ','.join(i.name for i in decision.source),
+            ','.join(i.name for i in decision.sink)) + cost))
+    return ret
+
+
+def groupby(clusters, report=None):
     """
     Group PartialClusters together to create "fatter" PartialClusters
     (i.e., containing more expressions).
 
+    Parameters
+    ----------
+    clusters : ClusterGroup
+        The PartialClusters to be grouped.
+    report : list, optional
+        If provided, a FusionDecision is appended to ``report`` for each
+        pair of PartialClusters which could legally be fused, but only if the
+        ``fusion`` configuration parameter is set to ``traffic``.
+
     Notes
     -----
     This function relies on advanced data dependency analysis tools based upon
-    classic Lamport theory.
+    classic Lamport theory. If the ``fusion`` configuration parameter is set to
+    ``traffic``, then legal fusions are only performed if deemed profitable by a
+    memory traffic cost model (see :func:`traffic_cost`); otherwise, all legal
+    fusions are performed.
     """
     clusters = clusters.unfreeze()
 
+    costmodel = configuration['fusion'] == 'traffic'
+    report = report if report is not None else []
+
+    # The Scope of each PartialCluster, built incrementally to avoid
+    # recomputing the TimedAccesses for each pair of PartialClusters
+    scopes = {}
+
     processed = ClusterGroup()
     for c in clusters:
         fused = False
+        unprofitable = False
         for candidate in reversed(list(processed)):
             # Guarded clusters cannot be grouped together
             if c.guards:
                 break
 
             # Collect all relevant data dependences
-            scope = Scope(exprs=candidate.exprs + c.exprs)
+            if c not in scopes:
+                scopes[c] = Scope(c.exprs)
+            if candidate not in scopes:
+                scopes[candidate] = Scope(candidate.exprs)
+            scope = scopes[candidate].add(scopes[c])
 
             # Collect anti-dependences preventing grouping
             anti = scope.d_anti.carried() - scope.d_anti.increment
@@ -44,7 +206,14 @@ def groupby(clusters):
             test0 = not candidate.guards  # No intervening guards
             test1 = candidate.ispace.is_compatible(c.ispace)  # Compatible ispaces
             test2 = all(is_local(i, candidate, c, clusters) for i in funcs)  # No antideps
-            if test0 and test1 and test2:
+            test3 = test0 and test1 and test2
+            # Is it worth grouping `c` with `candidate`?
+            if test3 and costmodel and not is_profitable(candidate, c, report):
+                # Fusing `c` with an earlier Cluster would move it before
+                # `candidate`, thus breaking any data dependences between them
+                unprofitable = True
+                break
+            if test3:
                 # Yes, `c` can be grouped with `candidate`. All anti-dependences
                 # (if any) can be eliminated through "index bumping and array
                 # contraction", which turns Array temporaries into Scalar temporaries
@@ -56,6 +225,7 @@ def groupby(clusters):
 
                 bump_and_contract(funcs, candidate, c)
                 candidate.squash(c)
+                scopes.pop(candidate)
                 fused = True
                 break
             elif anti:
@@ -74,6 +244,10 @@ def groupby(clusters):
                 break
         # Fallback
         if not fused:
+            if unprofitable:
+                # Fusion is legal but not worth it. The time loop may still be
+                # shared, but not the space loops
+                c.atomics.update(d for d in c.dimensions if not d.is_Time)
             processed.append(c)
 
     return processed
@@ -231,8 +405,11 @@ def bump_and_contract(targets, source, sink):
     sink.exprs = processed
 
 
-def clusterize(exprs):
-    """Group a sequence of LoweredEqs into one or more Clusters."""
+def clusterize(exprs, report=None):
+    """
+    Group a sequence of LoweredEqs into one or more Clusters. If provided,
+    ``report`` is populated with the decisions taken by the fusion algorithm.
+    """
     clusters = ClusterGroup()
     flowmap = detect_flow_directions(exprs)
     prev = None
@@ -252,7 +429,7 @@ def clusterize(exprs):
             clusters.append(PartialCluster(scalars + [e], ispace, dspace))
 
     # Group PartialClusters together where possible
-    clusters = groupby(clusters)
+    clusters = groupby(clusters, report)
 
     # Introduce conditional PartialClusters
     clusters = guard(clusters)
@@ -225,6 +225,14 @@ class Cluster(PartialCluster):
     def squash(self, other):
         raise AttributeError
 
+    # Pickling support
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # The FlowGraph isn't pickable, but it can be rebuilt upon request
+        state.pop('trace', None)
+        return state
+
 
 class ClusterGroup(list):
 
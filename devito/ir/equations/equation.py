@@ -6,7 +6,7 @@ from devito.ir.support import (IterationSpace, DataSpace, Interval, IntervalGrou
                                force_directions, detect_flow_directions, build_intervals,
                                build_iterators)
 from devito.symbolics import FrozenExpr
-from devito.tools import Pickable, as_tuple
+from devito.tools import Pickable, as_tuple, dtype_to_compute
 
 __all__ = ['LoweredEq', 'ClusterizedEq', 'DummyEq']
 
@@ -57,7 +57,8 @@ class IREq(object):
 
     @property
     def dtype(self):
-        return self.lhs.dtype
+        # Values with a compact storage data type are computed in single precision
+        return dtype_to_compute(self.lhs.dtype)
 
     @property
     def grid(self):
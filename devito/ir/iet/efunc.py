@@ -77,9 +77,11 @@ def make_efunc(name, iet, dynamic_parameters=None, retval='void', prefix='static
     Create an ElementalFunction from (a sequence of) perfectly nested Iterations.
     """
     # Arrays are by definition (vector) temporaries, so if they are written
-    # within `iet`, they can also be declared and allocated within the `efunc`
+    # within `iet`, they can also be declared and allocated within the `efunc`,
+    # unless they are allocated from Python
     items = FindSymbols().visit(iet)
-    local = [i.write for i in FindNodes(Expression).visit(iet) if i.write.is_Array]
+    local = [i.write for i in FindNodes(Expression).visit(iet)
+             if i.write.is_Array and not (i.write._mem_external or i.write._mem_pooled)]
     external = [i for i in items if i.is_Tensor and i not in local]
 
     # Insert array casts
@@ -17,14 +17,22 @@ from devito.ir.support import Forward, detect_io
 from devito.parameters import configuration
 from devito.symbolics import FunctionFromPointer, as_symbol
 from devito.tools import (Signer, as_tuple, filter_ordered, filter_sorted, flatten,
-                          validate_type, dtype_to_cstr)
+                          memoized_func, validate_type, dtype_to_cstr)
 from devito.types import Symbol, Indexed
 from devito.types.basic import AbstractFunction
 
 __all__ = ['Node', 'Block', 'Denormals', 'Expression', 'Element', 'Callable',
            'Call', 'Conditional', 'Iteration', 'List', 'LocalExpression', 'Section',
-           'TimedList', 'MetaCall', 'ArrayCast', 'ForeignExpression', 'HaloSpot',
-           'IterationTree', 'ExpressionBundle', 'Increment']
+           'TimedList', 'ThreadTimedList', 'TracedList', 'MetaCall', 'ArrayCast',
+           'ForeignExpression', 'HaloSpot', 'IterationTree', 'ExpressionBundle',
+           'Increment']
+
+
+@memoized_func
+def _argnames(cls):
+    """The names of the arguments of ``cls.__init__``, ``self`` excluded."""
+    return inspect.getfullargspec(cls.__init__).args[1:]
+
 
 # First-class IET nodes
 
@@ -57,10 +65,10 @@ class Node(Signer):
 
     def __new__(cls, *args, **kwargs):
         obj = super(Node, cls).__new__(cls)
-        argnames = inspect.getfullargspec(cls.__init__).args
-        obj._args = {k: v for k, v in zip(argnames[1:], args)}
+        argnames = _argnames(cls)
+        obj._args = {k: v for k, v in zip(argnames, args)}
         obj._args.update(kwargs.items())
-        obj._args.update({k: None for k in argnames[1:] if k not in obj._args})
+        obj._args.update({k: None for k in argnames if k not in obj._args})
         return obj
 
     def _rebuild(self, *args, **kwargs):
@@ -97,6 +105,33 @@ class Node(Signer):
         """Return the traversable children."""
         return tuple(getattr(self, i) for i in self._traversable)
 
+    @cached_property
+    def _preorder(self):
+        """
+        The Nodes in the IET rooted in ``self``, in pre-order.
+
+        Nodes are immutable, so this is computed at most once per Node. As a
+        rebuilt Node usually shares most of its descendants with the original
+        Node, only the modified parts of an IET are ever traversed again.
+        """
+        ret = [self]
+        queue = list(reversed(self.children))
+        while queue:
+            i = queue.pop()
+            if isinstance(i, Node):
+                ret.extend(i._preorder)
+            elif isinstance(i, (tuple, list)):
+                queue.extend(reversed(i))
+        return ret
+
+    @cached_property
+    def _visitor_cache(self):
+        """
+        A cache for the Visitors whose output only depends on the IET rooted in
+        ``self``, such as :class:`FindSymbols`.
+        """
+        return {}
+
     @property
     def args(self):
         """Arguments used to construct the Node."""
@@ -227,13 +262,16 @@ class Expression(Node):
     @validate_type(('expr', ClusterizedEq))
     def __init__(self, expr):
         self.expr = expr
-        self.__expr_finalize__()
 
-    def __expr_finalize__(self):
-        """Finalize the Expression initialization."""
-        self._functions = tuple(filter_ordered(flatten(detect_io(self.expr, relax=True))))
-        self._dimensions = flatten(i.indices for i in self.functions if i.is_Indexed)
-        self._dimensions = tuple(filter_ordered(self._dimensions))
+    def _rebuild(self, *args, **kwargs):
+        obj = super(Expression, self)._rebuild(*args, **kwargs)
+        if obj.expr is self.expr:
+            # The symbolic analysis only depends on `expr`, so it carries over
+            for i in ['functions', 'dimensions']:
+                if i in self.__dict__:
+                    obj.__dict__[i] = self.__dict__[i]
+            obj._visitor_cache.update(self._visitor_cache)
+        return obj
 
     def __repr__(self):
         return "<%s::%s>" % (self.__class__.__name__,
@@ -253,9 +291,10 @@ class Expression(Node):
         """The Function this Expression writes to."""
         return self.expr.lhs.function
 
-    @property
+    @cached_property
     def dimensions(self):
-        return self._dimensions
+        dimensions = flatten(i.indices for i in self.functions if i.is_Indexed)
+        return tuple(filter_ordered(dimensions))
 
     @property
     def is_scalar(self):
@@ -280,9 +319,9 @@ class Expression(Node):
     def free_symbols(self):
         return tuple(self.expr.free_symbols)
 
-    @property
+    @cached_property
     def functions(self):
-        return self._functions
+        return tuple(filter_ordered(flatten(detect_io(self.expr, relax=True))))
 
 
 class Increment(Expression):
@@ -601,6 +640,44 @@ class TimedList(List):
                                "(double)(end_%(ln)s.tv_sec-start_%(ln)s.tv_sec)+" +
                                "(double)(end_%(ln)s.tv_usec-start_%(ln)s.tv_usec)" +
                                "/1000000") % {'gn': timer.name, 'ln': lname})]
+        if timer.sampled:
+            # Also accumulate the duration into the current entry of a ring
+            # buffer; a new entry starts every `period` executions
+            mapper = {'gn': timer.name, 'ln': lname}
+            footer.extend([
+                c.Statement(("int slot_%(ln)s = (%(gn)s->%(ln)s_count/%(gn)s->period)"
+                             " %% %(gn)s->size") % mapper),
+                c.Statement(("%(gn)s->%(ln)s_samples[slot_%(ln)s] = "
+                             "(%(gn)s->%(ln)s_count %% %(gn)s->period ? "
+                             "%(gn)s->%(ln)s_samples[slot_%(ln)s] : 0.0) + "
+                             "(double)(end_%(ln)s.tv_sec-start_%(ln)s.tv_sec)+"
+                             "(double)(end_%(ln)s.tv_usec-start_%(ln)s.tv_usec)"
+                             "/1000000") % mapper),
+                c.Statement("%(gn)s->%(ln)s_count += 1" % mapper)
+            ])
+        if timer.counted:
+            # Also read the performance counters of all threads, and accumulate
+            # the differences event by event. Each read yields the count and the
+            # times the counter was enabled and running, the ratio of which scales
+            # the count of a multiplexed counter. A failed read is counted as zero
+            mapper = {'gn': timer.name, 'ln': lname}
+            read = ("for (int i = 0; i < %(gn)s->nfds; i += 1) "
+                    "if (read(%(gn)s->fds[i], &%(v)s_%(ln)s[3*i], 3*sizeof(long long)) "
+                    "!= 3*sizeof(long long)) "
+                    "%(v)s_%(ln)s[3*i] = %(v)s_%(ln)s[3*i+1] = %(v)s_%(ln)s[3*i+2] = 0")
+            header.extend([
+                c.Statement(("long long pstart_%(ln)s[3*%(gn)s->nfds + 3], "
+                             "pend_%(ln)s[3*%(gn)s->nfds + 3]") % mapper),
+                c.Statement(read % dict(mapper, v='pstart'))
+            ])
+            footer = [c.Statement(read % dict(mapper, v='pend'))] + footer + [
+                c.Statement(("for (int i = 0; i < %(gn)s->nfds; i += 1) "
+                             "if (pend_%(ln)s[3*i+2] > pstart_%(ln)s[3*i+2]) "
+                             "%(gn)s->%(ln)s_counters[i %% %(gn)s->nevents] += "
+                             "(double)(pend_%(ln)s[3*i] - pstart_%(ln)s[3*i])*"
+                             "(pend_%(ln)s[3*i+1] - pstart_%(ln)s[3*i+1])/"
+                             "(pend_%(ln)s[3*i+2] - pstart_%(ln)s[3*i+2])") % mapper)
+            ]
         super(TimedList, self).__init__(header, body, footer)
 
     @property
@@ -616,6 +693,107 @@ class TimedList(List):
         return (self.timer,)
 
 
+class ThreadTimedList(List):
+
+    """
+    Wrap the body of an OpenMP parallel region with C-level timers, one per
+    thread, accumulating the time each thread spends working, that is until it
+    reaches the barrier at the end of the parallel region.
+
+    Parameters
+    ----------
+    timer : ThreadTimer
+        The Timer used by the ThreadTimedList.
+    lname : str
+        The name of the timed code section the parallel region belongs to.
+    body : Node or list of Node
+        The ThreadTimedList body.
+    """
+
+    def __init__(self, timer, lname, body):
+        self._name = lname
+        self._timer = timer
+        mapper = {'gn': timer.name, 'ln': lname}
+        header = [c.Initializer(c.Value('const int', 'tid_%(ln)s' % mapper),
+                                'omp_get_thread_num()'),
+                  c.Initializer(c.Value('const double', 'wstart_%(ln)s' % mapper),
+                                'omp_get_wtime()')]
+        footer = [c.If("tid_%(ln)s < %(gn)s->maxthreads" % mapper,
+                       c.Statement("%(gn)s->%(ln)s_threads[tid_%(ln)s] += "
+                                   "omp_get_wtime() - wstart_%(ln)s" % mapper)),
+                  c.If("tid_%(ln)s == 0 && omp_get_num_threads() > %(gn)s->nthreads"
+                       % mapper,
+                       c.Statement("%(gn)s->nthreads = omp_get_num_threads()" % mapper))]
+        super(ThreadTimedList, self).__init__(header, body, footer)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def timer(self):
+        return self._timer
+
+    @property
+    def free_symbols(self):
+        return (self.timer,)
+
+
+class TracedList(List):
+
+    """
+    Wrap a Node with C-level timestamps, recorded into the event buffer of
+    a Tracer.
+
+    Parameters
+    ----------
+    tracer : Tracer
+        The Tracer used by the TracedList.
+    lname : str
+        A unique name for the traced code block.
+    eid : int
+        The identifier of the traced code block within ``tracer``.
+    body : Node or list of Node
+        The TracedList body.
+    """
+
+    def __init__(self, tracer, lname, eid, body):
+        self._name = lname
+        self._tracer = tracer
+        self._eid = eid
+        mapper = {'tn': tracer.name, 'ln': lname, 'eid': eid}
+        header = [c.Statement("struct timeval tstart_%(ln)s, tend_%(ln)s" % mapper),
+                  c.Statement("gettimeofday(&tstart_%(ln)s, NULL)" % mapper)]
+        footer = [c.Statement("gettimeofday(&tend_%(ln)s, NULL)" % mapper),
+                  c.If("%(tn)s->nevents < %(tn)s->capacity" % mapper, c.Block([
+                      c.Statement("double *event_%(ln)s = %(tn)s->events + "
+                                  "3*%(tn)s->nevents" % mapper),
+                      c.Statement("event_%(ln)s[0] = %(eid)d" % mapper),
+                      c.Statement("event_%(ln)s[1] = (double)tstart_%(ln)s.tv_sec + "
+                                  "(double)tstart_%(ln)s.tv_usec/1000000" % mapper),
+                      c.Statement("event_%(ln)s[2] = (double)tend_%(ln)s.tv_sec + "
+                                  "(double)tend_%(ln)s.tv_usec/1000000" % mapper)
+                  ])),
+                  c.Statement("%(tn)s->nevents += 1" % mapper)]
+        super(TracedList, self).__init__(header, body, footer)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def tracer(self):
+        return self._tracer
+
+    @property
+    def eid(self):
+        return self._eid
+
+    @property
+    def free_symbols(self):
+        return (self.tracer,)
+
+
 class Denormals(List):
 
     """Macros to make sure denormal numbers are flushed in hardware."""
@@ -693,7 +871,6 @@ class ForeignExpression(Expression):
         self.expr = expr
         self._dtype = dtype
         self._is_increment = kwargs.get('is_Increment', False)
-        self.__expr_finalize__()
 
     @property
     def dtype(self):
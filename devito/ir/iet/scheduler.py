@@ -1,15 +1,15 @@
 from collections import OrderedDict
 
-from devito.cgen_utils import Allocator
+from devito.cgen_utils import Allocator, compact_conversions
 from devito.ir.iet import (Expression, Increment, LocalExpression, Element, Iteration,
                            List, Conditional, Section, HaloSpot, ExpressionBundle,
                            MapExpressions, Transformer, FindNodes, FindSymbols, XSubs,
                            iet_analyze, filter_iterations)
-from devito.symbolics import IntDiv, xreplace_indices
-from devito.tools import as_mapper
+from devito.symbolics import DefFunction, IntDiv, retrieve_indexed, xreplace_indices
+from devito.tools import as_mapper, filter_ordered, is_compact_dtype
 from devito.types import ConditionalDimension
 
-__all__ = ['iet_build', 'iet_insert_C_decls']
+__all__ = ['iet_build', 'iet_insert_C_decls', 'iet_lower_storage']
 
 
 def iet_build(stree):
@@ -103,6 +103,53 @@ def iet_lower_dimensions(iet):
     return iet
 
 
+def iet_lower_storage(iet):
+    """
+    Convert the accesses to Functions with a compact storage data type (e.g.,
+    ``np.float16``, ``bfloat16``) so that arithmetic is carried out in single
+    precision. Loads are converted to single precision, while stores convert
+    back to the storage data type. Increments to such Functions become plain
+    assignments; thus, a reduction into such a Function is rounded to the
+    storage data type at each increment, rather than accumulated in single
+    precision.
+
+        Example: ``u[t1, x] = u[t0, x] + 1 >>> u[t1, x] = S(L(u[t0, x]) + 1)``
+
+    Returns
+    -------
+    iet : Node
+        The transformed Iteration/Expression tree.
+    definitions : list of cgen objects
+        The definitions of the conversion routines used in ``iet``.
+    """
+    def is_compact(indexed):
+        return is_compact_dtype(indexed.function.dtype)
+
+    def load(indexed):
+        return DefFunction(compact_conversions(indexed.function.dtype)[0], indexed)
+
+    mapper = {}
+    dtypes = []
+    for e in FindNodes(Expression).visit(iet):
+        lhs, rhs = e.expr.args
+        loads = [i for i in retrieve_indexed(rhs) if is_compact(i)]
+        rhs = rhs.xreplace({i: load(i) for i in loads})
+        dtypes.extend(i.function.dtype for i in loads)
+        if lhs.is_Indexed and is_compact(lhs):
+            if e.is_Increment:
+                rhs = load(lhs) + rhs
+            rhs = DefFunction(compact_conversions(lhs.function.dtype)[1], rhs)
+            dtypes.append(lhs.function.dtype)
+            mapper[e] = Expression(e.expr.func(lhs, rhs))
+        elif loads:
+            mapper[e] = e._rebuild(expr=e.expr.func(lhs, rhs))
+    iet = Transformer(mapper).visit(iet)
+
+    definitions = [compact_conversions(i)[2] for i in filter_ordered(dtypes)]
+
+    return iet, filter_ordered(definitions, key=id)
+
+
 def iet_insert_C_decls(iet, external=None):
     """
     Given an IET, build a new tree with the necessary symbol declarations.
@@ -141,6 +188,9 @@ def iet_insert_C_decls(iet, external=None):
                     if i in external:
                         # The Array is to be defined in some foreign IET
                         continue
+                    elif i._mem_external or i._mem_pooled:
+                        # Allocated from Python, and passed in as an argument
+                        continue
                     elif i._mem_stack:
                         # On the stack
                         key = lambda i: not i.is_Parallel
@@ -313,13 +313,14 @@ class CGen(Visitor):
         header = [c.Line(i) for i in o._headers]
         includes = [c.Include(i, system=False) for i in o._includes]
         includes += [blankline]
+        globs = [i for j in o._globals for i in (j, blankline)]
         cdefs = [i._C_typedecl for i in o.parameters if i._C_typedecl is not None]
         cdefs = filter_sorted(cdefs, key=lambda i: i.tpname)
         if o._compiler.src_ext == 'cpp':
             cdefs += [c.Extern('C', signature)]
         cdefs = [i for j in cdefs for i in (j, blankline)]
 
-        return c.Module(header + includes + cdefs +
+        return c.Module(header + includes + globs + cdefs +
                         esigns + [blankline, kernel] + efuncs)
 
 
@@ -492,8 +493,26 @@ class FindSymbols(Visitor):
 
     def __init__(self, mode='symbolics'):
         super(FindSymbols, self).__init__()
+        self.mode = mode
         self.rule = self.rules[mode]
 
+    def _visit(self, o, *args, **kwargs):
+        # The symbols of a Node only depend on the IET rooted in it, so
+        # they're cached on the Node itself
+        if not isinstance(o, Node):
+            return super(FindSymbols, self)._visit(o, *args, **kwargs)
+        key = (FindSymbols, self.mode)
+        try:
+            return o._visitor_cache[key]
+        except KeyError:
+            ret = super(FindSymbols, self)._visit(o, *args, **kwargs)
+            o._visitor_cache[key] = ret
+            return ret
+
+    def _post_visit(self, ret):
+        # Callers may modify the returned list, not the cached one
+        return list(ret)
+
     def visit_tuple(self, o):
         symbols = flatten([self._visit(i) for i in o])
         return filter_sorted(symbols, key=attrgetter('name'))
@@ -545,6 +564,13 @@ class FindNodes(Visitor):
         self.match = match
         self.rule = self.rules[mode]
 
+    def visit(self, o, *args, **kwargs):
+        # Fast path: a lookup through the pre-order of the Nodes, which is
+        # cached on each Node, rather than an actual tree traversal
+        if isinstance(o, Node) and not args and not kwargs:
+            return [i for i in o._preorder if self.rule(self.match, i)]
+        return super(FindNodes, self).visit(o, *args, **kwargs)
+
     def visit_object(self, o, ret=None):
         return ret
 
@@ -1,4 +1,5 @@
 from cached_property import cached_property
+import numpy as np
 from sympy import Basic, S
 
 from devito.ir.support.space import Any, Backward
@@ -262,6 +263,31 @@ class IterationInstance(Vector):
                 aindices.append(dims.pop() if len(dims) == 1 else None)
         return EnrichedTuple(*aindices, getters=self.findices)
 
+    @cached_property
+    def affine_split(self):
+        """
+        Split each index function into a symbolic part and an integer offset.
+        The distance between two IterationInstances with same symbolic parts
+        is therefore the difference of their offsets. Return None if any of
+        the offsets isn't an integer.
+        """
+        parts = []
+        offsets = []
+        for i in self:
+            if is_integer(i):
+                parts.append(S.Zero)
+                offsets.append(int(i))
+                continue
+            try:
+                offset, part = i.as_coeff_Add()
+            except AttributeError:
+                return None
+            if not offset.is_Integer:
+                return None
+            parts.append(part)
+            offsets.append(int(offset))
+        return tuple(parts), tuple(offsets)
+
     @cached_property
     def findices_affine(self):
         return tuple(fi for fi, im in zip(self.findices, self.index_mode) if im == AFFINE)
@@ -501,6 +527,34 @@ class TimedAccess(Access):
             raise TypeError("Cannot compare due to mismatching `direction`")
         return super(TimedAccess, self).__lt__(other)
 
+    @cached_property
+    def signature(self):
+        """
+        A 3-tuple ``(parts, directions, offsets)``, consisting of the symbolic
+        parts of the index functions, the iteration directions, and the integer
+        offsets of the index functions, negated along Backward directions. Along
+        the index functions with same symbolic part, the distance between two
+        TimedAccesses with same directions is the difference of their offsets.
+        None if ``self`` has no integer offsets.
+        """
+        split = self.affine_split
+        if split is None:
+            return None
+        parts, offsets = split
+        offsets = tuple(-i if d == Backward else i
+                        for i, d in zip(offsets, self.directions))
+        return parts, tuple(self.directions), offsets
+
+    def shift(self, n):
+        """
+        Return a copy of ``self`` with the timestamp shifted by ``n``. The
+        analysis results cached on ``self`` are carried over.
+        """
+        obj = tuple.__new__(self.__class__, self)
+        obj.__dict__.update(self.__dict__)
+        obj.timestamp = self.timestamp + n
+        return obj
+
     def lex_eq(self, other):
         return self.timestamp == other.timestamp
 
@@ -752,25 +806,95 @@ class Scope(object):
         A Scope represents a group of TimedAcces objects extracted
         from some IREq ``exprs``. The expressions must be provided
         in program order.
+
+        Notes
+        -----
+        The data dependences are computed through an index of the TimedAccesses
+        to each Function. In the index, the TimedAccesses are grouped by
+        ``signature`` (i.e., by symbolic part of the index functions and by
+        iteration directions), so that the distance between any two
+        TimedAccesses in the same group boils down to the difference of integer
+        offsets, computed at once for all such pairs with NumPy. Only the
+        remaining pairs are compared symbolically.
+
+        A Scope may also be derived incrementally from another Scope, through
+        :meth:`add` and :meth:`remove`, thus reusing the TimedAccesses (and
+        their analysis) rather than rebuilding them from scratch.
         """
         exprs = as_tuple(exprs)
 
-        self.reads = {}
-        self.writes = {}
+        accesses = []
         for i, e in enumerate(exprs):
+            v = []
             # reads
             for j in retrieve_terminals(e.rhs):
-                v = self.reads.setdefault(j.function, [])
                 mode = 'RI' if e.is_Increment and j.function is e.lhs.function else 'R'
                 v.append(TimedAccess(j, mode, i, e.ispace.directions))
             # write
-            v = self.writes.setdefault(e.lhs.function, [])
             mode = 'WI' if e.is_Increment else 'W'
             v.append(TimedAccess(e.lhs, mode, i, e.ispace.directions))
             # if an increment, we got one implicit read
             if e.is_Increment:
-                v = self.reads.setdefault(e.lhs.function, [])
                 v.append(TimedAccess(e.lhs, 'RI', i, e.ispace.directions))
+            accesses.append(tuple(v))
+
+        self._build(exprs, accesses)
+
+    def _build(self, exprs, accesses):
+        self.exprs = exprs
+        self._accesses = tuple(accesses)
+
+        self.reads = {}
+        self.writes = {}
+        for v in self._accesses:
+            for i in v:
+                if i.mode == 'WI' or i.mode == 'W':
+                    self.writes.setdefault(i.function, []).append(i)
+                else:
+                    self.reads.setdefault(i.function, []).append(i)
+
+    @classmethod
+    def _rebuild(cls, exprs, accesses):
+        obj = cls.__new__(cls)
+        obj._build(exprs, accesses)
+        return obj
+
+    @property
+    def _timestamps(self):
+        """The number of timestamps used by the TimedAccesses in ``self``."""
+        return self._accesses[-1][0].timestamp + 1 if self._accesses else 0
+
+    def add(self, exprs):
+        """
+        Build a new Scope from the IREqs in ``self`` followed by ``exprs``.
+
+        Parameters
+        ----------
+        exprs : IREq or list of IREq or Scope
+            The expressions to be added, in program order. If a Scope, its
+            TimedAccesses are reused too.
+        """
+        other = exprs if isinstance(exprs, Scope) else Scope(exprs)
+        n = self._timestamps
+        accesses = [tuple(i.shift(n) for i in v) for v in other._accesses]
+        return Scope._rebuild(self.exprs + other.exprs, self._accesses + tuple(accesses))
+
+    def remove(self, exprs):
+        """
+        Build a new Scope from the IREqs in ``self`` except for ``exprs``.
+        The timestamps of the TimedAccesses in the new Scope aren't contiguous,
+        but they preserve the program order, which is all that matters to the
+        data dependence analysis.
+
+        Parameters
+        ----------
+        exprs : IREq or list of IREq
+            The expressions to be removed. They are matched by identity.
+        """
+        drop = {id(i) for i in as_tuple(exprs)}
+        retain = [n for n, e in enumerate(self.exprs) if id(e) not in drop]
+        return Scope._rebuild(tuple(self.exprs[n] for n in retain),
+                              [self._accesses[n] for n in retain])
 
     def getreads(self, function):
         return as_tuple(self.reads.get(function))
@@ -812,22 +936,134 @@ class Scope(object):
         groups = list(self.reads.values()) + list(self.writes.values())
         return [i for group in groups for i in group]
 
+    @cached_property
+    def _signatures(self):
+        """
+        A mapper from the symbolic parts and the iteration directions of the
+        TimedAccesses to unique identifiers.
+        """
+        return {}
+
+    @memoized_meth
+    def _index(self, function, mode):
+        """
+        Index the reads (``mode='R'``) or the writes (``mode='W'``) of
+        ``function`` by signature. Return a dict of NumPy arrays, with one entry
+        per TimedAccess:
+
+            * valid: False if the TimedAccess has no signature;
+            * directions: the identifier of the iteration directions;
+            * parts: the identifiers of the symbolic parts;
+            * symbols: True where the symbolic part is a symbol or zero;
+            * offsets: the integer offsets;
+            * timestamps: the timestamps.
+        """
+        accesses = self.getreads(function) if mode == 'R' else self.getwrites(function)
+        rank = len(accesses[0].findices) if accesses else 0
+        ids = self._signatures
+
+        valid = []
+        directions = []
+        parts = []
+        symbols = []
+        offsets = []
+        for i in accesses:
+            signature = i.signature
+            if signature is None:
+                valid.append(False)
+                directions.append(-1)
+                parts.append((-1,)*rank)
+                symbols.append((False,)*rank)
+                offsets.append((0,)*rank)
+            else:
+                v, d, o = signature
+                valid.append(True)
+                directions.append(ids.setdefault(d, len(ids)))
+                parts.append(tuple(ids.setdefault(j, len(ids)) for j in v))
+                symbols.append(tuple(j is S.Zero or j.is_Symbol for j in v))
+                offsets.append(o)
+
+        shape = (len(accesses), rank)
+        return {'valid': np.array(valid, dtype=bool),
+                'directions': np.array(directions, dtype=np.int64),
+                'parts': np.array(parts, dtype=np.int64).reshape(shape),
+                'symbols': np.array(symbols, dtype=bool).reshape(shape),
+                'offsets': np.array(offsets, dtype=np.int64).reshape(shape),
+                'timestamps': np.array([i.timestamp for i in accesses], dtype=np.int64)}
+
+    def _compare(self, function, sink, source):
+        """
+        Lexicographically compare the TimedAccesses to ``function`` in mode
+        ``sink`` (either 'R' or 'W') against those in mode ``source``. Return
+        three matrices, with one row per source and one column per sink:
+
+            * the sign of the distance from the source to the sink, that is
+              the outcome of the comparison;
+            * the difference between the sink and the source timestamps;
+            * the status of the comparison: 0 if the sign is meaningful, 1 if
+              the TimedAccesses are definitely not comparable (i.e., a direct
+              comparison would raise a TypeError), 2 if the TimedAccesses must
+              be compared symbolically.
+        """
+        s = self._index(function, sink)
+        o = self._index(function, source)
+        shape = (len(o['valid']), len(s['valid']))
+
+        sign = np.zeros(shape, dtype=np.int64)
+        status = np.zeros(shape, dtype=np.int64)
+
+        if s['parts'].shape[-1] > 0:
+            same = s['parts'][None, :, :] == o['parts'][:, None, :]
+            distance = s['offsets'][None, :, :] - o['offsets'][:, None, :]
+            symbols = s['symbols'][None, :, :] & o['symbols'][:, None, :]
+
+            # The first entry either with different symbolic parts, and thus not
+            # comparable, or with non-zero distance
+            stop = ~same | (distance != 0)
+            found = stop.any(axis=-1)
+            first = stop.argmax(axis=-1)
+            i, j = np.ogrid[:first.shape[0], :first.shape[1]]
+            same = same[i, j, first]
+            distance = distance[i, j, first]
+            symbols = symbols[i, j, first]
+
+            sign[found & same] = np.sign(distance[found & same])
+            # The difference between two distinct symbols is never an integer,
+            # while that of arbitrary expressions might be
+            status[found & ~same & symbols] = 1
+            status[found & ~same & ~symbols] = 2
+
+        status[o['directions'][:, None] != s['directions'][None, :]] = 1
+        status[~(o['valid'][:, None] & s['valid'][None, :])] = 2
+
+        lex = s['timestamps'][None, :] - o['timestamps'][:, None]
+
+        return sign, lex, status
+
     @cached_property
     def d_flow(self):
         """Retrieve the flow dependencies, or true dependencies, or read-after-write."""
         found = DependenceGroup()
         for k, v in self.writes.items():
-            for w in v:
-                for r in self.reads.get(k, []):
-                    try:
-                        is_flow = (r < w) or (r == w and r.lex_ge(w))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence, unless
-                        # it's a read-for-increment
-                        is_flow = not r.is_read_increment
-                    if is_flow:
-                        found.append(Dependence(w, r))
+            reads = self.reads.get(k, [])
+            if not reads:
+                continue
+            sign, lex, status = self._compare(k, 'R', 'W')
+            increment = np.array([r.is_read_increment for r in reads], dtype=bool)
+            # All pairs but those to be compared symbolically, at once
+            flow = (status == 0) & ((sign < 0) | ((sign == 0) & (lex >= 0)))
+            flow |= (status == 1) & ~increment[None, :]
+            for i, j in zip(*np.nonzero(status == 2)):
+                w, r = v[i], reads[j]
+                try:
+                    is_flow = (r < w) or (r == w and r.lex_ge(w))
+                except TypeError:
+                    # Non-integer vectors are not comparable.
+                    # Conservatively, we assume it is a dependence, unless
+                    # it's a read-for-increment
+                    is_flow = not r.is_read_increment
+                flow[i, j] = bool(is_flow)
+            found.extend(Dependence(v[i], reads[j]) for i, j in zip(*np.nonzero(flow)))
         return found
 
     @cached_property
@@ -835,17 +1071,25 @@ class Scope(object):
         """Retrieve the anti dependencies, or write-after-read."""
         found = DependenceGroup()
         for k, v in self.writes.items():
-            for w in v:
-                for r in self.reads.get(k, []):
-                    try:
-                        is_anti = (r > w) or (r == w and r.lex_lt(w))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence, unless
-                        # it's a read-for-increment
-                        is_anti = not r.is_read_increment
-                    if is_anti:
-                        found.append(Dependence(r, w))
+            reads = self.reads.get(k, [])
+            if not reads:
+                continue
+            sign, lex, status = self._compare(k, 'R', 'W')
+            increment = np.array([r.is_read_increment for r in reads], dtype=bool)
+            # All pairs but those to be compared symbolically, at once
+            anti = (status == 0) & ((sign > 0) | ((sign == 0) & (lex < 0)))
+            anti |= (status == 1) & ~increment[None, :]
+            for i, j in zip(*np.nonzero(status == 2)):
+                w, r = v[i], reads[j]
+                try:
+                    is_anti = (r > w) or (r == w and r.lex_lt(w))
+                except TypeError:
+                    # Non-integer vectors are not comparable.
+                    # Conservatively, we assume it is a dependence, unless
+                    # it's a read-for-increment
+                    is_anti = not r.is_read_increment
+                anti[i, j] = bool(is_anti)
+            found.extend(Dependence(reads[j], v[i]) for i, j in zip(*np.nonzero(anti)))
         return found
 
     @cached_property
@@ -853,16 +1097,20 @@ class Scope(object):
         """Retrieve the output dependencies, or write-after-write."""
         found = DependenceGroup()
         for k, v in self.writes.items():
-            for w1 in v:
-                for w2 in self.writes.get(k, []):
-                    try:
-                        is_output = (w2 > w1) or (w2 == w1 and w2.lex_gt(w1))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence
-                        is_output = True
-                    if is_output:
-                        found.append(Dependence(w2, w1))
+            sign, lex, status = self._compare(k, 'W', 'W')
+            # All pairs but those to be compared symbolically, at once
+            output = (status == 0) & ((sign > 0) | ((sign == 0) & (lex > 0)))
+            output |= status == 1
+            for i, j in zip(*np.nonzero(status == 2)):
+                w1, w2 = v[i], v[j]
+                try:
+                    is_output = (w2 > w1) or (w2 == w1 and w2.lex_gt(w1))
+                except TypeError:
+                    # Non-integer vectors are not comparable.
+                    # Conservatively, we assume it is a dependence
+                    is_output = True
+                output[i, j] = bool(is_output)
+            found.extend(Dependence(v[j], v[i]) for i, j in zip(*np.nonzero(output)))
         return found
 
     @cached_property
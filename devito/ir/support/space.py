@@ -339,6 +339,11 @@ class IterationDirection(object):
     def __hash__(self):
         return hash(self._name)
 
+    def __reduce__(self):
+        # Unpickle to the module-level singletons, as the directions are
+        # often compared by identity
+        return {'++': 'Forward', '--': 'Backward', '*': 'Any'}[self._name]
+
 
 Forward = IterationDirection('++')
 """Forward iteration direction ('++')."""
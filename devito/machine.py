@@ -0,0 +1,227 @@
+"""
+Characterise the machine the Operators run on, through micro-benchmarks measuring
+the attainable memory bandwidth and the attainable floating-point performance.
+These are the two ceilings of the roofline model.
+"""
+
+from collections import namedtuple
+from ctypes import POINTER, byref, c_float, c_int, c_long, c_void_p
+from hashlib import sha1
+from time import time
+import json
+import os
+import platform
+
+import numpy as np
+
+from devito.compiler import jit_compile, load
+from devito.logger import info
+from devito.parameters import configuration
+from devito.tools import make_tempdir
+
+__all__ = ['MachineModel', 'machine_model', 'characterize']
+
+
+MachineModel = namedtuple('MachineModel', 'bandwidth gflopss')
+"""
+The ceilings of the roofline model: the attainable memory bandwidth, in GB/s,
+and the attainable floating-point performance, in GFlops/s.
+"""
+
+
+# A STREAM-like triad. The iterations are distributed over the threads as in
+# an Operator, so that, with first-touch, each thread accesses local memory
+_stream_code = """\
+void init(float *restrict a, float *restrict b, float *restrict c, const long n)
+{
+  %(parallel)s
+  for (long i = 0; i < n; i++)
+  {
+    a[i] = 0.0F;
+    b[i] = 1.0F;
+    c[i] = 2.0F;
+  }
+}
+
+void triad(float *restrict a, const float *restrict b, const float *restrict c,
+           const float s, const long n)
+{
+  %(parallel)s
+  for (long i = 0; i < n; i++)
+  {
+    a[i] = b[i] + s*c[i];
+  }
+}
+"""
+
+
+# Independent chains of fused multiply-adds, enough to saturate the FMA units
+# regardless of their latency
+_peak_code = """\
+#define NCHAINS %(nchains)d
+
+float fma_chains(const long niters, const float y, const float z, int *nthreads)
+{
+  float sum = 0.0F;
+  int n = 0;
+  %(parallel)s
+  {
+    n += 1;
+    float x[NCHAINS];
+    for (int i = 0; i < NCHAINS; i++)
+    {
+      x[i] = (float) i;
+    }
+    for (long it = 0; it < niters; it++)
+    {
+      #pragma omp simd
+      for (int i = 0; i < NCHAINS; i++)
+      {
+        x[i] = x[i]*y + z;
+      }
+    }
+    for (int i = 0; i < NCHAINS; i++)
+    {
+      sum += x[i];
+    }
+  }
+  *nthreads = n;
+  return sum;
+}
+"""
+
+
+def _build(name, code):
+    """JIT-compile ``code`` through the Devito compiler, and load it."""
+    compiler = configuration['compiler']
+    soname = "%s_%s" % (name, sha1((code + str(compiler.__dict__)).encode())
+                        .hexdigest())
+    jit_compile(soname, code, compiler)
+    return load(soname)
+
+
+def measure_bandwidth(size=2**24, repeat=10):
+    """
+    The attainable memory bandwidth, in GB/s, as the best of ``repeat`` runs
+    of a STREAM-like triad over arrays of ``size`` single-precision elements.
+    Only the compulsory traffic (two loads, one store) is accounted for.
+    """
+    if configuration['openmp']:
+        parallel = '#pragma omp parallel for schedule(static)'
+    else:
+        parallel = ''
+    lib = _build('stream', _stream_code % {'parallel': parallel})
+    lib.init.argtypes = [c_void_p, c_void_p, c_void_p, c_long]
+    lib.triad.argtypes = [c_void_p, c_void_p, c_void_p, c_float, c_long]
+
+    # Uninitialized, so that the pages are first touched by the generated code
+    a, b, c = (np.empty(size, dtype=np.float32) for _ in range(3))
+    lib.init(a.ctypes.data, b.ctypes.data, c.ctypes.data, size)
+
+    best = np.inf
+    for _ in range(repeat):
+        tic = time()
+        lib.triad(a.ctypes.data, b.ctypes.data, c.ctypes.data, 3.0, size)
+        best = min(best, time() - tic)
+
+    return 3*a.itemsize*size/best/10**9
+
+
+def measure_gflopss(niters=2**22, nchains=128, repeat=5):
+    """
+    The attainable floating-point performance, in GFlops/s, as the best of
+    ``repeat`` runs of ``niters`` iterations over ``nchains`` independent
+    chains of single-precision fused multiply-adds.
+    """
+    if configuration['openmp']:
+        parallel = '#pragma omp parallel reduction(+:sum,n)'
+    else:
+        parallel = ''
+    lib = _build('peak', _peak_code % {'nchains': nchains, 'parallel': parallel})
+    lib.fma_chains.argtypes = [c_long, c_float, c_float, POINTER(c_int)]
+    lib.fma_chains.restype = c_float
+
+    nthreads = c_int()
+    best = np.inf
+    for _ in range(repeat):
+        tic = time()
+        lib.fma_chains(niters, 0.999999, 1e-6, byref(nthreads))
+        best = min(best, time() - tic)
+
+    return 2*nchains*niters*nthreads.value/best/10**9
+
+
+def _key():
+    """
+    The characteristics are tied to the host, to the compiler, and to the
+    number of threads.
+    """
+    compiler = configuration['compiler']
+    nthreads = os.environ.get('OMP_NUM_THREADS') if configuration['openmp'] else 1
+    return "%s-%s-%s-nthreads%s" % (platform.node(), compiler, compiler.cc, nthreads)
+
+
+def _cachefile():
+    return make_tempdir('machine').joinpath('roofline.json')
+
+
+def characterize(refresh=False):
+    """
+    Run the micro-benchmarks characterising this machine, and return a
+    :class:`MachineModel`. The results are cached per host, compiler, and
+    number of threads, across sessions.
+
+    Parameters
+    ----------
+    refresh : bool, optional
+        If True, the micro-benchmarks are run even if the results are cached.
+    """
+    key = _key()
+    cachefile = _cachefile()
+    try:
+        with open(str(cachefile)) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        cache = {}
+
+    if key in cache and not refresh:
+        return MachineModel(**cache[key])
+
+    info("Characterising the machine (memory bandwidth, FMA peak) ...")
+    model = MachineModel(measure_bandwidth(), measure_gflopss())
+    info("Attainable memory bandwidth: %.2f GB/s, attainable performance: %.2f "
+         "GFlops/s" % model)
+
+    cache[key] = model._asdict()
+    with open(str(cachefile), 'w') as f:
+        json.dump(cache, f)
+
+    return model
+
+
+def machine_model():
+    """
+    The :class:`MachineModel` of this machine if ``configuration['roofline']``
+    is set, None otherwise. The ceilings may also be provided by the user,
+    as a ``(bandwidth, gflopss)`` 2-tuple, rather than be measured.
+    """
+    roofline = configuration['roofline']
+    if not roofline:
+        return None
+    elif isinstance(roofline, (tuple, list)):
+        return MachineModel(*[float(i) for i in roofline])
+    else:
+        return characterize()
+
+
+def _roofline_callback(value):
+    if isinstance(value, str):
+        # E.g., from the environment, either '0', '1' or 'bandwidth,gflopss'
+        value = tuple(value.split(',')) if ',' in value else int(value)
+    return value
+
+
+# Should the performance summaries report the attainable performance according
+# to the roofline model? Either 0 (no), 1 (yes, measuring the machine ceilings
+# through micro-benchmarks, once per host), or a 2-tuple (bandwidth, gflopss)
+configuration.add('roofline', 0, callback=_roofline_callback, impacts_jit=False)
@@ -467,6 +467,7 @@ class MPICommObject(Object):
         comm_ptr = MPI._addressof(comm)
         comm_val = self.dtype.from_address(comm_ptr)
         self.value = comm_val
+        self.comm = comm
 
     # Pickling support
     _pickle_args = []
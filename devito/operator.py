@@ -1,25 +1,38 @@
 from collections import OrderedDict
 from functools import reduce
 from operator import mul
+from threading import Lock, local
+from time import time
 
 from cached_property import cached_property
 import ctypes
+import numpy as np
+from psutil import virtual_memory
+from sympy import lambdify
 
 from devito.compiler import jit_compile, load, save
+from devito.data import Data, allocator_stats, default_allocator
 from devito.dle import transform
 from devito.dse import rewrite
 from devito.equation import Eq
-from devito.exceptions import InvalidOperator
-from devito.logger import info, perf, warning
+from devito.exceptions import InvalidArgument, InvalidOperator
+from devito.logger import PERF, debug, info, logger, perf, warning
+from devito.machine import characterize, machine_model
 from devito.ir.equations import LoweredEq
 from devito.ir.clusters import clusterize
-from devito.ir.iet import (Callable, List, MetaCall, iet_build, iet_insert_C_decls,
+from devito.ir.iet import (Call, Callable, Conditional, Expression, Iteration, List,
+                           MetaCall, Section, TimedList, TracedList, FindNodes,
+                           Transformer, iet_build, iet_insert_C_decls, iet_lower_storage,
                            ArrayCast, derive_parameters)
 from devito.ir.stree import st_build
 from devito.parameters import configuration
-from devito.profiling import create_profile
-from devito.symbolics import indexify
-from devito.tools import Signer, ReducerMap, as_tuple, flatten, filter_sorted, split
+from devito.profiling import create_profile, memory_usage
+from devito.registry import perf_registry
+from devito.symbolics import evaluate, indexify
+from devito.tools import (Signer, ReducerMap, as_tuple, flatten, filter_ordered,
+                          filter_sorted, humanbytes, memoized_queries, split)
+from devito.tracing import Tracer, trace, trace_recorder
+from devito.types import Scalar
 
 __all__ = ['Operator']
 
@@ -88,8 +101,9 @@ class Operator(Callable):
 
     Tensor contractions are supported, but with one caveat: in case of MPI execution, any
     global reductions along an MPI-distributed Dimension should be handled explicitly in
-    user code. The following example shows how to implement the matrix-vector
-    multiplication ``Av = b`` (inducing a reduction along ``y``).
+    user code, or requested to the DLE through the ``mpireduce`` option. The following
+    example shows how to implement the matrix-vector multiplication ``Av = b``
+    (inducing a reduction along ``y``).
 
     >>> from devito import Inc, Function
     >>> A = Function(name='A', grid=grid)
@@ -127,6 +141,7 @@ class Operator(Callable):
     _default_globals = []
 
     def __init__(self, expressions, **kwargs):
+        tic = time()
         expressions = as_tuple(expressions)
 
         # Input check
@@ -166,8 +181,14 @@ class Operator(Callable):
 
         # Group expressions based on their iteration space and data dependences,
         # and apply the Devito Symbolic Engine (DSE) for flop optimization
-        clusters = clusterize(expressions)
-        clusters = rewrite(clusters, mode=set_dse_mode(dse))
+        clusters = clusterize(expressions, self._state.setdefault('fusion', []))
+        with memoized_queries() as queries:
+            clusters = rewrite(clusters, mode=set_dse_mode(dse))
+        self._state['queries'] = queries
+        if queries:
+            debug("Memoized symbolic queries: %s" %
+                  ", ".join("%s [hits: %d, misses: %d]" % (k, v['hits'], v['misses'])
+                            for k, v in queries.items()))
         self._dtype, self._dspace = clusters.meta
 
         # Lower Clusters to a Schedule tree
@@ -175,8 +196,15 @@ class Operator(Callable):
 
         # Lower Schedule tree to an Iteration/Expression tree (IET)
         iet = iet_build(stree)
+        iet = self._cache_invariants(iet)
+        iet = self._pool_arrays(iet)
         iet, self._profiler = self._profile_sections(iet)
         iet = self._specialize_iet(iet, **kwargs)
+        self._time_sizes = self._record_time_sizes()
+        iet = self._profile_mpi(iet)
+        iet = self._profile_threads(iet)
+        iet = self._trace(iet)
+        iet = self._lower_storage(iet)
         iet = iet_insert_C_decls(iet)
         iet = self._build_casts(iet)
 
@@ -186,6 +214,10 @@ class Operator(Callable):
         # Finish instantiation
         super(Operator, self).__init__(self.name, iet, 'int', parameters, ())
 
+        # Record where time goes, across the whole session
+        self._perf = perf_registry.new(self.name, owner=self)
+        self._perf.add_build(time() - tic)
+
     # Compilation
 
     def _apply_substitutions(self, expressions, subs):
@@ -207,6 +239,80 @@ class Operator(Callable):
         """Transform ``expressions`` into a backend-specific representation."""
         return [LoweredEq(i) for i in expressions]
 
+    def _cache_invariants(self, iet):
+        """
+        Make the Arrays storing time invariants persist across ``apply`` calls.
+        These are the Arrays computed outside of any time loop from data that
+        the Operator never modifies. The Sections computing them are then only
+        executed if any such data has changed since the previous run.
+        """
+        self._invariants = None
+        if not configuration['cache-invariants'] or configuration['mpi']:
+            return iet
+
+        exprs = OrderedDict([(i, FindNodes(Expression).visit(i))
+                             for i in FindNodes(Section).visit(iet)])
+
+        candidates = []
+        for k, v in exprs.items():
+            if any(i.dim.is_Time for i in FindNodes(Iteration).visit(k)):
+                continue
+            writes = [e.write for e in v if not e.is_scalar_assign]
+            if writes and all(i.is_Array and i._mem_heap for i in writes):
+                candidates.append(k)
+
+        # Drop the candidates reading or writing data modified elsewhere
+        while True:
+            writes = {e.write for k, v in exprs.items() if k not in candidates
+                      for e in v}
+            processed = [k for k in candidates
+                         if not any(f in writes for e in exprs[k] for f in e.functions)]
+            if processed == candidates:
+                break
+            candidates = processed
+        if not candidates:
+            return iet
+
+        arrays = filter_ordered(e.write for k in candidates for e in exprs[k]
+                                if e.write.is_Array)
+        for i in arrays:
+            i.update(scope='external')
+        sources = [i for i in derive_parameters(candidates) if i not in arrays]
+
+        flag = Scalar(name='refresh_invariants', dtype=np.int32, is_const=True)
+        self._invariants = InvariantsCache(flag, arrays, sources)
+
+        return Transformer({i: Conditional(flag, i) for i in candidates}).visit(iet)
+
+    def _pool_arrays(self, iet):
+        """
+        Draw the memory of the heap-allocated Arrays from a pool of buffers
+        persisting across ``apply`` calls, rather than having the generated code
+        allocate and free it at each run. This removes the allocation and first-touch
+        overheads (e.g., page faults) from short, frequently-repeated runs.
+
+        Notes
+        -----
+        The Arrays that the DLE later moves to the stack (e.g., the block-sized
+        temporaries of loop blocking) are not pooled, as they are private to each
+        OpenMP thread. Their size is therefore still bounded by the stack limit,
+        which is only enforced by the autotuner (see the ``stack_limit`` option).
+        """
+        self._pooled = None
+        if not configuration['pool-arrays']:
+            return iet
+
+        arrays = filter_ordered(e.write for e in FindNodes(Expression).visit(iet)
+                                if e.write.is_Array and e.write._mem_heap)
+        if not arrays:
+            return iet
+
+        for i in arrays:
+            i.update(scope='pooled')
+        self._pooled = PooledArrays(arrays)
+
+        return iet
+
     def _profile_sections(self, iet):
         """Instrument the IET for C-level profiling."""
         profiler = create_profile('timers')
@@ -215,6 +321,52 @@ class Operator(Callable):
         self._func_table.update({i: MetaCall(None, False) for i in profiler._ext_calls})
         return iet, profiler
 
+    def _profile_mpi(self, iet):
+        """Instrument the IET for C-level profiling of the MPI routines."""
+        return self._profiler.instrument_mpi(iet)
+
+    def _profile_threads(self, iet):
+        """Instrument the IET for C-level profiling of the OpenMP threads."""
+        efuncs = OrderedDict([(k, v.root) for k, v in self._func_table.items()
+                              if v.local])
+        iet, efuncs = self._profiler.instrument_threads(iet, efuncs)
+        self._func_table.update([(k, MetaCall(v, True)) for k, v in efuncs.items()])
+        if self._profiler._parregions:
+            self._includes.append('omp.h')
+        return iet
+
+    def _trace(self, iet):
+        """
+        Instrument the IET so that each execution of the profiled sections and of
+        the MPI halo exchange routines is recorded as a trace event (see
+        ``configuration['trace']``).
+        """
+        self._tracer = None
+        if not configuration['trace']:
+            return iet
+
+        prefixes = ('haloupdate', 'halowait', 'remainder')
+        calls = [i for i in FindNodes(Call).visit(iet) if i.name.startswith(prefixes)]
+        regions = [('%s_%d' % (i.name, n), 'mpi') for n, i in enumerate(calls)]
+        regions.extend((i.name, 'section') for i in FindNodes(TimedList).visit(iet)
+                       if i.name in self._profiler.sections)
+        if not regions:
+            return iet
+        self._tracer = Tracer('tracer', *zip(*regions))
+
+        # The Calls to the MPI routines may be within the profiled sections, so
+        # they are wrapped first
+        mapper = {i: TracedList(self._tracer, regions[n][0], n, i)
+                  for n, i in enumerate(calls)}
+        iet = Transformer(mapper).visit(iet)
+        timedlists = [i for i in FindNodes(TimedList).visit(iet)
+                      if i.name in self._profiler.sections]
+        mapper = {i: TracedList(self._tracer, regions[n][0], n, i)
+                  for n, i in enumerate(timedlists, len(calls))}
+        iet = Transformer(mapper).visit(iet)
+
+        return iet
+
     def _specialize_iet(self, iet, **kwargs):
         """
         Transform the IET into a backend-specific representation, such as code
@@ -233,9 +385,37 @@ class Operator(Callable):
 
         return iet
 
+    def _record_time_sizes(self):
+        """
+        Map the buffered TimeFunctions to the position and size of the circular
+        buffer the generated code is specialized for. A TimeFunction whose data
+        is not allocated yet might still be shrunk by the DLE of a later Operator,
+        so its current size may not be relied upon at ``apply`` time.
+        """
+        return {f.name: (f._time_position, f._time_size) for f in self.input
+                if f.is_TimeFunction and f._time_buffering}
+
+    def _lower_storage(self, iet):
+        """
+        Convert loads from and stores to Functions with a compact storage
+        data type, so that arithmetic is carried out in single precision.
+        """
+        iet, definitions = iet_lower_storage(iet)
+        for k, v in list(self._func_table.items()):
+            if v.local:
+                root, efunc_definitions = iet_lower_storage(v.root)
+                self._func_table[k] = MetaCall(root, True)
+                definitions.extend(efunc_definitions)
+        self._globals.extend(i for i in definitions if i not in self._globals)
+        return iet
+
     def _build_casts(self, iet):
         """Introduce array casts."""
         casts = [ArrayCast(f) for f in self.input if f.is_Tensor and f._mem_external]
+        if self._invariants is not None:
+            casts.extend(ArrayCast(f) for f in self._invariants.arrays)
+        if self._pooled is not None:
+            casts.extend(ArrayCast(f) for f in self._pooled.arrays)
         return List(body=casts + [iet])
 
     def _build_parameters(self, iet):
@@ -297,6 +477,11 @@ class Operator(Callable):
         # Sanity check
         for p in self.input:
             p._arg_check(args, self._dspace[p])
+        for k, (tpos, size) in self._time_sizes.items():
+            if args[k].shape[tpos] != size:
+                raise InvalidArgument("Expected `time_size=%d` for runtime value `%s`,"
+                                      " found `%d` instead"
+                                      % (size, k, args[k].shape[tpos]))
 
         # Turn arguments into a format suitable for the generated code
         # E.g., instead of NumPy arrays for Functions, the generated code expects
@@ -308,14 +493,30 @@ class Operator(Callable):
                 # User-provided floats/ndarray obviously do not have `_arg_as_ctype`
                 args.update(p._arg_as_ctype(args, alias=p))
 
+        # Add in the persistent Arrays, and whether they must be recomputed
+        if self._invariants is not None:
+            args.update(self._invariants.arguments(args, **kwargs))
+
+        # Add in the pooled Arrays
+        if self._pooled is not None:
+            args.update(self._pooled.arguments(args))
+
         # Add in the profiler argument
         args[self._profiler.name] = self._profiler.timer.reset()
 
+        # Add in the tracer argument
+        if self._tracer is not None:
+            args[self._tracer.name] = self._tracer.reset()
+
         # Add in any backend-specific argument
         args.update(kwargs.pop('backend', {}))
 
         # Execute autotuning and adjust arguments accordingly
-        args = self._autotune(args, kwargs.pop('autotune', configuration['autotuning']))
+        tic = time()
+        with trace('autotuning'):
+            args = self._autotune(args, kwargs.pop('autotune',
+                                                   configuration['autotuning']))
+        self._perf.add_autotuning(time() - tic)
 
         # Check all user-provided keywords are known to the Operator
         if not configuration['ignore-unknowns']:
@@ -330,6 +531,22 @@ class Operator(Callable):
         for p in self.input:
             p._arg_apply(args[p.name], kwargs.get(p.name))
 
+        # The persistent Arrays are now up-to-date
+        if self._invariants is not None:
+            self._invariants.commit(args, **kwargs)
+
+        # The pooled Arrays are dead, so their buffers may be reused
+        if self._pooled is not None:
+            self._pooled.release()
+
+        # The data of the output Functions has been modified in C-land
+        for p in self.output:
+            try:
+                kwargs.get(p.name, p)._data._version.bump()
+            except AttributeError:
+                # E.g., a user-provided numpy.ndarray, or a Scalar
+                pass
+
     @cached_property
     def _known_arguments(self):
         """The arguments that can be passed to ``apply`` when running the Operator."""
@@ -364,7 +581,10 @@ class Operator(Callable):
         Operator, reagardless of how many times this method is invoked.
         """
         if self._lib is None:
-            jit_compile(self._soname, str(self.ccode), self._compiler)
+            tic = time()
+            recompiled = jit_compile(self._soname, str(self.ccode), self._compiler)
+            self._perf.add_compilation(self._soname, time() - tic, recompiled)
+            self._perf = perf_registry.resolve(self._perf)
 
     @property
     def cfunction(self):
@@ -446,12 +666,21 @@ class Operator(Callable):
         >>> summary = op.apply(time_M=10)
         """
         # Build the arguments list to invoke the kernel function
-        args = self.arguments(**kwargs)
+        tic = time()
+        autotuning = self._perf.autotuning
+        with trace('arguments'):
+            args = self.arguments(**kwargs)
+        arguments = time() - tic - (self._perf.autotuning - autotuning)
 
         # Invoke kernel function with args
         arg_values = [args[p.name] for p in self.parameters]
+        with trace('jit-compilation'):
+            cfunction = self.cfunction
+        memory = self._sample_memory()
+        tic = time()
         try:
-            self.cfunction(*arg_values)
+            with trace('run', operator=self.name):
+                cfunction(*arg_values)
         except ctypes.ArgumentError as e:
             if e.args[0].startswith("argument "):
                 argnum = int(e.args[0][9:].split(':')[0]) - 1
@@ -462,16 +691,92 @@ class Operator(Callable):
                 raise ctypes.ArgumentError(newmsg) from e
             else:
                 raise
+        run = time() - tic
+
+        # Record the events traced by the generated code
+        recorder = trace_recorder()
+        if recorder is not None and self._tracer is not None:
+            recorder.add_tracer(self._tracer)
+
+        with trace('postprocessing'):
+            # Post-process runtime arguments
+            self._postprocess_arguments(args, **kwargs)
+
+            # Output summary of performance achieved
+            summary = self._profile_output(args, memory)
+
+        self._perf.add_apply(arguments, run, summary.timings)
+
+        return summary
+
+    def predict(self, machine=None, **kwargs):
+        """
+        Predict, without running it, the performance of the Operator. The time
+        taken by each section is inferred from its FLOPs and compulsory traffic,
+        as given by the would-be runtime arguments, according to the roofline
+        model of a machine. As such, the predicted times are optimistic: they
+        are what a section would take if it attained the roofline.
+
+        Parameters
+        ----------
+        machine : MachineModel, optional
+            The machine the Operator would run on. Defaults to that given by
+            ``configuration['roofline']``, or to the characterisation of this
+            machine (see :func:`characterize`).
+        **kwargs
+            The arguments ``apply`` would be called with. Autotuning is ignored.
+
+        Returns
+        -------
+        Prediction
+            The predicted time of each section, along with the memory footprint.
+
+        Examples
+        --------
+        >>> from devito import Eq, Grid, TimeFunction, Operator
+        >>> from devito.machine import MachineModel
+        >>> grid = Grid(shape=(4, 4))
+        >>> u = TimeFunction(name='u', grid=grid, space_order=2)
+        >>> op = Operator(Eq(u.forward, u.laplace + 1))
+        >>> prediction = op.predict(machine=MachineModel(10., 100.), time_M=9)
+        >>> prediction['section0'].bound
+        'memory'
+        """
+        machine = machine or machine_model() or characterize()
 
-        # Post-process runtime arguments
-        self._postprocess_arguments(args, **kwargs)
+        kwargs['autotune'] = False
+        args = self.arguments(**kwargs)
+        # No run will take place
+        if self._pooled is not None:
+            self._pooled.release()
+
+        prediction = self._profiler.predict(args, machine)
+        prediction.memory = self._mem_footprint(args)
 
-        # Output summary of performance achieved
-        return self._profile_output(args)
+        return prediction
+
+    def _sample_memory(self):
+        """
+        The resident set size of the process and its peak so far, or None if
+        the performance messages, reporting them, are not logged.
+        """
+        if logger.isEnabledFor(PERF):
+            return memory_usage()
+        return None
 
-    def _profile_output(self, args):
-        """Produce a performance summary of the profiled sections."""
-        summary = self._profiler.summary(args, self._dtype)
+    def _profile_output(self, args, memory=None):
+        """
+        Produce a performance summary of the profiled sections and of the memory
+        used by the run. Given the resident set size and its peak before the run,
+        ``memory``, the change over the run is reported too.
+        """
+        summary = self._profiler.summary(args)
+        if memory is not None:
+            rss, peak = memory_usage()
+            summary.add_memory(self._mem_footprint(args), allocator_stats(),
+                               (memory[0], rss), (memory[1], peak))
+        else:
+            summary.add_memory(self._mem_footprint(args), allocator_stats())
         info("Operator `%s` run in %.2f s" % (self.name, sum(summary.timings.values())))
         for k, v in summary.items():
             itershapes = [",".join(str(i) for i in its) for its in v.itershapes]
@@ -482,35 +787,119 @@ class Operator(Callable):
             else:
                 name = None
             gpointss = ", %.2f GPts/s" % v.gpointss if v.gpointss else ''
+            if v.attainable:
+                gpointss += (", %.0f%% of the attainable %.2f GFlops/s" %
+                             (v.roofline, v.attainable))
             perf("* %s with OI=%.2f computed in %.3f s [%.2f GFlops/s%s]" %
                  (name, v.oi, v.time, v.gflopss, gpointss))
+        for k, v in summary.timelines.items():
+            perf("* %s sampled every %d execution(s): p50=%.3g s, p90=%.3g s, "
+                 "p99=%.3g s, max=%.3g s [%d samples]" %
+                 (k, v.period, v.p50, v.p90, v.p99, v.samples.max(), len(v.samples)))
+        for k, v in summary.threads.items():
+            perf("* %s on %d threads: busy min=%.3g s, avg=%.3g s, max=%.3g s, "
+                 "load imbalance=%.0f%% [%d parallel region(s)]" %
+                 (k, v.nthreads, v.busy.min(), v.busy.mean(), v.tmax, 100*v.imbalance,
+                  v.nregions) if v.nthreads else
+                 "* %s: no OpenMP threads were timed" % k)
+        for k, v in summary.counters.items():
+            metrics = [("IPC=%.2f" % v.ipc) if v.ipc is not None else None,
+                       ("LLC miss rate=%.1f%%" % (100*v.miss_rate)
+                        if v.miss_rate is not None else None),
+                       ("~%.2f GB/s" % v.bandwidth) if v.bandwidth is not None else None]
+            perf("* %s: %s [%s]" % (k, ", ".join(i for i in metrics if i) or '-',
+                                    ", ".join("%s=%.3g" % i for i in v.items())))
+        if summary.mpi is not None:
+            v = summary.mpi
+            overlap = '' if v.overlap is None else ", overlap=%.0f%%" % (100*v.overlap)
+            perf("* MPI: computation %.3f s [max/avg=%.2f], communication %.3f s "
+                 "[max/avg=%.2f], load imbalance=%.0f%%%s" %
+                 (v.compute.max(), v.compute_ratio, v.comm.max(), v.comm_ratio,
+                  100*v.imbalance, overlap))
+        if summary.memory is not None:
+            v = summary.memory
+            footprint = ", ".join("%s=%s" % (k, humanbytes(v.footprint[k]))
+                                  for k in ['external', 'persistent', 'pooled', 'heap',
+                                            'stack'] if v.footprint.get(k))
+            if v.rss is not None:
+                perf("* Memory: %s; RSS=%s (%+.1f MB), peak RSS=%s (%+.1f MB)" %
+                     (footprint or '-', humanbytes(v.rss), v.rss_delta/2**20,
+                      humanbytes(v.peak), v.peak_delta/2**20))
+            else:
+                perf("* Memory: %s" % (footprint or '-'))
+            allocators = ["%s=%s" % (k, humanbytes(i.nbytes))
+                          for k, i in v.allocators.items() if i.nbytes]
+            if array_pool.nbytes:
+                allocators.append("idle pool=%s" % humanbytes(array_pool.nbytes))
+            if allocators:
+                perf("* Allocated: %s" % ", ".join(allocators))
         return summary
 
+    def _mem_footprint(self, args):
+        """
+        The amount of data, in bytes, used by the Operator in each memory scope,
+        given the runtime arguments ``args``. A scope is omitted if its size
+        cannot be determined from ``args``.
+        """
+        ret = OrderedDict()
+        for k, (names, func) in self._mem_footprint_funcs.items():
+            try:
+                ret[k] = int(func(*[args[i] for i in names]))
+            except (KeyError, TypeError):
+                # E.g., a size only known to a backend
+                pass
+        return ret
+
+    @cached_property
+    def _mem_footprint_funcs(self):
+        """
+        The expressions in ``_mem_summary`` as Python functions, along with the
+        names of the arguments they take, so that no symbolic processing takes
+        place when the footprint is evaluated at each run.
+        """
+        ret = OrderedDict()
+        for k, v in self._mem_summary.items():
+            if isinstance(v, int):
+                ret[k] = ((), lambda v=v: v)
+            else:
+                symbols = sorted(v.free_symbols, key=lambda i: i.name)
+                ret[k] = (tuple(i.name for i in symbols),
+                          lambdify(symbols, evaluate(v), modules='math'))
+        return ret
+
     @cached_property
     def _mem_summary(self):
         """
         The amount of data, in bytes, used by the Operator. This is provided as
         symbolic expressions, one symbolic expression for each memory scope (external,
-        stack, heap).
+        persistent, pooled, stack, heap). The persistent memory is that of the Arrays
+        storing time invariants across runs (see ``configuration['cache-invariants']``),
+        while the pooled memory is that of the temporary Arrays drawn from a pool
+        of buffers reused across runs (see ``configuration['pool-arrays']``).
         """
         roots = [self] + [i.root for i in self._func_table.values()]
         functions = [i for i in derive_parameters(roots) if i.is_Function]
 
         summary = {}
 
-        external = [i.symbolic_shape for i in functions if i._mem_external]
-        external = sum(reduce(mul, i, 1) for i in external)*self._dtype().itemsize
+        nbytes = lambda i: reduce(mul, i.symbolic_shape, 1)*np.dtype(i.dtype).itemsize
+
+        external = sum(nbytes(i) for i in functions if i._mem_external and not i.is_Array)
         summary['external'] = external
 
-        heap = [i.symbolic_shape for i in functions if i._mem_heap]
-        heap = sum(reduce(mul, i, 1) for i in heap)*self._dtype().itemsize
+        persistent = sum(nbytes(i) for i in functions if i._mem_external and i.is_Array)
+        summary['persistent'] = persistent
+
+        pooled = sum(nbytes(i) for i in functions if i._mem_pooled)
+        summary['pooled'] = pooled
+
+        heap = sum(nbytes(i) for i in functions if i._mem_heap)
         summary['heap'] = heap
 
-        stack = [i.symbolic_shape for i in functions if i._mem_stack]
-        stack = sum(reduce(mul, i, 1) for i in stack)*self._dtype().itemsize
+        stack = sum(nbytes(i) for i in functions if i._mem_stack)
         summary['stack'] = stack
 
-        summary['total'] = external + heap + stack
+        summary['total'] = external + persistent + pooled + heap + stack
 
         return summary
 
@@ -520,8 +909,10 @@ class Operator(Callable):
     # Pickling support
 
     def __getstate__(self):
+        state = dict(self.__dict__)
+        # Lambdas can't be pickled, but are rebuilt on demand upon unpickling
+        state.pop('_mem_footprint_funcs', None)
         if self._lib:
-            state = dict(self.__dict__)
             state.pop('_soname')
             # The compiled shared-object will be pickled; upon unpickling, it
             # will be restored into a potentially different temporary directory,
@@ -538,15 +929,15 @@ class Operator(Callable):
             state['_args'] = None
             with open(self._lib._name, 'rb') as f:
                 state['binary'] = f.read()
-            return state
-        else:
-            return self.__dict__
+        return state
 
     def __setstate__(self, state):
         soname = state.pop('_soname', None)
         binary = state.pop('binary', None)
         for k, v in state.items():
             setattr(self, k, v)
+        # The unpickled Operator gets a record of its own in this session
+        self._perf = perf_registry.new(self.name, owner=self)
         # If the `sonames` don't match, there *might* be a hidden bug as the
         # unpickled Operator might be generating code that differs from that
         # generated by the pickled Operator. For example, a stupid bug that we
@@ -568,6 +959,224 @@ class Operator(Callable):
 # Misc helpers
 
 
+class InvariantsCache(object):
+
+    """
+    The Arrays storing the time invariants of an Operator across runs.
+
+    Parameters
+    ----------
+    flag : Scalar
+        The Operator parameter telling whether the Arrays must be recomputed.
+    arrays : list of Array
+        The persistent Arrays.
+    sources : list of objects
+        The Operator parameters the persistent Arrays are computed from.
+    """
+
+    def __init__(self, flag, arrays, sources):
+        self.flag = flag
+        self.arrays = arrays
+        self.sources = sources
+
+        self.buffers = OrderedDict()
+        self.key = None
+
+    def _key(self, args, **kwargs):
+        """
+        A key identifying the state of the sources. This is None if any of the
+        sources may have been modified without trace, so the key never matches.
+        """
+        key = []
+        for p in self.sources:
+            if p.is_DiscreteFunction:
+                try:
+                    version = kwargs.get(p.name, p)._data._version
+                except AttributeError:
+                    # E.g., a user-provided numpy.ndarray
+                    return None
+                key.append((version, version.value))
+            else:
+                key.append(args.get(p.name))
+        return tuple(key)
+
+    def arguments(self, args, **kwargs):
+        """
+        The persistent Arrays, (re)allocated if necessary, and the value of
+        ``self.flag``, which is 1 if the Arrays must be recomputed, 0 otherwise.
+        """
+        key = self._key(args, **kwargs)
+        refresh = key is None or key != self.key
+
+        ret = {}
+        for i in self.arrays:
+            shape = tuple(int(evaluate(j, **{k.name: args[k.name]
+                                             for k in j.free_symbols}))
+                          for j in i.symbolic_shape)
+            if i not in self.buffers or self.buffers[i].shape != shape:
+                self.buffers[i] = Data(shape, i.dtype, modulo=(False,)*len(shape),
+                                       allocator=default_allocator())
+                refresh = True
+            ret[i.name] = self.buffers[i].ctypes.data_as(i._C_ctype)
+        ret[self.flag.name] = int(refresh)
+
+        return ret
+
+    def commit(self, args, **kwargs):
+        """Mark the persistent Arrays as up-to-date."""
+        self.key = self._key(args, **kwargs)
+
+    def __getstate__(self):
+        # The buffers are not pickled, so the Arrays get recomputed upon unpickling
+        state = dict(self.__dict__)
+        state['buffers'] = OrderedDict()
+        state['key'] = None
+        return state
+
+
+class ArrayPool(object):
+
+    """
+    A pool of buffers, organized in size classes, from which Operators draw the
+    memory of their temporary Arrays. The content of a temporary Array is dead
+    once an Operator run is over, so its buffer is then returned to the pool,
+    and may be reused by any Operator.
+
+    Parameters
+    ----------
+    maxbytes : int, optional
+        The maximum amount of memory, in bytes, held by the idle buffers. Once
+        exceeded, the least recently released buffers are freed. Defaults to
+        a quarter of the physical memory.
+
+    Notes
+    -----
+    The buffers are allocated, but never written, from Python. Thus, with a
+    NUMA-aware allocator (see ``default_allocator``), each page is first touched
+    by the thread writing to it first in the generated code, that is on the NUMA
+    node it is later accessed from.
+    """
+
+    def __init__(self, maxbytes=None):
+        self.maxbytes = maxbytes or virtual_memory().total // 4
+
+        # The idle buffers, from the least to the most recently released
+        self._free = []
+        self._lock = Lock()
+
+    @classmethod
+    def size_class(cls, nbytes):
+        """
+        The size of the buffers storing ``nbytes`` bytes. This is ``nbytes`` rounded
+        up to a multiple of an eighth of the next power of two (and of a page), so
+        that at most a quarter of a buffer goes unused.
+        """
+        shift = max(int(nbytes).bit_length() - 3, 12)
+        return -(-int(nbytes) >> shift) << shift
+
+    @property
+    def nbytes(self):
+        """The amount of memory, in bytes, held by the idle buffers."""
+        with self._lock:
+            return sum(i.nbytes for i in self._free)
+
+    def acquire(self, nbytes):
+        """A buffer of at least ``nbytes`` bytes."""
+        size = self.size_class(nbytes)
+        with self._lock:
+            for n, i in enumerate(reversed(self._free)):
+                if i.nbytes == size:
+                    return self._free.pop(len(self._free) - n - 1)
+        # The size classes are multiples of a page, hence of a double
+        return Data((size // 8,), np.float64, modulo=(False,),
+                    allocator=default_allocator())
+
+    def release(self, buffers):
+        """
+        Return ``buffers`` to the pool, freeing the least recently released
+        buffers if the idle ones exceed ``maxbytes``.
+        """
+        with self._lock:
+            self._free.extend(buffers)
+            nbytes = sum(i.nbytes for i in self._free)
+            while nbytes > self.maxbytes:
+                nbytes -= self._free.pop(0).nbytes
+
+    def clear(self):
+        """Free the idle buffers."""
+        with self._lock:
+            self._free.clear()
+
+
+array_pool = ArrayPool()
+
+
+class PooledArrays(object):
+
+    """
+    The temporary Arrays of an Operator whose memory is drawn from ``array_pool``.
+
+    Parameters
+    ----------
+    arrays : list of Array
+        The pooled Arrays.
+
+    Notes
+    -----
+    The buffers are tracked per thread, so concurrent runs of the same Operator
+    from different threads never share them.
+    """
+
+    def __init__(self, arrays):
+        self._arrays = arrays
+
+        self._local = local()
+
+    @property
+    def arrays(self):
+        # The Arrays moved to the stack by the DLE are thread-private, and are
+        # therefore left to the generated code (see `Operator._pool_arrays`)
+        return [i for i in self._arrays if i._mem_pooled]
+
+    @property
+    def buffers(self):
+        """The buffers in use by the calling thread."""
+        try:
+            return self._local.buffers
+        except AttributeError:
+            self._local.buffers = []
+            return self._local.buffers
+
+    def arguments(self, args):
+        """The pooled Arrays, along with the buffers they are mapped to."""
+        # Buffers still in use by, e.g., a previous run that failed
+        self.release()
+
+        ret = {}
+        for i in self.arrays:
+            shape = [int(evaluate(j, **{k.name: args[k.name] for k in j.free_symbols}))
+                     for j in i.symbolic_shape]
+            buf = array_pool.acquire(reduce(mul, shape, 1)*np.dtype(i.dtype).itemsize)
+            self.buffers.append(buf)
+            ret[i.name] = buf.ctypes.data_as(i._C_ctype)
+
+        return ret
+
+    def release(self):
+        """Return the buffers of the calling thread to ``array_pool``."""
+        array_pool.release(self.buffers)
+        self._local.buffers = []
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_local')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = local()
+
+
 def set_dse_mode(mode):
     if not mode:
         return 'noop'
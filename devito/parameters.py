@@ -112,10 +112,18 @@ env_vars_mapper = {
     'DEVITO_ISA': 'isa',
     'DEVITO_PLATFORM': 'platform',
     'DEVITO_PROFILING': 'profiling',
+    'DEVITO_TIMELINE_PERIOD': 'timeline-period',
+    'DEVITO_TIMELINE_SIZE': 'timeline-size',
+    'DEVITO_TRACE': 'trace',
+    'DEVITO_TRACE_SIZE': 'trace-size',
+    'DEVITO_ROOFLINE': 'roofline',
+    'DEVITO_PERF_EVENTS': 'perf-events',
+    'DEVITO_PERF_REGISTRY': 'perf-registry',
     'DEVITO_BACKEND': 'backend',
     'DEVITO_CODEGEN': 'codegen',
     'DEVITO_DEVELOP': 'develop-mode',
     'DEVITO_DSE': 'dse',
+    'DEVITO_DSE_NPROCS': 'dse-nprocs',
     'DEVITO_DLE': 'dle',
     'DEVITO_DLE_OPTIONS': 'dle-options',
     'DEVITO_OPENMP': 'openmp',
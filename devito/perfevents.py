@@ -0,0 +1,185 @@
+"""
+Access the hardware (and software) performance counters through the Linux
+``perf_event_open`` system call.
+"""
+
+from collections import OrderedDict
+from ctypes import CDLL, Structure, byref, c_int, c_long, c_uint32, c_uint64, c_ulong
+import ctypes
+import errno
+import os
+import platform
+import sys
+
+import numpy as np
+
+from devito.logger import warning
+from devito.parameters import configuration
+
+__all__ = ['PerfEvents', 'perf_events']
+
+
+# The supported events, as `(type, config)` pairs, see `linux/perf_event.h`
+perf_events = OrderedDict([
+    ('cycles', (0, 0)),  # PERF_COUNT_HW_CPU_CYCLES
+    ('instructions', (0, 1)),  # PERF_COUNT_HW_INSTRUCTIONS
+    ('cache-references', (0, 2)),  # PERF_COUNT_HW_CACHE_REFERENCES
+    ('cache-misses', (0, 3)),  # PERF_COUNT_HW_CACHE_MISSES
+    ('task-clock', (1, 1)),  # PERF_COUNT_SW_TASK_CLOCK
+    ('page-faults', (1, 2)),  # PERF_COUNT_SW_PAGE_FAULTS
+])
+
+# The number of the `perf_event_open` system call
+_syscalls = {'x86_64': 298, 'aarch64': 241, 'ppc64le': 319}
+
+
+class _PerfEventAttr(Structure):
+
+    # The first version of `struct perf_event_attr`, which is all we need
+    _fields_ = [('type', c_uint32), ('size', c_uint32), ('config', c_uint64),
+                ('sample_period', c_uint64), ('sample_type', c_uint64),
+                ('read_format', c_uint64), ('flags', c_uint64),
+                ('wakeup_events', c_uint32), ('bp_type', c_uint32),
+                ('config1', c_uint64)]
+
+
+# Bits of `perf_event_attr.flags`: only count in user space
+_EXCLUDE_KERNEL = 1 << 5
+_EXCLUDE_HV = 1 << 6
+
+# Bits of `perf_event_attr.read_format`: along with the count, read the times the
+# counter was enabled and actually running, which differ once the counters are
+# multiplexed over the hardware ones
+_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+
+
+def _perf_event_open(event, tid):
+    """
+    Open a counter for ``event`` on the thread ``tid``, counting on any CPU.
+    Return a file descriptor, or a negative errno upon failure. Reading from the
+    file descriptor yields three 64-bit integers: the count, and the times the
+    counter was enabled and running.
+    """
+    if not sys.platform.startswith('linux'):
+        return -errno.ENOSYS
+    try:
+        libc = CDLL(None, use_errno=True)
+        number = _syscalls[platform.machine()]
+    except (OSError, KeyError):
+        return -errno.ENOSYS
+    attr = _PerfEventAttr()
+    attr.type, attr.config = perf_events[event]
+    attr.size = ctypes.sizeof(_PerfEventAttr)
+    attr.read_format = _FORMAT_TOTAL_TIME_ENABLED | _FORMAT_TOTAL_TIME_RUNNING
+    attr.flags = _EXCLUDE_KERNEL | _EXCLUDE_HV
+    fd = libc.syscall(c_long(number), byref(attr), c_int(tid), c_int(-1), c_int(-1),
+                      c_ulong(0))
+    return fd if fd >= 0 else -ctypes.get_errno()
+
+
+def _threads():
+    """The IDs of the threads of this process."""
+    try:
+        return sorted(int(i) for i in os.listdir('/proc/self/task'))
+    except OSError:
+        return []
+
+
+class PerfEvents(object):
+
+    """
+    A set of performance counters, one for each event and each thread of this
+    process, such as the OpenMP threads.
+
+    The counters of the threads spawned after ``open`` are not opened until
+    the next ``open``. The events that cannot be counted, for example because
+    the kernel forbids access to the performance counters (see
+    ``/proc/sys/kernel/perf_event_paranoid``) or because the hardware doesn't
+    provide them (e.g., in virtual machines), are dropped with a warning. When
+    there are more counters than hardware ones, the kernel multiplexes them, so
+    the counts must be scaled by the ratio of the times each counter was enabled
+    and running (see ``_perf_event_open``).
+
+    Parameters
+    ----------
+    events : list of str
+        The events to be counted, among those in ``perf_events``.
+    """
+
+    def __init__(self, events):
+        self.requested = tuple(events)
+        self.events = None
+        self._fds = OrderedDict()
+
+    def open(self):
+        """
+        Open the counters for the threads not having them yet, and return a
+        NumPy array with their file descriptors, thread by thread.
+        """
+        threads = _threads()
+
+        if self.events is None:
+            # Find out which events can be counted, on the calling thread
+            self.events = []
+            fds = []
+            unavailable = []
+            for i in self.requested:
+                fd = _perf_event_open(i, 0)
+                if fd >= 0:
+                    self.events.append(i)
+                    fds.append(fd)
+                else:
+                    unavailable.append('%s (%s)' % (i, os.strerror(-fd)))
+            if unavailable:
+                warning("Couldn't open the performance counters for %s" %
+                        ", ".join(unavailable))
+            self.events = tuple(self.events)
+            # We could have been given a thread different than the main one
+            for i in fds:
+                os.close(i)
+
+        # The counters of the terminated threads are of no use anymore
+        for tid in [i for i in self._fds if i not in threads]:
+            for i in self._fds.pop(tid):
+                os.close(i)
+
+        if self.events:
+            for tid in threads:
+                if tid in self._fds:
+                    continue
+                fds = [_perf_event_open(i, tid) for i in self.events]
+                if all(i >= 0 for i in fds):
+                    self._fds[tid] = fds
+                else:
+                    # E.g., the thread has just terminated
+                    for i in fds:
+                        if i >= 0:
+                            os.close(i)
+
+        return np.array([i for v in self._fds.values() for i in v], dtype=np.int32)
+
+    def close(self):
+        for fds in self._fds.values():
+            for i in fds:
+                os.close(i)
+        self._fds.clear()
+
+    def __del__(self):
+        self.close()
+
+
+def _perf_events_callback(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    value = tuple(value)
+    unknown = [i for i in value if i not in perf_events]
+    if unknown:
+        raise ValueError("Unknown performance events %s, expected any of %s" %
+                         (unknown, list(perf_events)))
+    return value
+
+
+# The events counted by the `perf` profiler
+configuration.add('perf-events', tuple(perf_events)[:4], callback=_perf_events_callback,
+                  impacts_jit=False)
@@ -1,22 +1,31 @@
 from collections import OrderedDict, namedtuple
-from ctypes import c_double
+from ctypes import POINTER, c_double, c_int
 from functools import reduce
 from operator import mul
 from pathlib import Path
 import os
+import resource
+import sys
 
 from cached_property import cached_property
+import cgen as c
+import numpy as np
+import psutil
 
-from devito.ir.iet import (Call, ExpressionBundle, List, TimedList, Section,
-                           FindNodes, Transformer)
+from devito.ir.iet import (Block, Call, ExpressionBundle, Iteration, List, TimedList,
+                           ThreadTimedList, Section, FindNodes, Transformer)
 from devito.ir.support import IntervalGroup
 from devito.logger import warning
+from devito.machine import machine_model
+from devito.mpi.distributed import MPICommObject
 from devito.parameters import configuration
+from devito.perfevents import PerfEvents
 from devito.symbolics import estimate_cost
 from devito.tools import flatten
 from devito.types import CompositeObject
 
-__all__ = ['Timer', 'create_profile']
+__all__ = ['Timer', 'TimelineTimer', 'PerfEventTimer', 'ThreadTimer', 'create_profile',
+           'memory_usage']
 
 
 class Profiler(object):
@@ -28,6 +37,8 @@ class Profiler(object):
     def __init__(self, name):
         self.name = name
         self._sections = OrderedDict()
+        self._mpiregions = OrderedDict()
+        self._parregions = OrderedDict()
 
         self.initialized = True
 
@@ -47,13 +58,14 @@ class Profiler(object):
             # Operation count at each section iteration
             sops = sum(estimate_cost(i.expr) for i in flatten(b.exprs for b in bundles))
 
-            # Total memory traffic
+            # Total memory traffic, in bytes
             mapper = {}
             for i in bundles:
                 for k, v in i.traffic.items():
                     mapper.setdefault(k, []).append(v)
-            traffic = [IntervalGroup.generate('merge', *i) for i in mapper.values()]
-            traffic = sum(i.size for i in traffic)
+            traffic = [IntervalGroup.generate('merge', *v).size*np.dtype(f.dtype).itemsize
+                       for (f, _), v in mapper.items()]
+            traffic = sum(traffic)
 
             # Each ExpressionBundle lives in its own iteration space
             itershapes = [i.shape for i in bundles]
@@ -74,7 +86,48 @@ class Profiler(object):
 
         return iet
 
-    def summary(self, arguments, dtype):
+    def instrument_mpi(self, iet):
+        """
+        Enrich the Iteration/Expression tree ``iet``, as already instrumented by
+        :meth:`instrument`, adding C-level timers around the calls to the MPI
+        routines, such that computation and communication can be told apart.
+        """
+        calls = [i for i in FindNodes(Call).visit(iet)
+                 if i.name.startswith(mpi_comm_routines + mpi_compute_routines)]
+        if not calls:
+            return iet
+
+        timedlists = FindNodes(TimedList).visit(iet)
+        nested = set(flatten(FindNodes(Call).visit(i) for i in timedlists))
+        for n, call in enumerate(calls):
+            kind = 'comm' if call.name.startswith(mpi_comm_routines) else 'compute'
+            comm = tuple(i for i in call.arguments if isinstance(i, MPICommObject))
+            region = MPIRegion(kind, call in nested, comm)
+            self._mpiregions['%s_%d' % (call.name, n)] = region
+
+        # The Timer must now also accommodate the MPI routines
+        self.__dict__.pop('timer', None)
+
+        # The calls to the MPI routines are within the TimedLists of the sections,
+        # so they are wrapped first
+        mapper = {i: TimedList(timer=self.timer, lname=lname, body=i)
+                  for i, lname in zip(calls, self._mpiregions)}
+        iet = Transformer(mapper).visit(iet)
+        mapper = {i: i._rebuild(timer=self.timer) for i in FindNodes(TimedList).visit(iet)
+                  if i.name in self.sections}
+        iet = Transformer(mapper).visit(iet)
+
+        return iet
+
+    def instrument_threads(self, iet, efuncs):
+        """
+        Enrich the Iteration/Expression tree ``iet``, as already instrumented by
+        :meth:`instrument`, and the Callables it calls, ``efuncs``, adding C-level
+        timers to the OpenMP parallel regions. Only some Profilers do so.
+        """
+        return iet, efuncs
+
+    def summary(self, arguments):
         """
         Return a :class:`PerformanceSummary` of the profiled sections. See
         summary under the class AdvancedProfiler below for further details.
@@ -88,17 +141,84 @@ class Profiler(object):
             # dummy values.
             summary.add(section.name, time, float(), float(), float(), int(), [])
 
+        self._summarize_mpi(summary, arguments)
+
         return summary
 
+    def _summarize_mpi(self, summary, arguments):
+        """
+        Gather the computation and communication times of all MPI ranks into
+        ``summary``. This is a collective operation over the communicator
+        of the halo exchanges.
+        """
+        comms = flatten(i.comm for i in self._mpiregions.values())
+        if not comms:
+            return
+
+        obj = arguments[self.name]._obj
+        times = {k: getattr(obj, k) for k in self._mpiregions}
+
+        # The time spent in the sections, except for the time spent in the
+        # communication routines called from within them, is computation
+        comm = sum(v for k, v in times.items() if self._mpiregions[k].kind == 'comm')
+        nested = sum(v for k, v in times.items()
+                     if self._mpiregions[k].kind == 'comm' and self._mpiregions[k].nested)
+        compute = max(sum(getattr(obj, i.name) for i in self._sections) - nested, 0.)
+
+        # With asynchronous halo exchanges, computation over the CORE region
+        # is performed while the messages are in flight
+        core = sum(v for k, v in times.items() if k.startswith('compute'))
+        wait = sum(v for k, v in times.items() if k.startswith('halowait'))
+        overlap = core/(core + wait) if core + wait > 0 else None
+
+        data = comms[0].comm.allgather((compute, comm, overlap))
+        summary.add_mpi(*zip(*data))
+
+    def predict(self, arguments, machine):
+        """
+        Return a :class:`Prediction` of the time each profiled section would take
+        to run, according to the roofline model of ``machine``.
+
+        Parameters
+        ----------
+        arguments : dict
+            A mapper from argument names to would-be run-time values.
+        machine : MachineModel
+            The machine the run would take place on.
+        """
+        prediction = Prediction(machine)
+        for section, data in self._sections.items():
+            ops = float(data.ops.subs(arguments))
+            traffic = float(data.traffic.subs(arguments))
+
+            # Skip the Sections that would not be executed
+            if ops == 0 and traffic == 0:
+                continue
+
+            # The section is bound by either its compulsory traffic or its FLOPs
+            compute = ops/(machine.gflopss*10**9)
+            memory = traffic/(machine.bandwidth*10**9)
+            oi = ops/traffic if traffic > 0 else float('inf')
+
+            prediction.add(section.name, max(compute, memory), ops, traffic, oi,
+                           'memory' if memory >= compute else 'compute')
+
+        return prediction
+
+    @property
+    def sections(self):
+        """The names of the profiled sections."""
+        return [i.name for i in self._sections]
+
     @cached_property
     def timer(self):
-        return Timer(self.name, [i.name for i in self._sections])
+        return Timer(self.name, self.sections + list(self._mpiregions))
 
 
 class AdvancedProfiler(Profiler):
 
     # Override basic summary so that arguments other than runtime are computed.
-    def summary(self, arguments, dtype):
+    def summary(self, arguments):
         """
         Return a :class:`PerformanceSummary` of the profiled sections.
 
@@ -107,11 +227,9 @@ class AdvancedProfiler(Profiler):
         arguments : dict
             A mapper from argument names to run-time values from which the Profiler
             infers iteration space and execution times of a run.
-        dtype : data-type, optional
-            The data type of the objects in the profiled sections. Used to compute
-            the operational intensity.
         """
         summary = PerformanceSummary()
+        machine = machine_model()
         for section, data in self._sections.items():
             # Time to run the section
             time = max(getattr(arguments[self.name]._obj, section.name), 10e-7)
@@ -123,7 +241,7 @@ class AdvancedProfiler(Profiler):
             points = data.points.subs(arguments)
 
             # Compulsory traffic
-            traffic = float(data.traffic.subs(arguments)*dtype().itemsize)
+            traffic = float(data.traffic.subs(arguments))
 
             # Runtime itershapes
             itershapes = [tuple(i.subs(arguments) for i in j) for j in data.itershapes]
@@ -140,11 +258,189 @@ class AdvancedProfiler(Profiler):
             gpointss = gpoints/time
             oi = float(ops/traffic)
 
+            # Attainable performance, according to the roofline model
+            if machine is not None:
+                attainable = min(machine.gflopss, oi*machine.bandwidth)
+                roofline = 100*gflopss/attainable
+            else:
+                attainable = roofline = None
+
             # Keep track of performance achieved
-            summary.add(section.name, time, gflopss, gpointss, oi, data.sops, itershapes)
+            summary.add(section.name, time, gflopss, gpointss, oi, data.sops, itershapes,
+                        attainable, roofline)
+
+        self._summarize_mpi(summary, arguments)
+
+        return summary
+
+
+class TimelineProfiler(AdvancedProfiler):
+
+    """
+    Like :class:`AdvancedProfiler`, but also record the duration of each
+    execution of the profiled sections, such as the duration of each time step
+    of a section within the time loop.
+
+    The durations are accumulated, ``configuration['timeline-period']``
+    executions at a time, into a ring buffer of ``configuration['timeline-size']``
+    entries per section, so memory usage is bounded regardless of the length of
+    the run; only the most recent entries are retained.
+    """
+
+    def summary(self, arguments):
+        summary = super(TimelineProfiler, self).summary(arguments)
+
+        obj = arguments[self.name]._obj
+        for section in self._sections:
+            count = getattr(obj, '%s_count' % section.name)
+            if count == 0:
+                continue
+            samples = self.timer.samples(section.name, count)
+            summary.add_timeline(section.name, samples, obj.period,
+                                 -(-count // obj.period))
+
+        return summary
+
+    @cached_property
+    def timer(self):
+        return TimelineTimer(self.name, self.sections + list(self._mpiregions))
+
+
+class PerfEventProfiler(AdvancedProfiler):
+
+    """
+    Like :class:`AdvancedProfiler`, but also measure, through the Linux
+    ``perf_event_open`` interface, the hardware events (e.g., cycles,
+    instructions, cache misses, see ``configuration['perf-events']``) occurring
+    within the profiled sections, on all threads.
+
+    Notes
+    -----
+    Each execution of a profiled section issues one ``read`` system call per
+    thread and per event, both at its beginning and at its end. This overhead is
+    negligible for sections running for milliseconds, but may well dominate in
+    short sections executed at each timestep, such as halo exchanges.
+    """
+
+    _default_includes = ['unistd.h']
+
+    def summary(self, arguments):
+        summary = super(PerfEventProfiler, self).summary(arguments)
+
+        if self.timer.events:
+            for section in self._sections:
+                if section.name not in summary:
+                    # Unexecuted section
+                    continue
+                summary.add_counters(section.name, self.timer.counters(section.name),
+                                     summary[section.name].time)
+
+        return summary
+
+    @cached_property
+    def timer(self):
+        return PerfEventTimer(self.name, self.sections + list(self._mpiregions))
+
+
+class ThreadProfiler(AdvancedProfiler):
+
+    """
+    Like :class:`AdvancedProfiler`, but also measure the time each OpenMP thread
+    spends working within the parallel regions of the profiled sections, so
+    that the load imbalance across threads (e.g., due to remainder blocks) can
+    be told apart. To this end, the threads of a parallel region no longer wait
+    for each other at the end of the parallel loop (``nowait``), but only at the
+    end of the region.
+    """
+
+    def instrument_threads(self, iet, efuncs):
+        if not configuration['openmp']:
+            # The OpenMP pragmas, if any, are ignored by the compiler
+            return iet, efuncs
+
+        # The parallel regions within each section, including those within the
+        # Callables the section calls, directly or indirectly
+        owners = OrderedDict()
+        for section in FindNodes(TimedList).visit(iet):
+            if section.name not in self.sections:
+                continue
+            callees = []
+            queue = [section]
+            while queue:
+                for i in FindNodes(Call).visit(queue.pop(0)):
+                    if i.name in efuncs and i.name not in callees:
+                        callees.append(i.name)
+                        queue.append(efuncs[i.name])
+            regions = [j for i in [section] + [efuncs[k] for k in callees]
+                       for j in FindNodes(Block).visit(i) if is_parregion(j)]
+            for i in regions:
+                owners.setdefault(i, section.name)
+            if regions:
+                self._parregions[section.name] = len(regions)
+        if not owners:
+            return iet, efuncs
+
+        # The Timer must now also accommodate the per-thread times
+        self.__dict__.pop('timer', None)
+
+        # The Callables with parallel regions, and those calling them, must now
+        # also take the Timer as input
+        needy = {k for k, v in efuncs.items() if any(i in owners for i in
+                                                     FindNodes(Block).visit(v))}
+        while True:
+            callers = {k for k, v in efuncs.items()
+                       if any(i.name in needy for i in FindNodes(Call).visit(v))}
+            if callers <= needy:
+                break
+            needy |= callers
+
+        def instrument(node):
+            mapper = {}
+            for i in FindNodes(Block).visit(node):
+                if i not in owners:
+                    continue
+                nowait = {j: j._rebuild(pragmas=[c.Pragma('%s nowait' % k.value)
+                                                 if k.value.startswith('omp for')
+                                                 else k for k in j.pragmas])
+                          for j in FindNodes(Iteration).visit(i)}
+                handle = Transformer(nowait).visit(i)
+                mapper[i] = handle._rebuild(body=ThreadTimedList(self.timer, owners[i],
+                                                                 handle.body))
+            for i in FindNodes(Call).visit(node):
+                if i.name in needy:
+                    mapper[i] = i._rebuild(arguments=i.arguments + (self.timer,))
+            return Transformer(mapper).visit(node)
+
+        processed = OrderedDict()
+        for k, v in efuncs.items():
+            v = instrument(v)
+            if k in needy:
+                v = v._rebuild(parameters=v.parameters + (self.timer,))
+            processed[k] = v
+
+        iet = instrument(iet)
+        mapper = {i: i._rebuild(timer=self.timer)
+                  for i in FindNodes(TimedList).visit(iet)}
+        iet = Transformer(mapper).visit(iet)
+
+        return iet, processed
+
+    def summary(self, arguments):
+        summary = super(ThreadProfiler, self).summary(arguments)
+
+        for k, v in self._parregions.items():
+            if k not in summary:
+                # Unexecuted section
+                continue
+            summary.add_threads(k, self.timer.busy(k), v)
 
         return summary
 
+    @cached_property
+    def timer(self):
+        return ThreadTimer(self.name, self.sections + list(self._mpiregions),
+                           list(self._parregions))
+
 
 class AdvisorProfiler(AdvancedProfiler):
 
@@ -184,9 +480,15 @@ class AdvisorProfiler(AdvancedProfiler):
 
         return iet
 
+    def instrument_mpi(self, iet):
+        return iet
+
 
 class Timer(CompositeObject):
 
+    sampled = False
+    counted = False
+
     def __init__(self, name, sections):
         super(Timer, self).__init__(name, 'profiler', [(i, c_double) for i in sections])
 
@@ -203,14 +505,468 @@ class Timer(CompositeObject):
     _pickle_args = ['name', 'sections']
 
 
+class TimelineTimer(Timer):
+
+    """
+    A Timer also recording, for each section, the durations of its executions
+    into a ring buffer. Each buffer entry accumulates the durations of ``period``
+    consecutive executions; the buffers have ``size`` entries.
+    """
+
+    sampled = True
+
+    def __init__(self, name, sections):
+        pfields = [(i, c_double) for i in sections]
+        pfields += [('%s_samples' % i, POINTER(c_double)) for i in sections]
+        pfields += [('%s_count' % i, c_int) for i in sections]
+        pfields += [('period', c_int), ('size', c_int)]
+        super(Timer, self).__init__(name, 'profiler_timeline', pfields)
+        self._buffers = {}
+
+    def reset(self):
+        period = configuration['timeline-period']
+        size = configuration['timeline-size']
+        obj = self.value._obj
+        for i in self.sections:
+            setattr(obj, i, 0.0)
+            setattr(obj, '%s_count' % i, 0)
+            # The buffers are allocated once, and reused across runs
+            if len(self._buffers.get(i, ())) != size:
+                self._buffers[i] = np.zeros(size, dtype=np.float64)
+            setattr(obj, '%s_samples' % i,
+                    self._buffers[i].ctypes.data_as(POINTER(c_double)))
+        obj.period = period
+        obj.size = size
+        return self.value
+
+    def samples(self, section, count):
+        """
+        The entries of the ring buffer of ``section``, in chronological order,
+        after ``count`` executions of ``section``.
+        """
+        buf = self._buffers[section]
+        obj = self.value._obj
+        nsamples = -(-count // obj.period)
+        if nsamples <= obj.size:
+            return buf[:nsamples].copy()
+        start = nsamples % obj.size
+        return np.concatenate([buf[start:], buf[:start]])
+
+    @property
+    def sections(self):
+        return [i for i, j in self.pfields if j is c_double]
+
+
+class PerfEventTimer(Timer):
+
+    """
+    A Timer also reading, at the beginning and at the end of each section, the
+    performance counters of all threads (see :class:`PerfEvents`), and
+    accumulating the differences, event by event, into a buffer.
+    """
+
+    counted = True
+
+    def __init__(self, name, sections):
+        pfields = [(i, c_double) for i in sections]
+        pfields += [('%s_counters' % i, POINTER(c_double)) for i in sections]
+        pfields += [('fds', POINTER(c_int)), ('nfds', c_int), ('nevents', c_int)]
+        super(Timer, self).__init__(name, 'profiler_perf', pfields)
+        self._perf_events = None
+        self._buffers = {}
+        self._fds = None
+
+    def reset(self):
+        requested = configuration['perf-events']
+        if self._perf_events is None or self._perf_events.requested != requested:
+            if self._perf_events is not None:
+                self._perf_events.close()
+            self._perf_events = PerfEvents(requested)
+        # Counters are opened for any new thread
+        self._fds = self._perf_events.open()
+
+        nevents = len(self.events)
+        obj = self.value._obj
+        for i in self.sections:
+            setattr(obj, i, 0.0)
+            # The buffers are allocated once, and reused across runs
+            if len(self._buffers.get(i, ())) != max(nevents, 1):
+                self._buffers[i] = np.zeros(max(nevents, 1), dtype=np.float64)
+            self._buffers[i][:] = 0.
+            setattr(obj, '%s_counters' % i,
+                    self._buffers[i].ctypes.data_as(POINTER(c_double)))
+        obj.fds = self._fds.ctypes.data_as(POINTER(c_int))
+        obj.nfds = len(self._fds)
+        obj.nevents = nevents
+        return self.value
+
+    @property
+    def events(self):
+        """The events actually counted."""
+        if self._perf_events is None or self._perf_events.events is None:
+            return ()
+        return self._perf_events.events
+
+    def counters(self, section):
+        """The counts of ``section``, summed over all threads, event by event."""
+        return OrderedDict((k, float(v)) for k, v in zip(self.events,
+                                                         self._buffers[section]))
+
+    @property
+    def sections(self):
+        return [i for i, j in self.pfields if j is c_double]
+
+
+class ThreadTimer(Timer):
+
+    """
+    A Timer also accumulating, for each section with OpenMP parallel regions,
+    the time each thread spends working within them (see :class:`ThreadTimedList`).
+    Up to ``max(256, #logical cores)`` threads are timed, which accommodates
+    oversubscription too.
+    """
+
+    def __init__(self, name, sections, parallel=()):
+        pfields = [(i, c_double) for i in sections]
+        pfields += [('%s_threads' % i, POINTER(c_double)) for i in parallel]
+        pfields += [('maxthreads', c_int), ('nthreads', c_int)]
+        super(Timer, self).__init__(name, 'profiler_threads', pfields)
+        self.parallel = tuple(parallel)
+        self._buffers = {}
+
+    def reset(self):
+        maxthreads = max(psutil.cpu_count() or 1, 256)
+        obj = self.value._obj
+        for i in self.sections:
+            setattr(obj, i, 0.0)
+        for i in self.parallel:
+            # The buffers are allocated once, and reused across runs
+            if len(self._buffers.get(i, ())) != maxthreads:
+                self._buffers[i] = np.zeros(maxthreads, dtype=np.float64)
+            self._buffers[i][:] = 0.
+            setattr(obj, '%s_threads' % i,
+                    self._buffers[i].ctypes.data_as(POINTER(c_double)))
+        obj.maxthreads = maxthreads
+        obj.nthreads = 0
+        return self.value
+
+    def busy(self, section):
+        """The time, in seconds, each thread spent working in ``section``."""
+        obj = self.value._obj
+        return self._buffers[section][:min(obj.nthreads, obj.maxthreads)].copy()
+
+    @property
+    def sections(self):
+        return [i for i, j in self.pfields if j is c_double]
+
+    # Pickling support
+    _pickle_args = ['name', 'sections', 'parallel']
+
+
+class Counters(OrderedDict):
+
+    """
+    The counts of the hardware events occurred within a profiled section, as
+    measured by a :class:`PerfEventProfiler`, plus the derived metrics.
+
+    Parameters
+    ----------
+    counts : dict
+        A mapper from event names (e.g., ``cycles``) to counts.
+    time : float
+        The time, in seconds, spent in the section.
+    """
+
+    # The size, in bytes, of a cache line
+    _line_size = 64
+
+    def __init__(self, counts, time):
+        super(Counters, self).__init__(counts)
+        self.time = time
+
+    @property
+    def ipc(self):
+        """The instructions per cycle, or None if unavailable."""
+        if self.get('cycles'):
+            return self.get('instructions', 0)/self['cycles'] or None
+
+    @property
+    def miss_rate(self):
+        """The fraction of last level cache references missing, or None."""
+        if self.get('cache-references') and 'cache-misses' in self:
+            return self['cache-misses']/self['cache-references']
+
+    @property
+    def bandwidth(self):
+        """
+        The achieved memory bandwidth, in GB/s, or None if unavailable. This is
+        an estimate, as each last level cache miss is assumed to move a cache
+        line from memory.
+        """
+        if 'cache-misses' in self and self.time > 0:
+            return self['cache-misses']*self._line_size/self.time/10**9
+
+
+class Timeline(object):
+
+    """
+    The durations of the executions of a profiled section, e.g. one per time
+    step, retained by a :class:`TimelineProfiler`.
+
+    Parameters
+    ----------
+    samples : numpy.ndarray
+        The durations, in seconds, in chronological order. Each sample accounts
+        for ``period`` consecutive executions of the section (the last sample
+        may account for fewer executions).
+    period : int
+        The number of executions per sample.
+    nsamples : int
+        The total number of samples recorded. This is greater than
+        ``len(samples)`` if the oldest samples were overwritten.
+    """
+
+    def __init__(self, samples, period, nsamples):
+        self.samples = samples
+        self.period = period
+        self.nsamples = nsamples
+
+    def __repr__(self):
+        return ("Timeline<%d samples, p50=%.3g s, p99=%.3g s>" %
+                (len(self.samples), self.p50, self.p99))
+
+    @property
+    def dropped(self):
+        """The number of overwritten samples."""
+        return self.nsamples - len(self.samples)
+
+    def percentile(self, q):
+        """The ``q``-th percentile of the samples, with ``0 <= q <= 100``."""
+        return float(np.percentile(self.samples, q))
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p90(self):
+        return self.percentile(90)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    @property
+    def histogram(self):
+        """A histogram of the samples, as returned by ``numpy.histogram``."""
+        return np.histogram(self.samples, bins='auto')
+
+
+class MPISummary(object):
+
+    """
+    The computation and communication times of an MPI Operator on each rank,
+    as gathered by a :class:`Profiler`.
+
+    Parameters
+    ----------
+    compute : tuple of float
+        The time, in seconds, spent by each rank in the profiled sections,
+        except for the time spent in communication routines.
+    comm : tuple of float
+        The time, in seconds, spent by each rank in communication routines,
+        that is sending, receiving and waiting for halo data, as well as
+        MPI reductions.
+    overlap : tuple of float
+        For each rank, the fraction of the halo exchanges performed while
+        computing over the CORE region, that is the CORE computation time over
+        the CORE computation time plus the time spent waiting for the halo
+        data to arrive. This is None unless the halo exchanges are asynchronous
+        (e.g., ``configuration['mpi'] = 'overlap'``).
+    """
+
+    def __init__(self, compute, comm, overlap):
+        self.compute = np.array(compute)
+        self.comm = np.array(comm)
+        self._overlap = overlap
+
+    def __repr__(self):
+        return ("MPISummary<%d ranks, compute=%.3g s, comm=%.3g s, imbalance=%.2f>" %
+                (self.nranks, self.compute.max(), self.comm.max(), self.imbalance))
+
+    @property
+    def nranks(self):
+        return len(self.compute)
+
+    @property
+    def compute_ratio(self):
+        """The max/avg ratio of the computation times across ranks."""
+        return _ratio(self.compute)
+
+    @property
+    def comm_ratio(self):
+        """The max/avg ratio of the communication times across ranks."""
+        return _ratio(self.comm)
+
+    @property
+    def imbalance(self):
+        """
+        The load imbalance, that is the fraction of the computation time of the
+        slowest rank that the other ranks, on average, spend idle.
+        """
+        tmax = self.compute.max()
+        return float(1 - self.compute.mean()/tmax) if tmax > 0 else 0.
+
+    @property
+    def overlap(self):
+        """The average overlap of computation and communication across ranks."""
+        if any(i is None for i in self._overlap):
+            return None
+        return float(np.mean(self._overlap))
+
+
+class ThreadSummary(object):
+
+    """
+    The time each OpenMP thread spent working within the parallel regions of
+    a profiled section, as measured by a :class:`ThreadProfiler`.
+
+    Parameters
+    ----------
+    busy : numpy.ndarray
+        The time, in seconds, spent working by each thread.
+    nregions : int
+        The number of parallel regions within the section.
+    """
+
+    def __init__(self, busy, nregions):
+        self.busy = np.array(busy)
+        self.nregions = nregions
+
+    def __repr__(self):
+        return ("ThreadSummary<%d threads, busy=%.3g s, imbalance=%.2f>" %
+                (self.nthreads, self.tmax, self.imbalance))
+
+    @property
+    def nthreads(self):
+        return len(self.busy)
+
+    @property
+    def tmax(self):
+        """The busy time of the slowest thread."""
+        return float(self.busy.max()) if self.nthreads else 0.
+
+    @property
+    def ratio(self):
+        """The max/avg ratio of the busy times across threads."""
+        return _ratio(self.busy) if self.nthreads else 1.
+
+    @property
+    def imbalance(self):
+        """
+        The load imbalance, that is the fraction of the busy time of the slowest
+        thread that the other threads, on average, spend idle.
+        """
+        return float(1 - self.busy.mean()/self.tmax) if self.tmax > 0 else 0.
+
+
+def _ratio(times):
+    avg = times.mean()
+    return float(times.max()/avg) if avg > 0 else 1.
+
+
+class MemorySummary(object):
+
+    """
+    The memory used by an Operator run.
+
+    Parameters
+    ----------
+    footprint : dict
+        The amount of data, in bytes, used by the Operator in each memory scope
+        (external, persistent, pooled, heap, stack), given the runtime arguments.
+    rss : 2-tuple of int, optional
+        The resident set size of the process, in bytes, before and after the run.
+        As sampling it has a cost, it is only provided when performance messages
+        are logged (see ``configuration['log-level']``).
+    peak : 2-tuple of int, optional
+        The peak resident set size of the process so far, in bytes, before and
+        after the run.
+    allocators : dict
+        The memory, in bytes, allocated through each MemoryAllocator after the
+        run (see :func:`allocator_stats`).
+    """
+
+    def __init__(self, footprint, allocators, rss=None, peak=None):
+        self.footprint = footprint
+        self.allocators = allocators
+        self.rss = self.rss_delta = self.peak = self.peak_delta = None
+        if rss is not None:
+            self.rss = rss[1]
+            self.rss_delta = rss[1] - rss[0]
+        if peak is not None:
+            self.peak = peak[1]
+            self.peak_delta = peak[1] - peak[0]
+
+    def __repr__(self):
+        return ("MemorySummary<footprint=%d B, rss=%s B, peak=%s B>" %
+                (self.footprint.get('total', 0), self.rss, self.peak))
+
+
+_process = None
+"""The psutil handle of this process, reused across calls to ``memory_usage``."""
+
+
+def memory_usage():
+    """
+    The resident set size of this process and its peak so far, both in bytes.
+    """
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        # E.g., in a forked process
+        _process = psutil.Process()
+    rss = _process.memory_info().rss
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        # In kilobytes
+        peak *= 1024
+    # The peak is only updated by the kernel every now and then
+    return rss, max(rss, peak)
+
+
 class PerformanceSummary(OrderedDict):
 
     """
     A special dictionary to track and quickly access performance data.
     """
 
-    def add(self, key, time, gflopss, gpointss, oi, ops, itershapes):
-        self[key] = PerfEntry(time, gflopss, gpointss, oi, ops, itershapes)
+    def __init__(self, *args, **kwargs):
+        super(PerformanceSummary, self).__init__(*args, **kwargs)
+        self.timelines = OrderedDict()
+        self.counters = OrderedDict()
+        self.threads = OrderedDict()
+        self.memory = None
+        self.mpi = None
+
+    def add(self, key, time, gflopss, gpointss, oi, ops, itershapes, attainable=None,
+            roofline=None):
+        self[key] = PerfEntry(time, gflopss, gpointss, oi, ops, itershapes, attainable,
+                              roofline)
+
+    def add_timeline(self, key, samples, period, nsamples):
+        self.timelines[key] = Timeline(samples, period, nsamples)
+
+    def add_counters(self, key, counts, time):
+        self.counters[key] = Counters(counts, time)
+
+    def add_threads(self, key, busy, nregions):
+        self.threads[key] = ThreadSummary(busy, nregions)
+
+    def add_memory(self, footprint, allocators, rss=None, peak=None):
+        self.memory = MemorySummary(footprint, allocators, rss, peak)
+
+    def add_mpi(self, compute, comm, overlap):
+        self.mpi = MPISummary(compute, comm, overlap)
 
     @property
     def gflopss(self):
@@ -229,8 +985,74 @@ SectionData = namedtuple('SectionData', 'ops sops points traffic itershapes')
 """Metadata for a profiled code section."""
 
 
-PerfEntry = namedtuple('PerfEntry', 'time gflopss gpointss oi ops itershapes')
-"""Runtime profiling data for a :class:`Section`."""
+MPIRegion = namedtuple('MPIRegion', 'kind nested comm')
+"""
+Metadata for a profiled call to an MPI routine: whether it performs computation
+or communication, whether it is nested within a profiled code section, and the
+communicator it uses, if any.
+"""
+
+# The MPI routines, by name prefix (see :class:`HaloExchangeBuilder`)
+mpi_comm_routines = ('haloupdate', 'halowait', 'allreduce')
+mpi_compute_routines = ('compute', 'remainder')
+
+
+PerfEntry = namedtuple('PerfEntry', 'time gflopss gpointss oi ops itershapes '
+                                    'attainable roofline')
+"""
+Runtime profiling data for a :class:`Section`. With ``configuration['roofline']``
+set, ``attainable`` is the attainable performance, in GFlops/s, according to the
+roofline model, and ``roofline`` is the percentage of it that was achieved.
+"""
+
+
+PredictedEntry = namedtuple('PredictedEntry', 'time ops traffic oi bound')
+"""
+Predicted profiling data for a :class:`Section`: the time, in seconds, the
+number of FLOPs, the compulsory traffic, in bytes, the operational intensity,
+and whether the section is ``memory``- or ``compute``-bound.
+"""
+
+
+class Prediction(OrderedDict):
+
+    """
+    The predicted performance of an Operator run, section by section, on the
+    machine described by the :class:`MachineModel` ``machine``. The ``memory``
+    footprint is the amount of data, in bytes, in each memory scope.
+    """
+
+    def __init__(self, machine, *args, **kwargs):
+        super(Prediction, self).__init__(*args, **kwargs)
+        self.machine = machine
+        self.memory = OrderedDict()
+
+    def add(self, key, time, ops, traffic, oi, bound):
+        self[key] = PredictedEntry(time, ops, traffic, oi, bound)
+
+    @property
+    def time(self):
+        """The predicted runtime, in seconds."""
+        return sum(v.time for v in self.values())
+
+    @property
+    def timings(self):
+        return OrderedDict([(k, v.time) for k, v in self.items()])
+
+    def error(self, summary):
+        """
+        The relative error of the predicted section times with respect to those
+        measured in an actual run, given its :class:`PerformanceSummary`.
+        """
+        return OrderedDict([(k, (v.time - summary[k].time)/summary[k].time)
+                            for k, v in self.items() if k in summary])
+
+
+def is_parregion(node):
+    """True if ``node`` is an OpenMP parallel region, False otherwise."""
+    return node.is_Block and any(isinstance(i, c.Pragma) and
+                                 i.value.startswith('omp parallel')
+                                 for i in node.header)
 
 
 def create_profile(name):
@@ -255,10 +1077,20 @@ def create_profile(name):
 profiler_registry = {
     'basic': Profiler,
     'advanced': AdvancedProfiler,
+    'timeline': TimelineProfiler,
+    'perf': PerfEventProfiler,
+    'threads': ThreadProfiler,
     'advisor': AdvisorProfiler
 }
 configuration.add('profiling', 'basic', list(profiler_registry), impacts_jit=False)
 
+# With the `timeline` profiler, the number of section executions (e.g., time
+# steps) accumulated into each sample, and the number of samples retained
+configuration.add('timeline-period', 1, callback=lambda i: max(int(i), 1),
+                  impacts_jit=False)
+configuration.add('timeline-size', 4096, callback=lambda i: max(int(i), 1),
+                  impacts_jit=False)
+
 
 def locate_intel_advisor():
     try:
@@ -0,0 +1,251 @@
+"""
+A session-wide registry of where the time goes, Operator by Operator: building,
+JIT-compiling, autotuning, preparing the arguments, and running them.
+"""
+
+from collections import OrderedDict
+import atexit
+import csv
+import json
+import os
+import weakref
+
+from devito.logger import info
+from devito.mpi import MPI
+from devito.parameters import configuration
+
+__all__ = ['OperatorRecord', 'PerformanceRegistry', 'perf_registry']
+
+
+class OperatorRecord(object):
+
+    """
+    The time spent, in seconds, in the various stages of the life of one or
+    more Operators generating the same code, that is sharing the same ``soname``.
+
+    Parameters
+    ----------
+    name : str
+        The name of the Operator.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.soname = None
+        self.nbuilds = 0
+        self.build = 0.
+        self.ncompilations = 0
+        self.ncache_hits = 0
+        self.compilation = 0.
+        self.autotuning = 0.
+        self.napplies = 0
+        self.arguments = 0.
+        self.run = 0.
+        self.sections = OrderedDict()
+
+    def __repr__(self):
+        return "OperatorRecord<%s, %d applies>" % (self.soname or self.name,
+                                                   self.napplies)
+
+    def add_build(self, elapsed):
+        self.nbuilds += 1
+        self.build += elapsed
+
+    def add_compilation(self, soname, elapsed, recompiled):
+        self.soname = soname
+        if recompiled:
+            self.ncompilations += 1
+        else:
+            self.ncache_hits += 1
+        self.compilation += elapsed
+
+    def add_autotuning(self, elapsed):
+        self.autotuning += elapsed
+
+    def add_apply(self, arguments, run, timings):
+        """
+        Account for an ``apply``, that took ``arguments`` seconds to prepare
+        the arguments (autotuning excluded) and ``run`` seconds to run the
+        compiled code, of which ``timings`` seconds in each section.
+        """
+        self.napplies += 1
+        self.arguments += arguments
+        self.run += run
+        for k, v in timings.items():
+            self.sections[k] = self.sections.get(k, 0.) + v
+
+    def merge(self, other):
+        """Accumulate the times of ``other`` into ``self``."""
+        self.soname = self.soname or other.soname
+        for i in ['nbuilds', 'build', 'ncompilations', 'ncache_hits', 'compilation',
+                  'autotuning', 'napplies', 'arguments', 'run']:
+            setattr(self, i, getattr(self, i) + getattr(other, i))
+        for k, v in other.sections.items():
+            self.sections[k] = self.sections.get(k, 0.) + v
+
+    @property
+    def key(self):
+        """A short identifier, for the logs."""
+        if self.soname is None:
+            return self.name
+        return "%s<%s>" % (self.name, self.soname[:7])
+
+    @property
+    def overhead(self):
+        """The time spent in Python per ``apply``, on average."""
+        if self.napplies == 0:
+            return 0.
+        return self.arguments/self.napplies
+
+    def as_dict(self):
+        ret = OrderedDict([(i, getattr(self, i)) for i in
+                           ['name', 'soname', 'nbuilds', 'build', 'ncompilations',
+                            'ncache_hits', 'compilation', 'autotuning', 'napplies',
+                            'arguments', 'run']])
+        ret['sections'] = OrderedDict(self.sections)
+        return ret
+
+
+class PerformanceRegistry(object):
+
+    """
+    Collect an :class:`OperatorRecord` for each Operator built in this session.
+    The records of the Operators sharing the same ``soname`` (e.g., an Operator
+    rebuilt for each shot) are merged as soon as the ``soname`` is known, so the
+    registry holds one record per generated code, however many Operators.
+    """
+
+    def __init__(self):
+        # The merged records, by `soname`, or by name if never compiled
+        self._records = OrderedDict()
+        # The records still lacking a `soname`, by id
+        self._pending = OrderedDict()
+
+    def new(self, name, owner=None):
+        """
+        A new :class:`OperatorRecord`, for an Operator called ``name``. If
+        ``owner`` is provided, the record is merged into those of the same
+        name once ``owner`` is garbage collected, unless it was resolved earlier.
+        """
+        record = OperatorRecord(name)
+        self._pending[id(record)] = record
+        if owner is not None:
+            weakref.finalize(owner, self._settle, record)
+        return record
+
+    def resolve(self, record):
+        """
+        Merge ``record``, whose ``soname`` is now known, into the record of the
+        Operators generating the same code, which is returned and should be used
+        in place of ``record`` from then on.
+        """
+        self._pending.pop(id(record), None)
+        return self._merge(record)
+
+    def _settle(self, record):
+        if self._pending.pop(id(record), None) is record:
+            self._merge(record)
+
+    def _merge(self, record):
+        key = record.soname or record.name
+        if key not in self._records:
+            self._records[key] = OperatorRecord(record.name)
+        self._records[key].merge(record)
+        return self._records[key]
+
+    @property
+    def records(self):
+        """
+        The :class:`OperatorRecord`s, merged by ``soname``. The Operators never
+        compiled, and therefore lacking a ``soname``, are merged by name.
+        """
+        ret = OrderedDict(self._records)
+        for i in self._pending.values():
+            key = i.soname or i.name
+            merged = OperatorRecord(i.name)
+            if key in ret:
+                merged.merge(ret[key])
+            merged.merge(i)
+            ret[key] = merged
+        return ret
+
+    def clear(self):
+        self._records.clear()
+        self._pending.clear()
+
+    def to_json(self, filename):
+        """Write out the records as a JSON file."""
+        with open(filename, 'w') as f:
+            json.dump([i.as_dict() for i in self.records.values()], f, indent=2)
+
+    def to_csv(self, filename):
+        """
+        Write out the records as a CSV file, one row per Operator, with the
+        section times as further columns.
+        """
+        records = [i.as_dict() for i in self.records.values()]
+        sections = []
+        for i in records:
+            sections.extend(k for k in i['sections'] if k not in sections)
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([k for k in OperatorRecord('').as_dict()
+                             if k != 'sections'] + sections)
+            for i in records:
+                row = [v for k, v in i.items() if k != 'sections']
+                writer.writerow(row + [i['sections'].get(k, 0.) for k in sections])
+
+    def save(self, filename):
+        """Write out the records, in a format depending on the ``filename`` suffix."""
+        if filename.endswith('.csv'):
+            self.to_csv(filename)
+        else:
+            self.to_json(filename)
+
+    def summary(self):
+        """Log the time spent in each Operator, the most expensive first."""
+        records = sorted(self.records.values(), key=lambda i: i.build + i.compilation
+                         + i.autotuning + i.arguments + i.run, reverse=True)
+        if not records:
+            return
+        info("Performance summary of %d Operator(s):" % len(records))
+        for i in records:
+            compilation = "compilation %.2f s [%d compiled, %d cache hits]" % \
+                (i.compilation, i.ncompilations, i.ncache_hits)
+            info("* %s: build %.2f s [x%d], %s, autotuning %.2f s, run %.2f s "
+                 "[%d applies, %.2f ms of overhead each]" %
+                 (i.key, i.build, i.nbuilds, compilation, i.autotuning,
+                  i.run, i.napplies, i.overhead*10**3))
+            if i.sections:
+                info("  %s" % ", ".join("%s=%.2f s" % v for v in i.sections.items()))
+
+
+perf_registry = PerformanceRegistry()
+"""The session-wide :class:`PerformanceRegistry`."""
+
+
+@atexit.register
+def _report():
+    value = configuration['perf-registry']
+    if not value:
+        return
+    perf_registry.summary()
+    if isinstance(value, str):
+        if MPI.Is_initialized() and MPI.COMM_WORLD.size > 1:
+            # One file per rank
+            root, ext = os.path.splitext(value)
+            value = '%s.rank%d%s' % (root, MPI.COMM_WORLD.rank, ext)
+        perf_registry.save(value)
+
+
+def _perf_registry_callback(value):
+    if isinstance(value, str) and value.isdigit():
+        # E.g., from the environment
+        value = int(value)
+    return value
+
+
+# Should the PerformanceRegistry be summarised at exit? Either 0 (no), 1 (yes), or
+# the JSON or CSV file the records are written out to, in addition
+configuration.add('perf-registry', 0, callback=_perf_registry_callback,
+                  impacts_jit=False)
@@ -11,8 +11,8 @@ from devito.tools import Pickable, as_tuple
 
 __all__ = ['FrozenExpr', 'Eq', 'CondEq', 'CondNe', 'Mul', 'Add', 'Pow', 'IntDiv',
            'FunctionFromPointer', 'FieldFromPointer', 'FieldFromComposite',
-           'ListInitializer', 'Byref', 'IndexedPointer', 'Macro', 'taylor_sin',
-           'taylor_cos', 'bhaskara_sin', 'bhaskara_cos']
+           'ListInitializer', 'Byref', 'IndexedPointer', 'DefFunction', 'Macro',
+           'taylor_sin', 'taylor_cos', 'bhaskara_sin', 'bhaskara_cos']
 
 
 class FrozenExpr(Expr):
@@ -292,6 +292,42 @@ class Byref(sympy.Expr, Pickable):
     __reduce_ex__ = Pickable.__reduce_ex__
 
 
+class DefFunction(sympy.Expr, Pickable):
+
+    """
+    Symbolic representation of a call to a C function ``name(arguments)``,
+    whose definition is known to be available in the generated code.
+    """
+
+    def __new__(cls, name, arguments=None):
+        arguments = as_tuple(arguments)
+        if not isinstance(name, str):
+            raise ValueError("`name` must be str")
+        if any(not isinstance(i, Expr) for i in arguments):
+            raise ValueError("`arguments` must be an iterable of Expr")
+        obj = sympy.Expr.__new__(cls, *arguments)
+        obj.name = name
+        obj.arguments = arguments
+        return obj
+
+    def __str__(self):
+        return "%s(%s)" % (self.name, ", ".join(str(i) for i in self.arguments))
+
+    __repr__ = __str__
+
+    def _hashable_content(self):
+        return super(DefFunction, self)._hashable_content() + (self.name,)
+
+    @property
+    def func(self):
+        return lambda *args: DefFunction(self.name, args)
+
+    # Pickling support
+    _pickle_args = ['name']
+    _pickle_kwargs = ['arguments']
+    __reduce_ex__ = Pickable.__reduce_ex__
+
+
 class IndexedPointer(sympy.Expr):
 
     """
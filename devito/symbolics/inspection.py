@@ -2,9 +2,10 @@ from collections import Counter
 
 from sympy import cos, sin
 
+from devito.symbolics.queries import q_reciprocal
 from devito.symbolics.search import retrieve_ops, search
 from devito.logger import warning
-from devito.tools import flatten
+from devito.tools import flatten, memoized_query
 
 __all__ = ['count', 'estimate_cost']
 
@@ -28,10 +29,10 @@ def estimate_cost(expr, estimate_functions=False):
     ----------
     expr : expr-like or list of expr-like
         One or more expressions for which the operation count is calculated.
-    estimate_functions : dict, optional
-        A mapper from known functions (e.g., sin, cos) to (estimated) operation counts.
+    estimate_functions : bool, optional
+        If True, the known functions (e.g., sin, cos) and the divisions are weighted
+        by their (estimated) operation counts, rather than counting as one operation.
     """
-    external_functions = {sin: 50, cos: 50}
     try:
         # Is it a plain SymPy object ?
         iter(expr)
@@ -48,20 +49,28 @@ def estimate_cost(expr, estimate_functions=False):
             pass
     try:
         # At this point it must be a list of SymPy objects
-        # We don't use SymPy's count_ops because we do not count integer arithmetic
-        # (e.g., array index functions such as i+1 in A[i+1])
-        # Also, the routine below is *much* faster than count_ops
-        expr = [i.rhs if i.is_Equality else i for i in expr]
-        operations = flatten(retrieve_ops(i) for i in expr)
-        flops = 0
-        for op in operations:
-            if op.is_Function:
-                if estimate_functions:
-                    flops += external_functions.get(op.__class__, 1)
-                else:
-                    flops += 1
-            else:
-                flops += len(op.args) - (1 + sum(True for i in op.args if i.is_Integer))
-        return flops
+        return sum(_estimate_cost(i.rhs if i.is_Equality else i, estimate_functions)
+                   for i in expr)
     except:
         warning("Cannot estimate cost of %s" % str(expr))
+
+
+@memoized_query
+def _estimate_cost(expr, estimate_functions):
+    # We don't use SymPy's count_ops because we do not count integer arithmetic
+    # (e.g., array index functions such as i+1 in A[i+1])
+    # Also, the routine below is *much* faster than count_ops
+    external_functions = {sin: 50, cos: 50}
+    flops = 0
+    for op in retrieve_ops(expr):
+        if op.is_Function:
+            if estimate_functions:
+                flops += external_functions.get(op.__class__, 1)
+            else:
+                flops += 1
+        else:
+            flops += len(op.args) - (1 + sum(True for i in op.args if i.is_Integer))
+    if estimate_functions:
+        # Divisions are counted too, being much more expensive than multiplications
+        flops += 25*len(search(expr, q_reciprocal, 'all', 'dfs'))
+    return flops
@@ -1,12 +1,13 @@
 from sympy import Eq, diff, cos, sin, nan
 
-from devito.tools import as_tuple, is_integer
+from devito.tools import as_tuple, is_integer, memoized_query
 
 
 __all__ = ['q_leaf', 'q_indexed', 'q_terminal', 'q_trigonometry', 'q_op',
            'q_terminalop', 'q_sum_of_product', 'q_indirect', 'q_timedimension',
            'q_constant', 'q_affine', 'q_linear', 'q_identity', 'q_inc', 'q_scalar',
-           'q_multivar', 'q_monoaffine', 'iq_timeinvariant', 'iq_timevarying']
+           'q_multivar', 'q_monoaffine', 'q_reciprocal', 'iq_timeinvariant',
+           'iq_timevarying']
 
 
 """
@@ -64,6 +65,11 @@ def q_terminalop(expr):
         return True
 
 
+def q_reciprocal(expr):
+    return expr.is_Pow and expr.exp.is_Number and expr.exp < 0
+
+
+@memoized_query
 def q_sum_of_product(expr):
     return q_leaf(expr) or q_terminalop(expr) or all(q_terminalop(i) for i in expr.args)
 
@@ -1,5 +1,6 @@
 from devito.symbolics.queries import (q_indexed, q_function, q_terminal,
                                       q_leaf, q_op, q_trigonometry)
+from devito.tools import memoized_query
 
 __all__ = ['retrieve_indexed', 'retrieve_functions', 'retrieve_function_carriers',
            'retrieve_terminals', 'retrieve_ops', 'retrieve_trigonometry', 'search']
@@ -121,6 +122,7 @@ def search(expr, query, mode='unique', visit='dfs', deep=False):
 # Shorthands
 
 
+@memoized_query
 def retrieve_indexed(expr, mode='unique', deep=False):
     """Shorthand to retrieve the Indexeds in ``expr``."""
     return search(expr, q_indexed, mode, 'dfs', deep)
@@ -1,7 +1,8 @@
-from collections import Hashable
-from functools import partial
+from collections import Hashable, OrderedDict
+from contextlib import contextmanager
+from functools import partial, wraps
 
-__all__ = ['memoized_func', 'memoized_meth']
+__all__ = ['memoized_func', 'memoized_meth', 'memoized_query', 'memoized_queries']
 
 
 class memoized_func(object):
@@ -89,3 +90,90 @@ class memoized_meth(object):
         except KeyError:
             res = cache[key] = self.func(*args, **kw)
         return res
+
+
+class memoized_query(object):
+    """
+    Decorator. Like ``memoized_func``, but: ::
+
+        * results are only memoized within a ``memoized_queries`` context, and
+          are dropped upon leaving it;
+        * the cache is keyed on the identity of the positional arguments, rather
+          than on their equality, so the returned objects (e.g., the Indexeds of
+          an expression) always belong to the very same arguments;
+        * the cache is bounded -- once ``maxsize`` entries are stored, the least
+          recently used entry is evicted;
+        * hits and misses are counted;
+        * list and set return values are copied, so callers may safely modify them.
+
+    Meant for the symbolic queries invoked over and over on the same
+    sub-expressions by the DSE passes.
+    """
+
+    registry = []
+
+    active = 0
+    """The number of open ``memoized_queries`` contexts."""
+
+    def __init__(self, func, maxsize=2**14):
+        self.func = func
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        wraps(func)(self)
+        memoized_query.registry.append(self)
+
+    def __call__(self, *args, **kwargs):
+        if not memoized_query.active:
+            return self.func(*args, **kwargs)
+        key = (tuple(id(i) for i in args), frozenset(kwargs.items()))
+        try:
+            # The arguments are stored too, so their ids can't be reused
+            _, value = self.cache[key]
+        except TypeError:
+            # Uncacheable, a list among the keyword arguments, for instance
+            return self.func(*args, **kwargs)
+        except KeyError:
+            self.misses += 1
+            value = self.func(*args, **kwargs)
+            self.cache[key] = (args, value)
+            if len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+        if isinstance(value, (list, set)):
+            return type(value)(value)
+        return value
+
+    def __repr__(self):
+        """Return the function's docstring."""
+        return self.func.__doc__
+
+    def clear(self):
+        """Drop the cache and reset the counters."""
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@contextmanager
+def memoized_queries():
+    """
+    Context manager enabling the functions decorated with ``memoized_query``
+    to memoize their results. Upon leaving the outermost context, even because
+    of an exception, all caches are dropped, and the yielded OrderedDict is
+    populated with the number of cache hits and misses of each decorated function.
+    """
+    summary = OrderedDict()
+    memoized_query.active += 1
+    try:
+        yield summary
+    finally:
+        memoized_query.active -= 1
+        if not memoized_query.active:
+            for i in memoized_query.registry:
+                if i.hits or i.misses:
+                    summary[i.func.__name__] = {'hits': i.hits, 'misses': i.misses}
+                i.clear()
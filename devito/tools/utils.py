@@ -11,7 +11,8 @@ from cgen import dtype_to_ctype as cgen_dtype_to_ctype
 __all__ = ['prod', 'as_tuple', 'is_integer', 'generator', 'grouper', 'split', 'roundm',
            'powerset', 'invert', 'flatten', 'single_or', 'filter_ordered', 'as_mapper',
            'filter_sorted', 'dtype_to_cstr', 'dtype_to_ctype', 'dtype_to_mpitype',
-           'ctypes_to_cstr', 'ctypes_pointer', 'pprint', 'sweep']
+           'dtype_to_compute', 'is_compact_dtype', 'bfloat16', 'ctypes_to_cstr',
+           'ctypes_pointer', 'pprint', 'sweep', 'humanbytes']
 
 
 def prod(iterable):
@@ -154,13 +155,69 @@ def filter_sorted(elements, key=None):
     return sorted(filter_ordered(elements, key=key), key=key)
 
 
+class bfloat16(np.uint16):
+
+    """
+    The bfloat16 storage data type. A bfloat16 value is the upper half of the
+    bit pattern of an IEEE 754 single precision value; it is stored as a 16-bit
+    unsigned integer, while arithmetic is performed in single precision.
+
+    Use :meth:`bfloat16.encode` and :meth:`bfloat16.decode` to convert between
+    single precision values and bfloat16 bit patterns. Floating point values
+    assigned to the ``data`` of a bfloat16 Function are encoded automatically,
+    while ``data.as_float()`` reads them back as single precision values.
+
+    As values are rounded to bfloat16 upon each store, an ``Inc`` into a
+    bfloat16 Function accumulates in bfloat16 precision, which may be far less
+    accurate than accumulating in single precision.
+    """
+
+    @staticmethod
+    def encode(values):
+        """Round ``values`` to the nearest bfloat16, ties to even."""
+        values = np.asanyarray(values, dtype=np.float32)
+        bits = values.view(np.uint32)
+        # Clear the lower half of NaNs (and make them quiet) so that rounding
+        # cannot turn them into infinities
+        nan = np.isnan(values).astype(np.uint32)
+        bits = (bits & ~(nan*0xffff)) | (nan*0x400000)
+        bits = (bits + 0x7fff + ((bits >> 16) & 1)) >> 16
+        bits = bits.astype(np.uint16)
+        return bits[()] if bits.ndim == 0 else bits
+
+    @staticmethod
+    def decode(bits):
+        """Convert bfloat16 bit patterns into single precision values."""
+        bits = np.asanyarray(bits, dtype=np.uint16)
+        values = (np.atleast_1d(bits).astype(np.uint32) << 16).view(np.float32)
+        return values[0] if bits.ndim == 0 else values
+
+
+def is_compact_dtype(dtype):
+    """
+    True if ``dtype`` is a compact storage data type, that is a data type
+    whose values are converted to single precision for computation.
+    """
+    return dtype is bfloat16 or (dtype is not None and np.dtype(dtype) == np.float16)
+
+
+def dtype_to_compute(dtype):
+    """The data type used to perform arithmetic on values of type ``dtype``."""
+    return np.float32 if is_compact_dtype(dtype) else dtype
+
+
 def dtype_to_cstr(dtype):
     """Translate numpy.dtype into C string."""
+    if is_compact_dtype(dtype):
+        # Compact data types are stored as raw bits
+        return 'unsigned short'
     return cgen_dtype_to_ctype(dtype)
 
 
 def dtype_to_ctype(dtype):
     """Translate numpy.dtype into a ctypes type."""
+    if is_compact_dtype(dtype):
+        return ctypes.c_uint16
     return {np.int32: ctypes.c_int,
             np.float32: ctypes.c_float,
             np.int64: ctypes.c_int64,
@@ -169,6 +226,8 @@ def dtype_to_ctype(dtype):
 
 def dtype_to_mpitype(dtype):
     """Map numpy types to MPI datatypes."""
+    if is_compact_dtype(dtype):
+        return 'MPI_UNSIGNED_SHORT'
     return {np.int32: 'MPI_INT',
             np.float32: 'MPI_FLOAT',
             np.int64: 'MPI_LONG',
@@ -230,3 +289,17 @@ def sweep(parameters, keys=None):
                     for v in sweep_values]
     for vals in product(*sweep_values):
         yield dict(zip(keys, vals))
+
+
+def humanbytes(nbytes):
+    """
+    A human-readable representation of an amount of memory, ``nbytes`` bytes,
+    in binary units (e.g., ``humanbytes(3*2**20) == '3.00 MB'``).
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(nbytes) < 1024:
+            break
+        nbytes /= 1024
+    else:
+        unit = 'TB'
+    return ("%d %s" if unit == 'B' else "%.2f %s") % (nbytes, unit)
@@ -30,23 +30,38 @@ class GenericVisitor(object):
     """
 
     def __init__(self):
-        handlers = {}
-        # visit methods are spelt visit_Foo.
-        prefix = "visit_"
-        # Inspect the methods on this instance to find out which
-        # handlers are defined.
-        for (name, meth) in inspect.getmembers(self, predicate=inspect.ismethod):
-            if not name.startswith(prefix):
-                continue
-            # Check the argument specification
-            # Valid options are:
-            #    visit_Foo(self, o, [*args, **kwargs])
-            argspec = inspect.getfullargspec(meth)
-            if len(argspec.args) < 2:
-                raise RuntimeError("Visit method signature must be "
-                                   "visit_Foo(self, o, [*args, **kwargs])")
-            handlers[name[len(prefix):]] = meth
-        self._handlers = handlers
+        cls = type(self)
+        try:
+            handlers, self._dispatch = GenericVisitor._registry[cls]
+        except KeyError:
+            handlers = {}
+            # visit methods are spelt visit_Foo.
+            prefix = "visit_"
+            # Inspect the methods on this instance to find out which
+            # handlers are defined.
+            for (name, meth) in inspect.getmembers(self, predicate=inspect.ismethod):
+                if not name.startswith(prefix):
+                    continue
+                # Check the argument specification
+                # Valid options are:
+                #    visit_Foo(self, o, [*args, **kwargs])
+                argspec = inspect.getfullargspec(meth)
+                if len(argspec.args) < 2:
+                    raise RuntimeError("Visit method signature must be "
+                                       "visit_Foo(self, o, [*args, **kwargs])")
+                handlers[name[len(prefix):]] = inspect.getattr_static(self, name)
+            self._dispatch = {}
+            GenericVisitor._registry[cls] = (handlers, self._dispatch)
+        # Bind the handlers, found once per class, to this instance
+        self._handlers = {k: v.__get__(self, cls) for k, v in handlers.items()}
+
+    _registry = {}
+    """
+    :attr:`_registry`. A mapper from Visitor classes to their handlers, and
+    to the dispatch table from visitee classes to handler names. Both are
+    shared by all instances of a Visitor class, so the visit methods are
+    inspected, and the MRO of each visitee class walked, only once.
+    """
 
     """
     :attr:`default_args`. A dict of default keyword arguments for the visitor.
@@ -83,16 +98,14 @@ class GenericVisitor(object):
         """
         cls = instance.__class__
         try:
-            # Do we have a method handler defined for this type name
-            return self._handlers[cls.__name__]
+            return self._handlers[self._dispatch[cls]]
         except KeyError:
-            # No, walk the MRO.
-            for klass in cls.mro()[1:]:
-                entry = self._handlers.get(klass.__name__)
-                if entry:
-                    # Save it on this type name for faster lookup next time
-                    self._handlers[cls.__name__] = entry
-                    return entry
+            # Walk the MRO, starting from the type name itself
+            for klass in cls.__mro__:
+                if klass.__name__ in self._handlers:
+                    # Save it on this type for faster lookup next time
+                    self._dispatch[cls] = klass.__name__
+                    return self._handlers[klass.__name__]
         raise RuntimeError("No handler found for class %s", cls.__name__)
 
     def visit(self, o, *args, **kwargs):
@@ -0,0 +1,184 @@
+"""
+Record the execution of Operators as a timeline of events, in the Chrome trace
+event format. The resulting JSON files may be loaded into ``chrome://tracing``
+or https://ui.perfetto.dev.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from ctypes import POINTER, c_double, c_int
+from time import time
+import atexit
+import json
+import os
+
+import numpy as np
+
+from devito.logger import warning
+from devito.mpi import MPI
+from devito.parameters import configuration
+from devito.types import CompositeObject
+
+__all__ = ['Tracer', 'TraceRecorder', 'trace', 'trace_recorder']
+
+
+class Tracer(CompositeObject):
+
+    """
+    The C-level counterpart of a :class:`TraceRecorder`. The generated code
+    appends to a buffer one ``(region, start, end)`` triple, with times in seconds
+    since the Epoch, for each execution of a traced code region, until the buffer
+    is full. Further executions are only counted.
+
+    Parameters
+    ----------
+    name : str
+        The name of the Operator parameter.
+    regions : list of str
+        The names of the traced code regions, such as ``section0`` or
+        ``haloupdate0``. A region is identified by its index in this list.
+    categories : list of str
+        The category of each traced code region, such as ``section`` or ``mpi``.
+    """
+
+    def __init__(self, name, regions, categories):
+        pfields = [('events', POINTER(c_double)), ('nevents', c_int),
+                   ('capacity', c_int)]
+        super(Tracer, self).__init__(name, 'tracer', pfields)
+        self.regions = tuple(regions)
+        self.categories = tuple(categories)
+        self._buffer = None
+
+    def reset(self):
+        capacity = configuration['trace-size']
+        # The buffer is allocated once, and reused across runs
+        if self._buffer is None or len(self._buffer) != capacity:
+            self._buffer = np.zeros((capacity, 3), dtype=np.float64)
+        obj = self.value._obj
+        obj.events = self._buffer.ctypes.data_as(POINTER(c_double))
+        obj.nevents = 0
+        obj.capacity = capacity
+        return self.value
+
+    @property
+    def events(self):
+        """The recorded ``(region, start, end)`` triples, as a NumPy array."""
+        obj = self.value._obj
+        return self._buffer[:min(obj.nevents, obj.capacity)].copy()
+
+    @property
+    def dropped(self):
+        """The number of executions that didn't fit in the buffer."""
+        obj = self.value._obj
+        return max(obj.nevents - obj.capacity, 0)
+
+    # Pickling support
+    _pickle_args = ['name', 'regions', 'categories']
+
+
+class TraceRecorder(object):
+
+    """
+    Collect trace events, in the Chrome trace event format, across the whole
+    session.
+
+    Each MPI rank is a separate process in the trace. The events are emitted
+    by the Python code driving the Operators (e.g., argument processing,
+    autotuning) and, through a :class:`Tracer`, by the generated code.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.events = []
+        self.epoch = time()
+
+    @property
+    def rank(self):
+        if MPI.Is_initialized():
+            return MPI.COMM_WORLD.rank
+        return 0
+
+    def add(self, name, cat, start, end, **kwargs):
+        """Add a complete event spanning from ``start`` to ``end``, in seconds."""
+        self.events.append(OrderedDict([('name', name), ('cat', cat), ('ph', 'X'),
+                                        ('ts', (start - self.epoch)*1e6),
+                                        ('dur', (end - start)*1e6),
+                                        ('pid', self.rank), ('tid', 0),
+                                        ('args', kwargs)]))
+
+    def add_tracer(self, tracer):
+        """Add the events recorded by the generated code through ``tracer``."""
+        for region, start, end in tracer.events:
+            self.add(tracer.regions[int(region)], tracer.categories[int(region)],
+                     start, end)
+        if tracer.dropped:
+            warning("Trace buffer full, %d events dropped (see "
+                    "`configuration['trace-size']`)" % tracer.dropped)
+
+    @contextmanager
+    def span(self, name, cat='python', **kwargs):
+        """A context manager recording an event for the enclosed code block."""
+        start = time()
+        try:
+            yield
+        finally:
+            self.add(name, cat, start, time(), **kwargs)
+
+    def save(self, filename):
+        """Write out the trace events as a JSON file."""
+        metadata = [OrderedDict([('name', 'process_name'), ('ph', 'M'),
+                                 ('pid', self.rank),
+                                 ('args', {'name': 'rank %d' % self.rank})])]
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': metadata + self.events,
+                       'displayTimeUnit': 'ms'}, f)
+
+
+_recorder = None
+
+
+def trace_recorder():
+    """
+    The session-wide :class:`TraceRecorder`, or None if tracing is disabled.
+    The trace is written out at exit, to the file ``configuration['trace']``
+    was last set to.
+    """
+    global _recorder
+    if not configuration['trace']:
+        return None
+    if _recorder is None:
+        _recorder = TraceRecorder()
+        atexit.register(_save_trace)
+    _recorder.filename = configuration['trace']
+    return _recorder
+
+
+def _save_trace():
+    filename = _recorder.filename
+    if MPI.Is_initialized() and MPI.COMM_WORLD.size > 1:
+        # One file per rank
+        root, ext = os.path.splitext(filename)
+        filename = '%s.rank%d%s' % (root, _recorder.rank, ext)
+    _recorder.save(filename)
+
+
+@contextmanager
+def trace(name, cat='python', **kwargs):
+    """
+    A context manager recording an event for the enclosed code block, if
+    tracing is enabled, otherwise a no-op.
+    """
+    recorder = trace_recorder()
+    if recorder is None:
+        yield
+    else:
+        with recorder.span(name, cat, **kwargs):
+            yield
+
+
+# The file the trace is written to, at exit; tracing is disabled if unset
+configuration.add('trace', None, impacts_jit=False)
+
+# The maximum number of events recorded by the generated code in each run
+configuration.add('trace-size', 65536, callback=lambda i: max(int(i), 1),
+                  impacts_jit=False)
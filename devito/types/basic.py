@@ -570,6 +570,14 @@ class AbstractCachedFunction(AbstractFunction, Cached):
         """
         return False
 
+    @property
+    def _mem_pooled(self):
+        """
+        True if the associated data is drawn from a pool of buffers allocated
+        from Python and reused across Operator runs, False otherwise.
+        """
+        return False
+
     @property
     def size(self):
         """
@@ -748,8 +756,11 @@ class Array(AbstractCachedFunction):
     padding : iterable of 2-tuples, optional
         The padding region of the object.
     scope : str, optional
-        Control memory allocation. Allowed values: 'heap', 'stack'. Defaults
-        to 'heap'.
+        Control memory allocation. Allowed values: 'heap', 'stack', 'external',
+        'pooled'. Defaults to 'heap'. External Arrays are allocated from Python,
+        and thus may outlive a single Operator run. Pooled Arrays are drawn from
+        a pool of buffers allocated from Python, and their content is dead once
+        an Operator run is over.
 
     Warnings
     --------
@@ -769,7 +780,7 @@ class Array(AbstractCachedFunction):
             super(Array, self).__init__(*args, **kwargs)
 
             self._scope = kwargs.get('scope', 'heap')
-            assert self._scope in ['heap', 'stack']
+            assert self._scope in ['heap', 'stack', 'external', 'pooled']
 
     @classmethod
     def __indices_setup__(cls, **kwargs):
@@ -787,6 +798,10 @@ class Array(AbstractCachedFunction):
     def scope(self):
         return self._scope
 
+    @property
+    def _mem_external(self):
+        return self._scope == 'external'
+
     @property
     def _mem_stack(self):
         return self._scope == 'stack'
@@ -795,10 +810,18 @@ class Array(AbstractCachedFunction):
     def _mem_heap(self):
         return self._scope == 'heap'
 
+    @property
+    def _mem_pooled(self):
+        return self._scope == 'pooled'
+
     @property
     def _C_typename(self):
         return ctypes_to_cstr(POINTER(dtype_to_ctype(self.dtype)))
 
+    @property
+    def _C_ctype(self):
+        return POINTER(dtype_to_ctype(self.dtype))
+
     def update(self, **kwargs):
         self._shape = kwargs.get('shape', self.shape)
         self._indices = kwargs.get('dimensions', self.indices)
@@ -806,7 +829,7 @@ class Array(AbstractCachedFunction):
         self._halo = kwargs.get('halo', self._halo)
         self._padding = kwargs.get('padding', self._padding)
         self._scope = kwargs.get('scope', self._scope)
-        assert self._scope in ['heap', 'stack']
+        assert self._scope in ['heap', 'stack', 'external', 'pooled']
 
     # Pickling support
     _pickle_kwargs = AbstractCachedFunction._pickle_kwargs + ['dimensions', 'scope']
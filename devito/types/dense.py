@@ -852,7 +852,9 @@ class Function(DiscreteFunction, Differentiable):
         Dimensions associated with the object. Only necessary if ``grid`` isn't given.
     dtype : data-type, optional
         Any object that can be interpreted as a numpy data type. Defaults
-        to ``np.float32``.
+        to ``np.float32``. With the compact storage data types ``np.float16``
+        and ``bfloat16``, arithmetic is carried out in single precision, while
+        values are rounded upon each store, including each increment.
     staggered : Dimension or tuple of Dimension or Stagger, optional
         Define how the Function is staggered.
     padding : int or tuple of ints, optional
@@ -1083,7 +1085,9 @@ class TimeFunction(Function):
         Dimensions associated with the object. Only necessary if `grid` isn't given.
     dtype : data-type, optional
         Any object that can be interpreted as a numpy data type. Defaults
-        to `np.float32`.
+        to `np.float32`. With the compact storage data types ``np.float16``
+        and ``bfloat16``, arithmetic is carried out in single precision, while
+        values are rounded upon each store, including each increment.
     save : int or Buffer, optional
         By default, ``save=None``, which indicates the use of alternating buffers. This
         enables cyclic writes to the TimeFunction. For example, if the TimeFunction
@@ -1255,6 +1259,35 @@ class TimeFunction(Function):
     def _time_buffering_default(self):
         return self._time_buffering and not isinstance(self.save, Buffer)
 
+    def _shrink_time_buffer(self, size):
+        """
+        Shrink the circular buffer along the time Dimension to ``size`` timeslots,
+        as if the TimeFunction had been created with ``save=Buffer(size)``.
+
+        Notes
+        -----
+        This method is used by the DLE to drop unnecessary timeslots (see the
+        ``shrinkbuffers`` option) and should not be called from user code. As
+        the Operators already built for this TimeFunction expect the original
+        buffer, and would reject the shrunk one, the data must not have been
+        allocated yet.
+        """
+        assert self._time_buffering_default and self._data is None
+        assert 0 < size <= self._time_size
+
+        shape = list(self._shape)
+        shape[self._time_position] = size
+        self._shape = tuple(shape)
+        self.save = Buffer(size)
+
+        # Drop all cached shape-dependent properties and memoized methods
+        prefixes = ('shape', '_shape', '_size', '_offset', '_mask', '_decomposition')
+        for cls in type(self).__mro__:
+            for k, v in vars(cls).items():
+                if isinstance(v, cached_property) and k.startswith(prefixes):
+                    self.__dict__.pop(k, None)
+        self.__dict__.pop('_memoized_meth__cache', None)
+
     def _arg_check(self, args, intervals):
         super(TimeFunction, self)._arg_check(args, intervals)
         key_time_size = args[self.name].shape[self._time_position]
@@ -1,6 +1,7 @@
 import ctypes
 from collections import OrderedDict
 from pathlib import Path
+from time import time
 
 import numpy as np
 
@@ -133,7 +134,10 @@ class OperatorYASK(Operator):
 
     def apply(self, **kwargs):
         # Build the arguments list to invoke the kernel function
+        tic = time()
+        autotuning = self._perf.autotuning
         args = self.arguments(**kwargs)
+        arguments = time() - tic - (self._perf.autotuning - autotuning)
 
         # Map default Functions to runtime Functions; will be used for "grid sharing"
         toshare = {}
@@ -147,12 +151,20 @@ class OperatorYASK(Operator):
         for i in self.yk_solns.values():
             i.pre_apply(toshare)
         arg_values = [args[p.name] for p in self.parameters]
-        self.cfunction(*arg_values)
+        cfunction = self.cfunction
+        memory = self._sample_memory()
+        tic = time()
+        cfunction(*arg_values)
+        run = time() - tic
         for i in self.yk_solns.values():
             i.post_apply()
 
         # Output summary of performance achieved
-        return self._profile_output(args)
+        summary = self._profile_output(args, memory)
+
+        self._perf.add_apply(arguments, run, summary.timings)
+
+        return summary
 
     def __getstate__(self):
         state = dict(super(OperatorYASK, self).__getstate__())
@@ -0,0 +1,180 @@
+"""
+Scaling benchmarks for the Devito Symbolic Engine (DSE).
+
+Usage: ::
+
+    python examples/compiler/dse_benchmark.py aliases --orders 4 8 16 32
+    python examples/compiler/dse_benchmark.py cse --orders 4 8 16
+"""
+
+from time import time
+
+import click
+import numpy as np
+
+from devito import Grid, Function, Eq, configuration, info
+from devito.dse import common_subexprs_elimination
+from devito.dse.aliases import collect, compare, is_translated, calculate_offsets
+from devito.ir.iet import Expression, FindNodes
+from devito.symbolics import estimate_cost, indexify, retrieve_indexed
+from devito.tools import generator
+from devito.types import Scalar
+from examples.seismic import demo_model, AcquisitionGeometry
+from examples.seismic.tti import AnisotropicWaveSolver
+
+
+@click.group()
+def benchmark():
+    """
+    Benchmarking script measuring how the DSE scales with the size of the input.
+    """
+    pass
+
+
+def synthetic_stencil(order, nfields=3):
+    """
+    Build a list of scalar expressions mimicking the sub-expressions that the
+    DSE extracts from a stencil of given ``order``. Each expression is a
+    sum-of-products over ``nfields`` Functions, evaluated at a shifted point, so
+    expressions are aliases of each other if and only if they share the same
+    operations and they are translated by a constant offset.
+    """
+    grid = Grid(shape=(order + 1, order + 1))
+    x, y = grid.dimensions
+    fields = [Function(name='f%d' % i, grid=grid, space_order=order)
+              for i in range(nfields)]
+
+    exprs = []
+    for n, (a, b) in enumerate(zip(fields, fields[1:] + fields[:1])):
+        for i in range(-order//2, order//2 + 1):
+            for j in range(-order//2, order//2 + 1):
+                # Pattern 1: alias along both `x` and `y`
+                rhs = a[x + i, y + j]*b[x + i, y + j] + a[x + i + 1, y + j]
+                exprs.append(Eq(Scalar(name='r%d' % len(exprs)), rhs))
+                # Pattern 2: different operation, aliases only along `x`
+                rhs = a[x + i, y]*b[x + i, y + 1] - 3.*a[x + i, y + abs(j)]
+                exprs.append(Eq(Scalar(name='r%d' % len(exprs)), rhs))
+    return exprs
+
+
+def reference_collect(exprs):
+    """
+    The pairwise alias detection, quadratic in the number of candidate expressions.
+    Only returns the aliasing groups, for comparison purposes.
+    """
+    candidates = []
+    for e in exprs:
+        indexeds = retrieve_indexed(e.rhs, mode='all')
+        handle = calculate_offsets(indexeds)
+        if handle:
+            candidates.append((e.rhs, handle[1]))
+
+    groups = []
+    unseen = list(candidates)
+    while unseen:
+        handle, ofs = unseen.pop(0)
+        group = [handle]
+        for e, i in list(unseen):
+            if compare(handle, e) and is_translated(ofs, i):
+                group.append(e)
+                unseen.remove((e, i))
+        groups.append(group)
+    return groups
+
+
+@benchmark.command(name='aliases')
+@click.option('--orders', '-o', type=int, multiple=True, default=(4, 8, 12, 16),
+              help='Stencil orders of the synthetic expressions')
+@click.option('--reference', '-r', is_flag=True, default=False,
+              help='Also time the pairwise (quadratic) alias detection')
+def cli_aliases(orders, reference):
+    """
+    Time alias detection over synthetic stencils of increasing order.
+    """
+    for order in orders:
+        exprs = synthetic_stencil(order)
+
+        tic = time()
+        mapper, aliases = collect(exprs)
+        toc = time()
+        elapsed = toc - tic
+
+        msg = ("order=%d: %d expressions, %d aliases found in %.3f s "
+               "[%.1f us/expression]" % (order, len(exprs), len(aliases), elapsed,
+                                         elapsed*1e6/len(exprs)))
+        if reference:
+            tic = time()
+            reference_collect(exprs)
+            toc = time()
+            msg += " [pairwise: %.3f s]" % (toc - tic)
+        info(msg)
+
+
+def synthetic_redundancies(order):
+    """
+    Build a list of expressions with many, nested, redundant sub-expressions, as
+    found in the stencils of anisotropic kernels (e.g., rotated derivatives).
+    """
+    grid = Grid(shape=(order + 1, order + 1))
+    x, y = grid.dimensions
+    u = Function(name='u', grid=grid, space_order=order)
+    a = Function(name='a', grid=grid, space_order=order)
+    b = Function(name='b', grid=grid, space_order=order)
+
+    gx = u.dx
+    gy = u.dy
+    rotated = a*gx + b*gy
+    exprs = [Eq(Scalar(name='r0'), rotated*a + rotated*gx*gy),
+             Eq(Scalar(name='r1'), rotated*b - gx*gy + (gx + gy)*(a*gx + b*gy)),
+             Eq(Scalar(name='r2'), (gx + gy)*rotated + gx*gy)]
+    return [indexify(i) for i in exprs]
+
+
+@benchmark.command(name='cse')
+@click.option('--orders', '-o', type=int, multiple=True, default=(4, 8, 16),
+              help='Stencil orders of the synthetic expressions and of the TTI kernel')
+@click.option('--tti/--no-tti', default=True,
+              help='Also time the build of a TTI Operator')
+def cli_cse(orders, tti):
+    """
+    Compare the CSE modes in terms of processing time and resulting flop count.
+    """
+    for order in orders:
+        exprs = synthetic_redundancies(order)
+        for mode in ['dag', 'iterative']:
+            counter = generator()
+            make = lambda: Scalar(name='t%d' % counter()).indexify()
+
+            tic = time()
+            processed = common_subexprs_elimination(exprs, make, mode)
+            toc = time()
+
+            info("order=%d, mode=%s: synthetic, %d -> %d flops in %.3f s" %
+                 (order, mode, estimate_cost(exprs), estimate_cost(processed),
+                  toc - tic))
+
+        if not tti:
+            continue
+
+        model = demo_model('layers-tti', spacing=(10., 10., 10.), shape=(50, 50, 50),
+                           nbpml=10, space_order=order)
+        coordinates = np.array([[250., 250., 30.]])
+        geometry = AcquisitionGeometry(model, coordinates, coordinates,
+                                       t0=0., tn=100., src_type='Ricker', f0=0.010)
+        previous = configuration['cse']
+        for mode in ['dag', 'iterative']:
+            configuration['cse'] = mode
+            solver = AnisotropicWaveSolver(model, geometry, space_order=order)
+
+            tic = time()
+            op = solver.op_fwd(kernel='centered', save=False)
+            toc = time()
+
+            exprs = [i.expr for i in FindNodes(Expression).visit(op)]
+            info("order=%d, mode=%s: TTI Operator, %d flops, built in %.3f s" %
+                 (order, mode, estimate_cost(exprs), toc - tic))
+        configuration['cse'] = previous
+
+
+if __name__ == "__main__":
+    benchmark()
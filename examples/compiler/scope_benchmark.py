@@ -0,0 +1,118 @@
+"""
+Scaling benchmarks for the data dependence analysis (i.e., the ``Scope``).
+
+Usage: ::
+
+    python examples/compiler/scope_benchmark.py analysis --nfields 4 8 16 32
+    python examples/compiler/scope_benchmark.py build --nfields 4 8 16
+"""
+
+from time import time
+
+import click
+
+from devito import Grid, TimeFunction, Eq, Operator, info, solve
+from devito.ir.iet import Expression, FindNodes
+from devito.ir.support import Scope
+
+
+@click.group()
+def benchmark():
+    """
+    Benchmarking script measuring how the data dependence analysis scales
+    with the number of equations.
+    """
+    pass
+
+
+def coupled_equations(nfields, space_order=4):
+    """
+    Build ``nfields`` coupled wave equations, each of which reads its own
+    field and the previous one at several, shifted, points.
+    """
+    grid = Grid(shape=(32, 32, 32))
+    fields = [TimeFunction(name='u%d' % i, grid=grid, time_order=2,
+                           space_order=space_order) for i in range(nfields)]
+
+    eqns = []
+    for a, b in zip(fields, fields[-1:] + fields[:-1]):
+        pde = a.dt2 - a.laplace - b.dx2
+        eqns.append(Eq(a.forward, solve(pde, a.forward)))
+    return eqns
+
+
+def reference_dependences(scope):
+    """
+    The pairwise, purely symbolic, dependence analysis. Only returns the
+    number of flow, anti, and output dependences, for comparison purposes.
+    """
+    nflow = nanti = noutput = 0
+    for k, v in scope.writes.items():
+        for w in v:
+            for r in scope.reads.get(k, []):
+                try:
+                    nflow += bool((r < w) or (r == w and r.lex_ge(w)))
+                except TypeError:
+                    nflow += not r.is_read_increment
+                try:
+                    nanti += bool((r > w) or (r == w and r.lex_lt(w)))
+                except TypeError:
+                    nanti += not r.is_read_increment
+            for w2 in v:
+                try:
+                    noutput += bool((w2 > w) or (w2 == w and w2.lex_gt(w)))
+                except TypeError:
+                    noutput += 1
+    return nflow, nanti, noutput
+
+
+@benchmark.command(name='analysis')
+@click.option('--nfields', '-n', type=int, multiple=True, default=(4, 8, 16),
+              help='Number of coupled equations')
+@click.option('--reference', '-r', is_flag=True, default=False,
+              help='Also time the pairwise (symbolic) dependence analysis')
+def cli_analysis(nfields, reference):
+    """
+    Time the data dependence analysis of the expressions of an Operator.
+    """
+    for n in nfields:
+        op = Operator(coupled_equations(n), dse='noop', dle='noop')
+        exprs = [i.expr for i in FindNodes(Expression).visit(op)]
+
+        tic = time()
+        scope = Scope(exprs)
+        ndeps = len(scope.d_all)
+        toc = time()
+
+        msg = ("nfields=%d: %d expressions, %d dependences found in %.3f s"
+               % (n, len(exprs), ndeps, toc - tic))
+        if reference:
+            tic = time()
+            scope = Scope(exprs)
+            reference_dependences(scope)
+            toc = time()
+            msg += " [pairwise: %.3f s]" % (toc - tic)
+        info(msg)
+
+
+@benchmark.command(name='build')
+@click.option('--nfields', '-n', type=int, multiple=True, default=(4, 8, 16),
+              help='Number of coupled equations')
+@click.option('--dse', default='advanced', help='The DSE mode')
+def cli_build(nfields, dse):
+    """
+    Time the construction of an Operator, which performs data dependence
+    analysis when clustering and when analyzing the Iteration/Expression tree.
+    """
+    for n in nfields:
+        eqns = coupled_equations(n)
+
+        tic = time()
+        Operator(eqns, dse=dse)
+        toc = time()
+
+        info("nfields=%d: Operator built in %.3f s" % (n, toc - tic))
+
+
+if __name__ == "__main__":
+    benchmark()
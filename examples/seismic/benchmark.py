@@ -1,13 +1,25 @@
 from collections import OrderedDict
+from datetime import datetime
+import atexit
+import json
+import os
+import platform
 import sys
 
 import numpy as np
 import click
 
 from devito import clear_cache, configuration, sweep, mode_develop, mode_benchmark
-from devito.logger import warning
-from examples.seismic.acoustic.acoustic_example import run as acoustic_run
-from examples.seismic.tti.tti_example import run as tti_run
+from devito._version import get_versions
+from devito.logger import info, warning
+from devito.machine import characterize
+from devito.mpi import MPI
+from devito.registry import perf_registry
+from examples.seismic.acoustic.acoustic_example import (acoustic_setup,
+                                                        run as acoustic_run)
+from examples.seismic.elastic.elastic_example import elastic_setup
+from examples.seismic.poroelastic.poroelastic_example import poroelastic_setup
+from examples.seismic.tti.tti_example import run as tti_run, tti_setup
 
 
 @click.group()
@@ -20,6 +32,9 @@ def benchmark():
     run: a single run with given DSE/DLE levels
     bench: complete benchmark with multiple DSE/DLE levels
     test: tests numerical correctness with different parameters
+    predict: compare the predicted and the actual performance of a run
+    suite: the benchmark suite, writing versioned results to a JSON file
+    compare: look for regressions between two results files of the suite
 
     Further, this script can generate a roofline plot from a benchmark
     """
@@ -179,6 +194,48 @@ def bench(problem, **kwargs):
     clear_cache()
 
 
+@benchmark.command(name='predict')
+@option_simulation
+@option_performance
+def cli_predict(problem, **kwargs):
+    """
+    Compare the predicted and the actual performance of a single run.
+    """
+    mode_benchmark()
+    predict(problem, **kwargs)
+
+
+def predict(problem, **kwargs):
+    """
+    Compare the predicted and the actual performance of a single run.
+    """
+    kwargs.pop('arch')
+    time_order = kwargs.pop('time_order')[0]
+    space_order = kwargs.pop('space_order')[0]
+    if problem == 'tti':
+        solver = tti_setup(space_order=space_order, **kwargs)
+        op = solver.op_fwd(kernel='centered')
+        forward = lambda: solver.forward(kernel='centered')[-1]
+    else:
+        solver = acoustic_setup(space_order=space_order, time_order=time_order,
+                                **kwargs)
+        op = solver.op_fwd(save=False)
+        forward = lambda: solver.forward()[-1]
+
+    prediction = op.predict(dt=solver.dt)
+    summary = forward()
+    error = prediction.error(summary)
+
+    machine = prediction.machine
+    info("Machine: %.2f GB/s, %.2f GFlops/s" % (machine.bandwidth, machine.gflopss))
+    for k, v in prediction.items():
+        info("* %s: predicted %.3f s (%s-bound), measured %.3f s [error=%+.0f%%]" %
+             (k, v.time, v.bound, summary[k].time, 100*error[k]))
+    measured = sum(summary.timings.values())
+    info("Total: predicted %.3f s, measured %.3f s [error=%+.0f%%]" %
+         (prediction.time, measured, 100*(prediction.time - measured)/measured))
+
+
 @benchmark.command(name='plot')
 @option_simulation
 @option_performance
@@ -189,7 +246,7 @@ def bench(problem, **kwargs):
 @click.option('-r', '--resultsdir', default='results',
               help='Directory containing results')
 @click.option('--max-bw', type=float,
-              help='Max GB/s of the DRAM')
+              help='Max GB/s of the DRAM (default: measured on this machine)')
 @click.option('--flop-ceil', type=(float, str), multiple=True,
               help='Max GFLOPS/s of the CPU. A 2-tuple (float, str)'
                    'is expected, where the float is the performance'
@@ -214,6 +271,12 @@ def plot(problem, **kwargs):
     flop_ceils = kwargs.pop('flop_ceil')
     point_runtime = kwargs.pop('point_runtime')
 
+    # Unless provided, the ceilings are measured on this machine
+    if max_bw is None or not flop_ceils:
+        model = characterize()
+        max_bw = model.bandwidth if max_bw is None else max_bw
+        flop_ceils = flop_ceils or [(model.gflopss, 'FMA peak')]
+
     arch = kwargs['arch']
     space_order = "[%s]" % ",".join(str(i) for i in kwargs['space_order'])
     time_order = kwargs['time_order']
@@ -295,6 +358,301 @@ def plot(problem, **kwargs):
                            oi_annotate=oi_annotate, point_annotate=point_annotate)
 
 
+def _acoustic_case(shape, **kwargs):
+    solver = acoustic_setup(shape=shape, **kwargs)
+    return solver, lambda: solver.forward(save=False)[-1]
+
+
+def _sparse_case(shape, **kwargs):
+    # As many receivers as there are points along the surface
+    return _acoustic_case(shape, nrec=shape[0]*shape[1], **kwargs)
+
+
+def _tti_case(shape, **kwargs):
+    solver = tti_setup(shape=shape, **kwargs)
+    return solver, lambda: solver.forward(kernel='centered')[-1]
+
+
+def _elastic_case(shape, **kwargs):
+    solver = elastic_setup(shape=shape, **kwargs)
+    return solver, lambda: solver.forward()[-1]
+
+
+def _poroelastic_case(shape, **kwargs):
+    # Only the constant model is available
+    solver = poroelastic_setup(shape=shape, constant=True, **kwargs)
+    return solver, lambda: solver.forward()[-1]
+
+
+suite_cases = OrderedDict([
+    ('acoustic', (_acoustic_case, 3, 0)),
+    ('tti', (_tti_case, 3, 0)),
+    ('elastic', (_elastic_case, 2, 0)),
+    ('poroelastic', (_poroelastic_case, 2, 0)),
+    ('acoustic-sparse', (_sparse_case, 3, 0)),
+    ('acoustic-mpi', (_acoustic_case, 3, 'basic')),
+    ('acoustic-mpi-diag', (_acoustic_case, 3, 'diag')),
+    ('acoustic-mpi-overlap', (_acoustic_case, 3, 'overlap')),
+])
+"""
+The cases of the benchmark suite, as ``(setup, ndim, mpi)``, where ``mpi`` is
+the value of ``configuration['mpi']`` the case is run with.
+"""
+
+suite_shapes = {
+    'small': {2: (256, 256), 3: (64, 64, 64)},
+    'medium': {2: (1024, 1024), 3: (160, 160, 160)},
+    'large': {2: (4096, 4096), 3: (320, 320, 320)},
+}
+"""The grid shapes of the cases of the suite, by problem size and dimensionality."""
+
+suite_metrics = OrderedDict([
+    ('build', False),  # Operator construction, in seconds
+    ('compilation', False),  # JIT compilation, in seconds
+    ('arguments', False),  # Argument processing, per `apply`, in seconds
+    ('gpointss', True),  # Throughput, in GPts/s
+    ('footprint', False),  # Memory footprint, in bytes
+])
+"""The metrics measured by the suite, and whether the higher the better."""
+
+suite_format = 1
+"""The version of the format of the suite results."""
+
+
+@benchmark.command(name='suite')
+@click.option('-c', '--case', 'cases', multiple=True,
+              type=click.Choice(list(suite_cases)),
+              help='Case to run (default: all of them)')
+@click.option('-z', '--size', default='small', type=click.Choice(list(suite_shapes)),
+              help='Problem size')
+@click.option('-so', '--space-order', default=4, help='Space order of the simulation')
+@click.option('-t', '--tn', default=100., help='End time of the simulation in ms')
+@click.option('-n', '--nbpml', default=10, help='Number of PML layers')
+@click.option('-x', '--repeats', default=5, help='Number of test case repetitions')
+@click.option('-o', '--output', default='suite.json', help='The results file')
+def cli_suite(**kwargs):
+    """
+    Run the benchmark suite, and write the results to a JSON file.
+    """
+    mode_benchmark()
+    suite(**kwargs)
+
+
+def suite(cases=None, size='small', space_order=4, tn=100., nbpml=10, repeats=5,
+          output=None):
+    """
+    Run the benchmark suite, and return the results. These are also written to
+    the JSON file ``output``, if provided.
+
+    Each case is run ``repeats`` times from scratch, that is with the symbolic
+    caches cleared, so that each repetition builds its own Operator. Compilation
+    is only timed when it actually happens: to time it in each repetition, the
+    JIT cache should be disabled, or be pointed to a fresh directory.
+
+    The MPI cases run with as many ranks as this program was launched with,
+    and report the slowest rank. Under MPI, the serial cases are skipped, as the
+    ranks would compete for the same cores. Note that, throughout the suite,
+    ``perf_registry`` is cleared before each repetition.
+    """
+    cases = list(cases or suite_cases)
+    if any(suite_cases[i][2] for i in cases) and hasattr(MPI, 'COMM_WORLD'):
+        # Initialize MPI, as Devito would, to find out the number of ranks
+        if not MPI.Is_initialized():
+            MPI.Init()
+            atexit.register(MPI.Finalize)
+    nranks = MPI.COMM_WORLD.size if MPI.Is_initialized() else 1
+
+    results = _suite_header()
+    results['nranks'] = nranks
+    results['parameters'] = OrderedDict([('size', size), ('space_order', space_order),
+                                         ('tn', tn), ('nbpml', nbpml)])
+    results['repeats'] = repeats
+    results['cases'] = OrderedDict()
+    for name in cases:
+        setup, ndim, mpi = suite_cases[name]
+        if mpi and not hasattr(MPI, 'COMM_WORLD'):
+            warning("Skipping `%s`, as mpi4py is unavailable" % name)
+            continue
+        if not mpi and nranks > 1:
+            warning("Skipping `%s`, as it is a serial case" % name)
+            continue
+
+        shape = suite_shapes[size][ndim]
+        info("Running `%s` on a %s grid, %d times" % (name, shape, repeats))
+        metrics = OrderedDict((k, []) for k in suite_metrics)
+        previous = configuration['mpi']
+        configuration['mpi'] = mpi
+        try:
+            for _ in range(repeats):
+                for k, v in _suite_run(setup, shape, space_order=space_order, tn=tn,
+                                       nbpml=nbpml).items():
+                    metrics[k].append(v)
+        finally:
+            configuration['mpi'] = previous
+        results['cases'][name] = OrderedDict([('shape', shape), ('metrics', metrics)])
+
+        means = ["%s=%.3g" % (k, np.mean(v)) for k, v in metrics.items() if v]
+        info("* %s: %s" % (name, ", ".join(means)))
+
+    if output and (nranks == 1 or MPI.COMM_WORLD.rank == 0):
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        info("Results written to `%s`" % output)
+
+    # Final clean up, just in case the benchmarker is used from external Python modules
+    clear_cache()
+
+    return results
+
+
+def _suite_header():
+    """The versions, machine and configuration the suite results refer to."""
+    versions = get_versions()
+    header = OrderedDict()
+    header['format'] = suite_format
+    header['date'] = datetime.now().isoformat()
+    header['devito'] = OrderedDict([('version', versions['version']),
+                                    ('revision', versions['full-revisionid']),
+                                    ('dirty', versions['dirty'])])
+    header['python'] = platform.python_version()
+    header['numpy'] = np.__version__
+    header['host'] = OrderedDict([('node', platform.node()),
+                                  ('machine', platform.machine()),
+                                  ('processor', platform.processor()),
+                                  ('ncpus', os.cpu_count())])
+    header['configuration'] = OrderedDict(
+        [(k, str(configuration[k])) for k in ['backend', 'compiler', 'platform',
+                                              'dse', 'dle', 'openmp', 'autotuning']]
+    )
+    header['configuration']['compiler-version'] = str(configuration['compiler'].version)
+    header['configuration']['OMP_NUM_THREADS'] = os.environ.get('OMP_NUM_THREADS')
+    return header
+
+
+def _suite_run(setup, shape, **kwargs):
+    """One repetition of a case of the suite. Return the measured metrics."""
+    clear_cache()
+    perf_registry.clear()
+
+    solver, forward = setup(shape, **kwargs)
+    summary = forward()
+
+    records = list(perf_registry.records.values())
+    build = sum(i.build for i in records)
+    compiled = any(i.ncompilations for i in records)
+    compilation = sum(i.compilation for i in records)
+    arguments = sum(i.arguments for i in records)/sum(i.napplies for i in records)
+    run = sum(i.run for i in records)
+    # Unknown if the size of any memory scope couldn't be determined
+    footprint = summary.memory.footprint.get('total')
+
+    distributor = solver.model.grid.distributor
+    if distributor.is_parallel:
+        # The slowest rank dictates the pace, while the memory adds up
+        build, compiled, compilation, arguments, run = \
+            [distributor.comm.allreduce(i, op=MPI.MAX)
+             for i in (build, compiled, compilation, arguments, run)]
+        footprints = distributor.comm.allgather(footprint)
+        footprint = None if None in footprints else sum(footprints)
+
+    metrics = OrderedDict()
+    metrics['build'] = build
+    if compiled:
+        metrics['compilation'] = compilation
+    metrics['arguments'] = arguments
+    points = np.prod(solver.model.grid.shape)*solver.geometry.nt
+    metrics['gpointss'] = points/run/10**9
+    if footprint is not None:
+        metrics['footprint'] = footprint
+    return metrics
+
+
+@benchmark.command(name='compare')
+@click.argument('old', type=click.Path(exists=True))
+@click.argument('new', type=click.Path(exists=True))
+@click.option('--alpha', default=0.05,
+              help='Significance level of the test for regressions')
+@click.option('--threshold', default=0.05,
+              help='Smallest relative change considered a regression')
+def cli_compare(old, new, **kwargs):
+    """
+    Compare two results files of the benchmark suite, and exit with a
+    non-zero status upon regressions.
+    """
+    regressions = compare(old, new, **kwargs)
+    sys.exit(1 if regressions else 0)
+
+
+def compare(old, new, alpha=0.05, threshold=0.05):
+    """
+    Compare two results files of the benchmark suite, case by case and metric
+    by metric, and return the regressions in ``new``, as a list of 4-tuples
+    ``(case, metric, change, pvalue)``.
+
+    A change is a regression if it is for the worse, if it exceeds ``threshold``
+    (relative to the mean of ``old``), and if it is statistically significant
+    at level ``alpha``, according to Welch's t-test. With fewer than two
+    measurements on either side, the significance cannot be assessed, and the
+    threshold alone decides.
+    """
+    from scipy.stats import ttest_ind
+
+    results = []
+    for i in [old, new]:
+        with open(i) as f:
+            results.append(json.load(f))
+        if results[-1].get('format') != suite_format:
+            raise ValueError("`%s` is not in the suite results format %d" %
+                             (i, suite_format))
+    old, new = results
+
+    info("Comparing Devito %s against %s" % (new['devito']['version'],
+                                             old['devito']['version']))
+    for k in ['host', 'configuration', 'nranks', 'parameters']:
+        if old[k] != new[k]:
+            warning("The results were obtained with a different `%s`" % k)
+
+    regressions = []
+    for case in [i for i in new['cases'] if i in old['cases']]:
+        for metric, higher in suite_metrics.items():
+            a = np.array(old['cases'][case]['metrics'].get(metric, []), dtype=float)
+            b = np.array(new['cases'][case]['metrics'].get(metric, []), dtype=float)
+            if a.size == 0 or b.size == 0 or a.mean() == 0:
+                continue
+            change = (b.mean() - a.mean())/a.mean()
+
+            if a.size < 2 or b.size < 2:
+                pvalue = None
+            elif a.std() == 0 and b.std() == 0:
+                # E.g., the memory footprint
+                pvalue = 0. if change != 0 else 1.
+            else:
+                pvalue = ttest_ind(a, b, equal_var=False).pvalue
+
+            significant = abs(change) > threshold and (pvalue is None or pvalue < alpha)
+            if not significant:
+                verdict = ''
+            elif (change > 0) == higher:
+                verdict = ' [improved]'
+            else:
+                verdict = ' [REGRESSION]'
+                regressions.append((case, metric, change, pvalue))
+
+            info("* %s/%s: %.4g -> %.4g (%+.1f%%, p=%s)%s" %
+                 (case, metric, a.mean(), b.mean(), 100*change,
+                  'n/a' if pvalue is None else '%.3f' % pvalue, verdict))
+
+    for case in [i for i in old['cases'] if i not in new['cases']]:
+        warning("The case `%s` is missing from the new results" % case)
+
+    if regressions:
+        warning("Found %d regression(s)" % len(regressions))
+    else:
+        info("No regressions found")
+
+    return regressions
+
+
 def get_ob_bench(problem, resultsdir, parameters):
     """Return a special :class:`opescibench.Benchmark` to manage performance runs."""
     try:
@@ -0,0 +1,127 @@
+"""
+Micro-benchmarks for the IET Visitors.
+
+The lookups through the per-Node indexes (i.e., the cached pre-order of the
+Nodes and the cached symbols of each sub-tree) are compared against actual
+traversals of the Iteration/Expression tree.
+
+Usage: ::
+
+    python tests/benchmark_visitors.py visitors --space-order 4 8 --repeat 10
+    python tests/benchmark_visitors.py dle --space-order 8 --openmp
+"""
+
+from time import time
+
+import click
+import numpy as np
+
+import devito.operator
+from devito import configuration, info
+from devito.ir.iet import (Expression, FindNodes, FindSymbols, Iteration,
+                           Transformer, retrieve_iteration_tree)
+from devito.ir.iet.visitors import Visitor
+from examples.seismic import demo_model, AcquisitionGeometry
+from examples.seismic.tti import AnisotropicWaveSolver
+
+
+@click.group()
+def benchmark():
+    """
+    Benchmarking script measuring the cost of visiting large Iteration/Expression
+    trees, such as those produced for a TTI Operator.
+    """
+    pass
+
+
+class TraversingFindSymbols(FindSymbols):
+
+    """A FindSymbols always traversing the Iteration/Expression tree."""
+
+    _visit = Visitor._visit
+    _post_visit = Visitor._post_visit
+
+
+def tti_operator(space_order, shape=(50, 50, 50)):
+    model = demo_model('layers-tti', spacing=(10., 10., 10.), shape=shape,
+                       nbpml=10, space_order=space_order)
+    coords = np.array([[250., 250., 30.]])
+    geometry = AcquisitionGeometry(model, coords, coords, t0=0., tn=100.,
+                                   src_type='Ricker', f0=0.010)
+    solver = AnisotropicWaveSolver(model, geometry, space_order=space_order)
+    return solver.op_fwd(kernel='centered', save=False)
+
+
+def timeit(func, repeat):
+    tic = time()
+    for _ in range(repeat):
+        func()
+    return (time() - tic) / repeat
+
+
+@benchmark.command(name='visitors')
+@click.option('--space-order', '-so', type=int, multiple=True, default=(4, 8),
+              help='Space order of the TTI Operator')
+@click.option('--repeat', '-r', type=int, default=10, help='Number of repetitions')
+def cli_visitors(space_order, repeat):
+    """
+    Time FindNodes, FindSymbols and retrieve_iteration_tree over a TTI Operator,
+    through the Node indexes and through actual tree traversals.
+    """
+    for so in space_order:
+        op = tti_operator(so)
+        info("space_order=%d: %d Nodes" % (so, len(op._preorder)))
+
+        # A tuple wrapping the Operator is always traversed
+        for match in [Expression, Iteration]:
+            indexed = timeit(lambda: FindNodes(match).visit(op), repeat)
+            traversal = timeit(lambda: FindNodes(match).visit((op,)), repeat)
+            info("  FindNodes(%s): %.5f s [traversal: %.5f s]"
+                 % (match.__name__, indexed, traversal))
+
+        indexed = timeit(lambda: FindSymbols().visit(op), repeat)
+        traversal = timeit(lambda: TraversingFindSymbols().visit(op), repeat)
+        info("  FindSymbols: %.5f s [traversal: %.5f s]" % (indexed, traversal))
+
+        elapsed = timeit(lambda: retrieve_iteration_tree(op), repeat)
+        info("  retrieve_iteration_tree: %.5f s" % elapsed)
+
+        # A rebuilt tree shares the Expressions, and therefore their indexes
+        elapsed = timeit(lambda: FindSymbols().visit(Transformer({}).visit(op.body)),
+                         repeat)
+        info("  Transformer + FindSymbols: %.5f s" % elapsed)
+
+
+@benchmark.command(name='dle')
+@click.option('--space-order', '-so', type=int, multiple=True, default=(4, 8),
+              help='Space order of the TTI Operator')
+@click.option('--openmp', is_flag=True, default=False, help='Switch on OpenMP')
+def cli_dle(space_order, openmp):
+    """
+    Time the DLE pipeline (loop blocking, SIMD, OpenMP, ...) of a TTI Operator.
+    """
+    configuration['openmp'] = openmp
+    transform = devito.operator.transform
+    elapsed = []
+
+    def timed_transform(*args, **kwargs):
+        tic = time()
+        ret = transform(*args, **kwargs)
+        elapsed.append(time() - tic)
+        return ret
+
+    devito.operator.transform = timed_transform
+    try:
+        for so in space_order:
+            elapsed.clear()
+            tic = time()
+            tti_operator(so)
+            toc = time()
+            info("space_order=%d: Operator built in %.3f s, of which DLE %.3f s"
+                 % (so, toc - tic, sum(elapsed)))
+    finally:
+        devito.operator.transform = transform
+
+
+if __name__ == "__main__":
+    benchmark()
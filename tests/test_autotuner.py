@@ -7,7 +7,7 @@ from unittest.mock import patch
 
 from conftest import skipif
 from devito import (Grid, Function, TimeFunction, Eq, Operator, configuration,
-                    switchconfig)
+                    switchconfig, bfloat16)
 from devito.data import LEFT
 
 pytestmark = skipif(['yask', 'ops'])
@@ -153,6 +153,24 @@ def test_mode_destructive():
     assert np.all(f.data == 131)
 
 
+@pytest.mark.parametrize('dtype', [np.float16, bfloat16])
+def test_compact_storage(dtype):
+    """
+    Test autotuning Operators on Functions with a compact storage data type,
+    which must not alter their values.
+    """
+    grid = Grid(shape=(32, 32, 32))
+    f = TimeFunction(name='f', grid=grid, dtype=dtype)
+    f.data[:] = 1.
+
+    op = Operator(Eq(f.forward, f + 1.), dle=('advanced', {'openmp': False,
+                                                           'blockalways': True}))
+    op.apply(time_M=9, autotune=True)
+
+    assert op._state['autotuning'][-1]['runs'] > 1
+    assert np.all(f.data.as_float()[0] == 11.)
+
+
 def test_blocking_only():
     grid = Grid(shape=(64, 64, 64))
     f = TimeFunction(name='f', grid=grid)
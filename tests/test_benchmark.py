@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from conftest import skipif
+from examples.seismic.benchmark import compare, suite, suite_format, suite_metrics
+
+pytestmark = skipif(['yask', 'ops'])
+
+
+def test_suite(tmpdir):
+    """
+    Test that the suite records, for each repetition, all of the metrics, as
+    well as the versions and configuration the results refer to.
+    """
+    filename = str(tmpdir.join('suite.json'))
+    suite(cases=['acoustic'], tn=20., repeats=2, output=filename)
+
+    with open(filename) as f:
+        results = json.load(f)
+    assert results['format'] == suite_format
+    assert results['devito']['version']
+    assert results['nranks'] == 1
+    assert list(results['cases']) == ['acoustic']
+
+    metrics = results['cases']['acoustic']['metrics']
+    assert set(metrics) == set(suite_metrics)
+    for k, v in metrics.items():
+        # Compilation is only timed upon cache misses
+        assert len(v) == 2 or (k == 'compilation' and len(v) < 2)
+        assert all(i > 0 for i in v)
+
+    # No regressions against oneself
+    assert compare(filename, filename) == []
+
+
+@pytest.mark.parametrize('old,new,regression', [
+    # Slower, consistently
+    ([1.0, 1.1, 1.0, 0.9], [0.6, 0.7, 0.6, 0.5], True),
+    # Faster
+    ([1.0, 1.1, 1.0, 0.9], [1.6, 1.7, 1.6, 1.5], False),
+    # Slower, but within the noise
+    ([1.0, 1.5, 0.5, 1.2], [0.9, 1.4, 0.4, 1.1], False),
+    # Slower, but below the threshold
+    ([1.0, 1.01, 1.0, 0.99], [0.98, 0.99, 0.98, 0.97], False),
+    # Slower, too few samples to tell, but way beyond the threshold
+    ([1.0], [0.5], True),
+])
+def test_compare(tmpdir, old, new, regression):
+    """Test that only significant slowdowns are flagged as regressions."""
+    filenames = []
+    for i, v in enumerate([old, new]):
+        results = {'format': suite_format, 'devito': {'version': str(i)},
+                   'host': {}, 'configuration': {}, 'nranks': 1, 'parameters': {},
+                   'cases': {'acoustic': {'metrics': {'gpointss': v,
+                                                      'footprint': [100]*len(v)}}}}
+        filenames.append(str(tmpdir.join('suite%d.json' % i)))
+        with open(filenames[-1], 'w') as f:
+            json.dump(results, f)
+
+    regressions = compare(*filenames)
+    if regression:
+        assert [i[:2] for i in regressions] == [('acoustic', 'gpointss')]
+    else:
+        assert regressions == []
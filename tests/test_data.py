@@ -3,8 +3,8 @@ import numpy as np
 
 from conftest import skipif
 from devito import (Grid, Function, TimeFunction, SparseTimeFunction, Dimension, # noqa
-                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT)
-from devito.data import LEFT, RIGHT, Decomposition
+                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT, bfloat16)
+from devito.data import LEFT, RIGHT, Decomposition, allocator_stats
 
 pytestmark = skipif('ops')
 
@@ -144,6 +144,83 @@ class TestDataBasic(object):
         arr.fill(2.)
         assert np.all(arr - u.data == 1.)
 
+    def test_compact_storage(self):
+        """Test Data objects carrying half precision and bfloat16 values."""
+        grid = Grid(shape=(4, 4))
+
+        u = Function(name='u', grid=grid, dtype=np.float16)
+        u.data[:] = 1.5
+        assert u.data.dtype == np.float16
+        assert u.data.nbytes == 2*16
+        assert np.all(u.data == 1.5)
+
+        v = Function(name='v', grid=grid, dtype=bfloat16)
+        assert v.data.dtype == np.uint16
+        assert v.data.nbytes == 2*16
+        # Floating point values are encoded upon assignment ...
+        v.data[:] = 1.5
+        v.data[1, :] = np.array([1., 2., 3., 1.00390625])
+        v.data[2, 2] = 2
+        assert np.all(v.data[0] == 16320)
+        # ... while bit patterns are simply copied over
+        v.data[3, :] = v.data[1, :]
+        assert np.all(bfloat16.decode(v.data[0]) == 1.5)
+        assert np.all(bfloat16.decode(v.data[1]) == [1., 2., 3., 1.])
+        assert np.all(bfloat16.decode(v.data[3]) == [1., 2., 3., 1.])
+        assert bfloat16.decode(v.data[2, 2]) == 2.
+
+        v.data.fill(1.5)
+        assert np.all(v.data == 16320)
+
+        # Arithmetic on the bit patterns is forbidden, but they can be read
+        # as single precision values
+        with pytest.raises(TypeError):
+            v.data + 1.
+        with pytest.raises(TypeError):
+            v.data *= 2
+        assert np.all(bfloat16.decode(v.data[0]) == 1.5)
+        values = v.data.as_float()
+        assert values.dtype == np.float32
+        assert np.all(values + 1. == 2.5)
+        with pytest.raises(ValueError):
+            values[:] = 0.
+        assert np.all(u.data.as_float() == np.float32(1.5))
+        assert u.data.as_float().dtype == np.float32
+
+        # Rounding to nearest, ties to even
+        values = np.array([1.01171875, 3.14159, -np.inf, np.nan], dtype=np.float32)
+        decoded = bfloat16.decode(bfloat16.encode(values))
+        assert np.all(decoded[:3] == [1.015625, 3.140625, -np.inf])
+        assert np.isnan(decoded[3])
+
+    def test_version(self):
+        """Test that any modification to the data values bumps the data version."""
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+        version = u.data._version
+        value = version.value
+
+        u.data[:] = 1.
+        assert version.value == value + 1
+        u.data[1:, 1:] *= 2.
+        assert version.value > value + 1
+        view = u.data_with_halo[1:3]
+        assert view._version is version
+
+        # Reads don't change the data version
+        value = version.value
+        assert np.sum(u.data) == 25.
+        assert np.all(u.data[0] == 1.)
+        assert version.value == value
+
+        # Nor do they in copies of the data, which are independent
+        copy = np.array(u.data)
+        copy[:] = 0.
+        assert version.value == value
+
+        u.data.fill(0.)
+        assert version.value == value + 1
+
     @skipif('yask')
     def test_illegal_indexing(self):
         """Tests that indexing into illegal entries throws an exception."""
@@ -678,6 +755,21 @@ def test_scalar_arg_substitution(t0, t1):
     assert t0.subs('t0', t1) == t1
 
 
+def test_allocator_stats():
+    """
+    Tests the accounting of the memory allocated through the allocators.
+    """
+    start = ALLOC_FLAT.nbytes
+
+    _, memfree_args = ALLOC_FLAT.alloc((64, 64), np.float32)
+    assert ALLOC_FLAT.nbytes == start + 64*64*4
+    assert ALLOC_FLAT.nbytes_peak >= ALLOC_FLAT.nbytes
+    assert allocator_stats()[repr(ALLOC_FLAT)].nbytes == ALLOC_FLAT.nbytes
+
+    ALLOC_FLAT.free(*memfree_args)
+    assert ALLOC_FLAT.nbytes == start
+
+
 @pytest.mark.skip(reason="will corrupt memory and risk crash")
 def test_oob_noguard():
     """
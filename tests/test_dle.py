@@ -5,11 +5,14 @@ import numpy as np
 import pytest
 
 from conftest import EVAL, skipif
-from devito import Grid, Function, TimeFunction, Eq, Operator, solve
+from devito import (Grid, Function, TimeFunction, Dimension, Eq, Inc, Operator,
+                    Buffer, dimensions, solve)
 from devito.dle import transform
+from devito.dle.parallelizer import Ompizer
+from devito.exceptions import DLEException, InvalidArgument
 from devito.ir.equations import DummyEq
-from devito.ir.iet import (Call, Expression, Iteration, FindNodes, iet_analyze,
-                           retrieve_iteration_tree)
+from devito.ir.iet import (Call, Expression, Iteration, FindNodes, FindSymbols,
+                           iet_analyze, retrieve_iteration_tree)
 from devito.tools import as_tuple
 from unittest.mock import patch
 
@@ -270,6 +273,242 @@ def test_dynamic_nthreads():
     assert op.arguments(time=0, nthreads=123)['nthreads'] == 123  # user supplied
 
 
+def test_scalar_reduction():
+    grid = Grid(shape=(16, 16))
+    f = Function(name='f', grid=grid)
+    f.data[:] = 2.
+    i = Dimension(name='i')
+    s = Function(name='s', shape=(1,), dimensions=(i,))
+
+    op = Operator(Inc(s[0], f*f), dle=('advanced', {'openmp': True}))
+
+    iterations = FindNodes(Iteration).visit(op)
+    assert 'reduction(+:s[0:s_vec->size[0]])' in iterations[0].pragmas[0].value
+    assert 'omp atomic' not in str(op)
+
+    op.apply()
+    assert s.data[0] == 16*16*4.
+
+
+def test_array_reduction():
+    i, j = dimensions('i j')
+    A = Function(name='A', shape=(8, 4), dimensions=(i, j))
+    b = Function(name='b', shape=(8,), dimensions=(i,))
+    x = Function(name='x', shape=(4,), dimensions=(j,))
+    A.data[:] = 1.
+    b.data[:] = 2.
+
+    # `A^T b = x`, a reduction along `i`
+    op = Operator(Inc(x, A*b), dle=('advanced', {'openmp': True}))
+
+    iterations = FindNodes(Iteration).visit(op)
+    assert 'reduction(+:x[0:x_vec->size[0]])' in iterations[0].pragmas[0].value
+    assert 'omp atomic' not in str(op)
+
+    op.apply()
+    assert np.all(x.data == 16.)
+
+
+def test_large_array_reduction():
+    """
+    Test that the reductions over arrays too large to be privatized by each
+    thread are performed through atomic updates.
+    """
+    i, j = dimensions('i j')
+    n = Ompizer.REDUCTION_MAXSIZE + 1
+    A = Function(name='A', shape=(8, n), dimensions=(i, j))
+    b = Function(name='b', shape=(8,), dimensions=(i,))
+    x = Function(name='x', shape=(n,), dimensions=(j,))
+    A.data[:] = 1.
+    b.data[:] = 2.
+
+    op = Operator(Inc(x, A*b), dle=('advanced', {'openmp': True}))
+
+    iterations = FindNodes(Iteration).visit(op)
+    assert 'reduction' not in iterations[0].pragmas[0].value
+    assert 'omp atomic' in str(op)
+
+    op.apply()
+    assert np.all(x.data == 16.)
+
+
+@pytest.mark.parametrize('exprs,shrinkable,unsafe', [
+    # Second-order wave equation: `u.backward` is dead after `u.forward` is written
+    (['Eq(u.forward, 2*u - u.backward + u.laplace)'], ['u'], []),
+    # Pointwise update
+    (['Eq(v.forward, v + v.backward)'], ['v'], []),
+    # `u.backward` read at a different point than that of `u.forward`
+    (['Eq(u.forward, 2*u - u.backward.subs(x, x+1) + u.laplace)'], [], ['u']),
+    # `u` is shrinkable, but `v`, which must have the same time size, isn't
+    (['Eq(v.forward, v + v.backward.subs(x, x+1))',
+      'Eq(u.forward, 2*u - u.backward + v)'], [], ['v']),
+])
+def test_shrink_buffers(exprs, shrinkable, unsafe):
+    """
+    Test that the TimeFunctions allocated with a one timeslot smaller circular
+    buffer, via ``save=Buffer(...)``, are checked by the ``shrinkbuffers`` option.
+    """
+    grid = Grid(shape=(12, 12))
+
+    def run(shrunk):
+        x, y = grid.dimensions  # noqa
+        kwargs = lambda name: {'save': Buffer(2)} if name in shrunk else {}
+        u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2,  # noqa
+                         **kwargs('u'))
+        v = TimeFunction(name='v', grid=grid, space_order=2, time_order=2,  # noqa
+                         **kwargs('v'))
+        u.data[:, 4:8, 4:8] = 1.
+        v.data[:] = 1.
+
+        # List comprehension would need explicit locals/globals mappings to eval
+        eqns = []
+        for i in exprs:
+            eqns.append(eval(i))
+        op = Operator(eqns, dle=('advanced', {'shrinkbuffers': True}))
+        op.apply(time_M=5)
+
+        return u, v
+
+    u0, v0 = run([])
+    u1, v1 = run(shrinkable)
+
+    # The TimeFunctions are never resized
+    for f0, f1 in [(u0, u1), (v0, v1)]:
+        assert f0._time_size == 3
+        assert f1._time_size == (2 if f1.name in shrinkable else 3)
+        assert np.all(f0.data[6 % f0._time_size] == f1.data[6 % f1._time_size])
+
+    # Too small buffers are rejected
+    if unsafe:
+        with pytest.raises(DLEException):
+            run(['u', 'v'])
+
+
+def test_shrink_unallocated_buffers():
+    """
+    Test that the ``shrinkbuffers`` option shrinks the circular buffers of the
+    TimeFunctions whose data is yet to be allocated, but not of those already
+    allocated.
+    """
+    grid = Grid(shape=(12, 12))
+
+    def run(shrinkbuffers, allocate=False):
+        u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2)
+        if allocate:
+            u.data[:] = 0.
+        op = Operator(Eq(u.forward, 2*u - u.backward + u.laplace),
+                      dle=('advanced', {'shrinkbuffers': shrinkbuffers}))
+        u.data[:, 4:8, 4:8] = 1.
+        op.apply(time_M=5)
+        return u, op
+
+    u0, _ = run(False)
+    u1, op1 = run(True)
+    u2, _ = run(True, allocate=True)
+
+    assert u0._time_size == 3
+    assert u1._time_size == 2
+    assert u1.data.shape[0] == 2
+    assert '%(2)' in str(op1)
+    assert np.all(u0.data[6 % 3] == u1.data[6 % 2])
+
+    # Already allocated TimeFunctions are never resized
+    assert u2._time_size == 3
+    assert np.all(u0.data == u2.data)
+
+    # An Operator compiled for the original buffer rejects the shrunk one
+    u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2)
+    eqn = Eq(u.forward, 2*u - u.backward + u.laplace)
+    op0 = Operator(eqn)
+    op1 = Operator(eqn, dle=('advanced', {'shrinkbuffers': True}))
+    op1.apply(time_M=5)
+    with pytest.raises(InvalidArgument):
+        op0.apply(time_M=5)
+
+
+def test_shrunk_buffer_arguments():
+    """
+    Test that an Operator may not be run with a TimeFunction whose circular buffer
+    differs from that the Operator was compiled with.
+    """
+    grid = Grid(shape=(12, 12))
+    u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2)
+    u1 = TimeFunction(name='u', grid=grid, space_order=2, time_order=2,
+                      save=Buffer(2))
+
+    op0 = Operator(Eq(u.forward, 2*u - u.backward + u.laplace))
+    op1 = Operator(Eq(u1.forward, 2*u1 - u1.backward + u1.laplace),
+                   dle=('advanced', {'shrinkbuffers': True}))
+    assert u.data.shape[0] == 3
+    assert u1.data.shape[0] == 2
+
+    op0.apply(time_M=5)
+    op1.apply(time_M=5)
+    with pytest.raises(InvalidArgument):
+        op0.apply(u=u1, time_M=5)
+    with pytest.raises(InvalidArgument):
+        op1.apply(u=u, time_M=5)
+
+
+@pytest.mark.parametrize('time_m,time_M', [(1, 10), (0, 1), (2, 2), (3, 17)])
+@pytest.mark.parametrize('dle', [{}, {'blockalways': True}, {'openmp': True}])
+def test_unroll_time(time_m, time_M, dle):
+    grid = Grid(shape=(12, 12))
+
+    def run(unrolltime):
+        u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2)
+        usave = TimeFunction(name='usave', grid=grid, save=20)
+        u.data[:, 4:8, 4:8] = 1.
+
+        eqns = [Eq(u.forward, 2*u - u.backward + 0.1*u.laplace),
+                Eq(usave, u + grid.time_dim)]
+        options = dict(dle, unrolltime=unrolltime)
+        op = Operator(eqns, dle=('advanced', options))
+        op.apply(time_m=time_m, time_M=time_M)
+
+        return u, usave, op
+
+    u0, usave0, _ = run(False)
+    u1, usave1, op = run(True)
+
+    # Within the unrolled bodies, the modulo indices are integer constants
+    unrolled = [i for i in FindNodes(Iteration).visit(op) if i.step == 3]
+    assert len(unrolled) == 1
+    assert not any(getattr(i, 'is_Modulo', False)
+                   for i in FindSymbols('free-symbols').visit(unrolled[0]))
+
+    assert np.all(u0.data == u1.data)
+    assert np.all(usave0.data == usave1.data)
+
+
+@pytest.mark.parametrize('time_m', [-3, -2, -1])
+@pytest.mark.parametrize('time_M', [-2, -1, 0, 5, 11])
+def test_unroll_time_negative(time_m, time_M):
+    """
+    Test the peeled and remainder loops of an unrolled time loop starting at a
+    negative time index, where the C integer division truncates towards zero.
+    """
+    grid = Grid(shape=(8,))
+    x, = grid.dimensions
+    t = grid.stepping_dim
+
+    def run(unrolltime):
+        # The time offsets keep the modulo indices nonnegative down to `time=-3`
+        u = TimeFunction(name='u', grid=grid, time_order=2, save=Buffer(5))
+        u.data[:] = np.arange(5).reshape(5, 1)
+
+        op = Operator(Eq(u[t+4, x], 2*u[t+3, x] + 1),
+                      dle=('advanced', {'unrolltime': unrolltime}))
+        op.apply(time_m=time_m, time_M=time_M)
+
+        return u
+
+    u0 = run(False)
+    u1 = run(True)
+
+    assert np.all(u0.data == u1.data)
+
+
 @pytest.mark.parametrize("shape", [(41,), (20, 33), (45, 31, 45)])
 def test_composite_transformation(shape):
     wo_blocking, _ = _new_operator1(shape, dle='noop')
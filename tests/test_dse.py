@@ -1,15 +1,22 @@
-from sympy import sin  # noqa
+import sympy
+from sympy import cos, sin  # noqa
 import numpy as np
 import pytest
 
 from conftest import skipif, EVAL, x, y, z  # noqa
 from devito import (Eq, Inc, Constant, Function, TimeFunction, SparseFunction,  # noqa
                     Grid, Operator, switchconfig, configuration)
-from devito.ir import Stencil, FlowGraph, FindSymbols, retrieve_iteration_tree
+from devito.ir import (Stencil, FlowGraph, FindSymbols, FindNodes, Expression,
+                       retrieve_iteration_tree)
+from devito.ir.clusters import clusterize
+from devito.ir.equations import LoweredEq
 from devito.dle import BlockDimension
-from devito.dse import common_subexprs_elimination, collect
+from devito.dse import common_subexprs_elimination, collect, fold_coefficients, rewrite
+from devito.dse import transformer
+from devito.dse.aliases import (calculate_offsets, compare, is_translated, signature,
+                                translation_invariant)
 from devito.symbolics import (xreplace_constrained, iq_timeinvariant, iq_timevarying,
-                              estimate_cost, pow_to_mul)
+                              estimate_cost, indexify, pow_to_mul, retrieve_indexed)
 from devito.tools import generator
 from devito.types import Scalar
 
@@ -159,6 +166,75 @@ def test_tti_rewrite_aggressive_opcounts(kernel, space_order, expected):
     assert summary['section1'].ops == expected
 
 
+@pytest.mark.parametrize('dse', ['basic', 'advanced'])
+def test_tti_cse_modes(dse):
+    """
+    Check that the `dag` and `iterative` CSE modes produce Operators with the
+    same operation count.
+    """
+    ops = []
+    for mode in ['dag', 'iterative']:
+        configuration['cse'] = mode
+        try:
+            op = tti_operator(dse=dse).op_fwd(kernel='centered', save=False)
+        finally:
+            configuration['cse'] = 'dag'
+        # The loop nests are outlined into efuncs by the DLE's blocking pass
+        trees = [op] + [i.root for i in op._func_table.values() if i.local]
+        ops.append(estimate_cost([i.expr for i in FindNodes(Expression).visit(trees)]))
+    assert ops[0] == ops[1] > 0
+
+
+@pytest.mark.parametrize('dse', ['advanced', 'aggressive'])
+def test_tti_parallel_rewrite(dse):
+    """
+    Check that optimizing the Clusters over multiple processes produces the
+    same Operator as the sequential DSE, names of the temporaries included.
+    """
+    ops = []
+    for nprocs in [1, 4]:
+        build = switchconfig(dse_nprocs=nprocs)(tti_operator)
+        ops.append(build(dse=dse).op_fwd(kernel='centered', save=False))
+    assert str(ops[0].ccode) == str(ops[1].ccode)
+    assert ops[0]._soname == ops[1]._soname
+
+
+def test_parallel_rewrite_shared_objects(monkeypatch):
+    """
+    Check that the Functions and Dimensions shared by Clusters optimized in
+    different processes are shipped back by reference, rather than as copies,
+    and that the processes are never forked under MPI.
+    """
+    grid = Grid(shape=(10, 10, 10))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    v = TimeFunction(name='v', grid=grid, space_order=4)
+    f = Function(name='f', grid=grid)
+
+    # Two Clusters, both reading `u`, `v` and `f`
+    eqns = [Eq(u.forward, sin(f)*cos(f)*u.laplace + v),
+            Eq(v.forward, cos(f)*sin(f)*v.laplace + u.forward.dx)]
+    clusters = clusterize([LoweredEq(indexify(i)) for i in eqns])
+    assert len(clusters) == 2
+
+    processed = [switchconfig(dse_nprocs=nprocs)(rewrite)(clusters, mode='advanced')
+                 for nprocs in [1, 2]]
+    assert [str(c.exprs) for c in processed[0]] == [str(c.exprs) for c in processed[1]]
+
+    functions = [i.function for c in processed[1] for e in c.exprs
+                 for i in retrieve_indexed(e)]
+    for i in [u, v, f]:
+        assert any(j is i for j in functions)
+    dimensions = [d for c in processed[1] for d in c.ispace.dimensions]
+    for i in grid.dimensions + (grid.time_dim,):
+        assert any(j is i for j in dimensions)
+
+    # Under MPI, the Clusters are optimized sequentially
+    monkeypatch.setattr(transformer.MPI, 'Is_initialized', lambda: True)
+    monkeypatch.setattr(transformer, 'rewrite_parallel', None)
+    sequential = switchconfig(dse_nprocs=2)(rewrite)(clusters, mode='advanced')
+    assert [str(c.exprs) for c in sequential] == [str(c.exprs) for c in processed[0]]
+
+
 # DSE manipulation
 
 
@@ -248,15 +324,135 @@ def test_xreplace_constrained_time_varying(tu, tv, tw, ti0, ti1, t0, t1,
                  ['ti0*ti1', 'r0', 'r0*t0', 'r0*t0*t1'],
                  marks=pytest.mark.xfail),
 ])
-def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected):
+@pytest.mark.parametrize('mode', ['dag', 'iterative'])
+def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected,
+                                     mode):
     counter = generator()
     make = lambda: Scalar(name='r%d' % counter()).indexify()
     processed = common_subexprs_elimination(EVAL(exprs, tu, tv, tw, ti0, ti1, t0, t1),
-                                            make)
+                                            make, mode)
     assert len(processed) == len(expected)
     assert all(str(i.rhs) == j for i, j in zip(processed, expected))
 
 
+@pytest.mark.parametrize('expr,expected', [
+    # symmetric
+    ('Eq(t0, 2.*fa[x - 1] + 2.*fa[x + 1])', 'Eq(t0, 2.0*(fa[x - 1] + fa[x + 1]))'),
+    # antisymmetric, symbolic weights
+    ('Eq(t0, t1*fa[x - 1]/t2 - t1*fa[x + 1]/t2)',
+     'Eq(t0, t1*(fa[x - 1] - fa[x + 1])/t2)'),
+    # negative weights
+    ('Eq(t0, -3.*fa[x - 1] - 3.*fa[x + 1] + fb[x])',
+     'Eq(t0, -3.0*(fa[x - 1] + fa[x + 1]) + fb[x])'),
+    # nested, with terms not to be folded
+    ('Eq(t0, t1*(t2*fa[x - 1] + t2*fa[x + 1] + fb[x - 1]*fb[x + 1] + 4.*t2))',
+     'Eq(t0, t1*(t2*(fa[x - 1] + fa[x + 1]) + 4.0*t2 + fb[x - 1]*fb[x + 1]))'),
+    # nothing to fold
+    ('Eq(t0, fa[x - 1] - fa[x + 1] + 2.*fb[x])',
+     'Eq(t0, fa[x - 1] - fa[x + 1] + 2.0*fb[x])'),
+])
+def test_fold_coefficients(fa, fb, t0, t1, t2, expr, expected):
+    expr = EVAL(expr, fa, fb, t0, t1, t2)
+    handle = fold_coefficients(expr)
+    assert str(handle) == expected
+    assert estimate_cost(handle) <= estimate_cost(expr)
+
+
+@pytest.mark.parametrize('space_order', [4, 8, 16])
+def test_fold_coefficients_opcount(space_order):
+    grid = Grid(shape=(12, 12, 12))
+    u = TimeFunction(name='u', grid=grid, space_order=space_order)
+    m = Function(name='m', grid=grid)
+    eqn = Eq(u.forward, 2*u - u.backward + (u.laplace + u.dx)/m)
+
+    ops = []
+    for dse in ['basic', 'advanced']:
+        op = Operator(eqn, dse=dse, dle='noop')
+        ops.append(estimate_cost([i.expr for i in FindNodes(Expression).visit(op)]))
+
+    # Each pair of symmetric points shares a multiplication, in each of the
+    # three (laplace) + one (dx) sums
+    assert ops[0] - ops[1] >= 4*(space_order//2)
+
+
+@pytest.mark.parametrize('accuracy', ['strict', 'relaxed'])
+def test_extract_reciprocals(accuracy):
+    """
+    Check that, unless the accuracy policy is 'strict', the divisions by
+    time-invariant Functions are turned into multiplications by reciprocals,
+    which are precomputed outside of the time loop.
+    """
+    grid = Grid(shape=(8, 8), extent=(7., 7.))
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    m = Function(name='m', grid=grid)
+    damp = Function(name='damp', grid=grid)
+    m.data[:] = 3.
+    damp.data[:] = 0.5
+    eqn = Eq(u.forward, (u + u.laplace)/(2.*m + damp))
+
+    u.data[:] = 1.
+    Operator(eqn, dse='noop')(time_M=4)
+    expected = np.array(u.data)
+
+    # The accuracy policy is 'strict' by default
+    op = Operator(eqn, dse='advanced')
+    assert len(retrieve_iteration_tree(op)) == 1
+
+    configuration['dse-accuracy'] = accuracy
+    try:
+        op = Operator(eqn, dse='advanced')
+    finally:
+        configuration['dse-accuracy'] = 'strict'
+
+    trees = retrieve_iteration_tree(op)
+    exprs = [i.expr for i in FindNodes(Expression).visit(trees[-1][-1])]
+    divisions = [i for i in exprs if any(j.is_Pow and j.exp < 0 and retrieve_indexed(j)
+                                         for j in i.rhs.atoms(sympy.Pow))]
+    if accuracy == 'strict':
+        assert len(trees) == 1
+        assert len(divisions) == 1
+    else:
+        assert len(trees) == 2
+        assert trees[0][0].dim is not grid.time_dim
+        assert len(divisions) == 0
+
+    u.data[:] = 1.
+    op(time_M=4)
+    assert np.allclose(u.data, expected, rtol=1e-6)
+
+
+def test_extract_nested_reciprocals():
+    """
+    Check that the reciprocals lifted out of the time loop do not depend on the
+    temporaries of the reciprocals nested within them.
+    """
+    grid = Grid(shape=(8, 8), extent=(7., 7.))
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    m = Function(name='m', grid=grid)
+    damp = Function(name='damp', grid=grid)
+    phi = Function(name='phi', grid=grid)
+    m.data[:] = 3.
+    damp.data[:] = 0.5
+    phi.data[:] = 2.
+    eqn = Eq(u.forward, (u + u.laplace)*m/phi +
+             u*damp*m/(m*(m + phi)*damp/phi - damp**2))
+
+    u.data[:] = 1.
+    Operator(eqn, dse='noop')(time_M=4)
+    expected = np.array(u.data)
+
+    configuration['dse-accuracy'] = 'relaxed'
+    try:
+        op = Operator(eqn, dse='advanced')
+    finally:
+        configuration['dse-accuracy'] = 'strict'
+
+    # Would otherwise fail complaining about an undefined temporary
+    u.data[:] = 1.
+    op(time_M=4)
+    assert np.allclose(u.data, expected, rtol=1e-6)
+
+
 @pytest.mark.parametrize('exprs,expected', [
     (['Eq(t0, 3.)', 'Eq(t1, 7.)', 'Eq(ti0, t0*3. + 2.)', 'Eq(ti1, t1 + t0 + 1.5)',
       'Eq(tv, (ti0 + ti1)*t0)', 'Eq(tw, (ti0 + ti1)*t1)',
@@ -344,6 +540,31 @@ def test_collect_aliases(fa, fb, fc, fd, t0, t1, t2, t3, exprs, expected):
         assert (len(v.aliased) == 1 and mapper[k] is None) or v.anti_stencil == mapper[k]
 
 
+@pytest.mark.parametrize('e1,e2', [
+    ('fa[x] + fb[x]', 'fa[x+1] + fb[x+1]'),
+    ('fa[x] + fb[x]', 'fa[x] - fb[x]'),
+    ('fa[x] + fb[x]', 'fa[x] + fb[y]'),
+    ('fa[x] + fb[x]', 'fa[x] + fa[x]'),
+    ('fc[x,y] + fd[x+1,y+2]', 'fc[x+1,y+1] + fd[x+2,y+3]'),
+    ('fc[x,y]*3. + fd[x,y]', 'fc[x,y]*2. + fd[x,y]'),
+    ('fc[x,y]*fd[x,y] + fd[x,y]', 'fc[x,y]*fd[x,y+1] + fd[x+1,y]'),
+])
+def test_aliases_signature(fa, fb, fc, fd, e1, e2):
+    """
+    Test that the hash keys used to bucket the aliasing expressions are consistent
+    with the pairwise comparison of the expressions.
+    """
+    e1 = EVAL(e1, fa, fb, fc, fd)
+    e2 = EVAL(e2, fa, fb, fc, fd)
+    assert compare(e1, e2) == (signature(e1) == signature(e2))
+
+    ofs1 = calculate_offsets(retrieve_indexed(e1, mode='all'))
+    ofs2 = calculate_offsets(retrieve_indexed(e2, mode='all'))
+    if compare(e1, e2) and ofs1 and ofs2:
+        assert is_translated(ofs1[1], ofs2[1]) ==\
+            (translation_invariant(ofs1[1]) == translation_invariant(ofs2[1]))
+
+
 @pytest.mark.parametrize('expr,expected', [
     ('Eq(t0, t1)', 0),
     ('Eq(t0, fa[x] + fb[x])', 1),
@@ -362,6 +583,19 @@ def test_estimate_cost(fa, fb, fc, t0, t1, t2, expr, expected):
     assert estimate_cost(EVAL(expr, fa, fb, fc, t0, t1, t2)) == expected
 
 
+@pytest.mark.parametrize('expr,expected', [
+    ('Eq(t0, t1*t2)', 1),
+    ('Eq(t0, cos(t1*t2))', 51),
+    ('Eq(t0, t1/t2)', 26),
+    ('Eq(t0, fa[x]/(t1 + t2))', 27),
+    ('Eq(t0, 2.*t1/(fa[x]*t2) + 1/t1)', 79),
+])
+def test_estimate_cost_weighted(fa, fb, fc, t0, t1, t2, expr, expected):
+    # Transcendental functions and divisions are much more expensive than
+    # multiplications, which makes it worth precomputing them
+    assert estimate_cost(EVAL(expr, fa, fb, fc, t0, t1, t2), True) == expected
+
+
 @pytest.mark.parametrize('exprs,exp_u,exp_v', [
     (['Eq(s, 0)', 'Eq(s, s + 4)', 'Eq(u, s)'], 4, 0),
     (['Eq(s, 0)', 'Eq(s, s + s + 4)', 'Eq(s, s + 4)', 'Eq(u, s)'], 8, 0),
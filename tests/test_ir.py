@@ -485,6 +485,61 @@ class TestDependenceAnalysis(object):
         # Sanity check: we did find all of the expected dependences
         assert len(expected) == 0
 
+    @pytest.mark.parametrize('indexed,directions,expected', [
+        ('u[x,y,z]', (Forward, Forward, Forward), (0, 0, 0)),
+        ('u[x+1,3,z-1]', (Forward, Forward, Forward), (1, 3, -1)),
+        ('u[x+1,y-2,z-1]', (Forward, Backward, Forward), (1, 2, -1)),
+        ('u[x*x+1,y,z]', (Forward, Forward, Forward), (1, 0, 0)),
+    ])
+    def test_signature(self, indexed, directions, expected):
+        """
+        Test that the TimedAccesses are split into a symbolic part and
+        integer offsets, with the offsets along Backward Dimensions negated.
+        """
+        grid = Grid(shape=(4, 4, 4))
+        x, y, z = grid.dimensions  # noqa
+
+        u = Function(name='u', grid=grid)  # noqa
+
+        ta = TimedAccess(eval(indexed), 'R', 0, dict(zip(grid.dimensions, directions)))
+        _, d, offsets = ta.signature
+        assert offsets == expected
+        assert d == directions
+
+    @pytest.mark.parametrize('exprs', [
+        ['Eq(ti0[x,y,z], ti1[x,y,z])',
+         'Eq(ti1[x,y,z], ti0[x,y,z])'],
+        ['Eq(ti3[x+1,y,z], ti1[x,y,z])',
+         'Eq(ti3[x+1,y,z], ti3[x,y,z])',
+         'Eq(ti1[x,y,z], ti3[x-1,y,z])'],
+        ['Eq(ti0[x,y,z], ti0[x,y,z])',
+         'Eq(ti1[x,y,z], ti0[x,y-1,z])',
+         'Eq(ti3[x,y,z], ti0[x-2,y,z])',
+         'Eq(ti0[x,y,z], ti3[x,y+1,z])'],
+        ['Eq(ti0[x,y,z], ti1[x,y,z])',
+         'Eq(ti3[x,y,z], ti0[fa[x],y,z])',
+         'Eq(ti1[x,3*y,z], ti0[x+1,y,z])'],
+    ])
+    def test_incremental(self, exprs, ti0, ti1, ti3, fa):
+        """
+        Test that the Scopes derived through ``add`` and ``remove`` detect the
+        same dependences as the Scopes built from scratch.
+        """
+        exprs = [LoweredEq(i) for i in EVAL(exprs, ti0.base, ti1.base, ti3.base, fa)]
+
+        def summary(scope):
+            return [(repr(d.source), d.source.mode, repr(d.sink), d.sink.mode)
+                    for d in scope.d_all]
+
+        expected = summary(Scope(exprs))
+        for i in range(len(exprs)):
+            scope = Scope(exprs[:i]).add(exprs[i:])
+            assert summary(scope) == expected
+            assert summary(Scope(exprs[:i]).add(Scope(exprs[i:]))) == expected
+
+            scope = Scope(exprs).remove(exprs[i])
+            assert summary(scope) == summary(Scope(exprs[:i] + exprs[i+1:]))
+
     def test_flow_detection(self):
         """Test detection of information flow."""
         grid = Grid((10, 10))
@@ -4,8 +4,9 @@ import pytest
 from conftest import skipif
 from devito import (Grid, Constant, Function, TimeFunction, SparseFunction,
                     SparseTimeFunction, Dimension, ConditionalDimension,
-                    SubDimension, Eq, Inc, Operator, norm, inner)
+                    SubDimension, Eq, Inc, Operator, configuration, norm, inner)
 from devito.data import LEFT, RIGHT
+from devito.exceptions import DLEException
 from devito.ir.iet import Call, Conditional, Iteration, FindNodes
 from devito.mpi import MPI, HaloExchangeBuilder, HaloSchemeEntry
 from examples.seismic.acoustic import acoustic_setup
@@ -744,6 +745,39 @@ class TestOperatorSimple(object):
         calls = FindNodes(Call).visit(op)
         assert len(calls) == 0
 
+    @pytest.mark.parallel(mode=[2, 4])
+    def test_allreduce(self):
+        grid = Grid(shape=(8, 8))
+        f = Function(name='f', grid=grid)
+        f.data[:] = 2.
+        i = Dimension(name='i')
+        s = Function(name='s', shape=(1,), dimensions=(i,), grid=grid)
+
+        op = Operator(Inc(s[0], f*f), dle=('advanced', {'mpireduce': True}))
+
+        calls = FindNodes(Call).visit(op)
+        assert [i.name for i in calls] == ['zero_s', 'allreduce_s']
+
+        # The initial value is only accounted once, not once per rank
+        s.data[0] = 1.
+        op.apply()
+        assert s.data[0] == 8*8*4. + 1.
+
+    @pytest.mark.parallel(mode=2)
+    def test_allreduce_read_within(self):
+        """
+        Test that reading the target of an MPI reduction within the Operator,
+        where only its rank-local value is available, is refused.
+        """
+        grid = Grid(shape=(8, 8))
+        f = Function(name='f', grid=grid)
+        i = Dimension(name='i')
+        s = Function(name='s', shape=(1,), dimensions=(i,), grid=grid)
+
+        with pytest.raises(DLEException):
+            Operator([Inc(s[0], f*f), Eq(f, f + s[0])],
+                     dle=('advanced', {'mpireduce': True}))
+
     @pytest.mark.parallel(mode=2)
     def test_reapply_with_different_functions(self):
         grid1 = Grid(shape=(30, 30, 30))
@@ -761,6 +795,59 @@ class TestOperatorSimple(object):
         assert np.all(f1.data == 1.)
         assert np.all(f2.data == 1.)
 
+    @pytest.mark.parallel(mode=[(2, 'basic'), (2, 'diag'), (2, 'overlap')])
+    def test_profiling(self):
+        """
+        Test that the computation and communication times of all ranks are
+        gathered into the performance summary.
+        """
+        grid = Grid(shape=(32, 32))
+        f = TimeFunction(name='f', grid=grid, space_order=2)
+
+        op = Operator(Eq(f.forward, f.laplace + 1))
+        summary = op.apply(time_M=9)
+
+        mpi = summary.mpi
+        assert mpi.nranks == grid.distributor.nprocs
+        assert np.all(mpi.compute >= 0) and np.all(mpi.comm > 0)
+        assert mpi.compute_ratio >= 1 and mpi.comm_ratio >= 1
+        assert 0 <= mpi.imbalance < 1
+        if configuration['mpi'] == 'overlap':
+            assert 0 <= mpi.overlap <= 1
+        else:
+            assert mpi.overlap is None
+
+        # The communication time is not part of the computation time
+        total = sum(summary.timings.values())
+        assert mpi.compute[grid.distributor.myrank] <= total
+
+    @pytest.mark.parametrize('time_m,time_M', [(1, 10), (0, 1), (3, 17)])
+    @pytest.mark.parallel(mode=[(2, 'basic'), (2, 'diag'), (2, 'overlap')])
+    def test_unroll_time(self, time_m, time_M):
+        """
+        Test that unrolling the time loop preserves the halo exchanges, which
+        within the unrolled bodies use integer constants as time indices.
+        """
+        grid = Grid(shape=(12, 12))
+
+        def run(unrolltime):
+            u = TimeFunction(name='u', grid=grid, space_order=2, time_order=2)
+            u.data[:, 4:8, 4:8] = 1.
+
+            op = Operator(Eq(u.forward, 2*u - u.backward + 0.1*u.laplace),
+                          dle=('advanced', {'unrolltime': unrolltime}))
+            op.apply(time_m=time_m, time_M=time_M)
+
+            return u, op
+
+        u0, _ = run(False)
+        u1, op = run(True)
+
+        unrolled = [i for i in FindNodes(Iteration).visit(op) if i.step == 3]
+        assert len(unrolled) == 1
+        assert len(FindNodes(Call).visit(unrolled[0])) > 0
+        assert np.all(u0.data == u1.data)
+
     @pytest.mark.parametrize('expr,expected', [
         ('f[t,x-1,y] + f[t,x+1,y]', {'rc', 'lc'}),
         ('f[t,x,y-1] + f[t,x,y+1]', {'cr', 'cl'}),
@@ -1284,7 +1371,6 @@ class TestIsotropicAcoustic(object):
 
 
 if __name__ == "__main__":
-    from devito import configuration
     configuration['mpi'] = True
     # TestDecomposition().test_reshape_left_right()
     # TestOperatorSimple().test_trivial_eq_2d()
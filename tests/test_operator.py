@@ -1,14 +1,18 @@
+from threading import Thread
+
 import numpy as np
 import pytest
+from sympy import cos, sin
 
 from conftest import skipif, EVAL, time, x, y, z
 from devito import (clear_cache, Grid, Eq, Operator, Constant, Function, TimeFunction,
                     SparseFunction, SparseTimeFunction, Dimension, error, SpaceDimension,
-                    NODE, CELL, configuration, switchconfig)
+                    NODE, CELL, Inc, configuration, switchconfig, bfloat16)
 from devito.ir.iet import (ArrayCast, Expression, Iteration, FindNodes,
                            IsPerfectIteration, retrieve_iteration_tree)
 from devito.ir.support import Any, Backward, Forward
-from devito.symbolics import indexify, retrieve_indexed
+from devito.operator import ArrayPool
+from devito.symbolics import evaluate, indexify, retrieve_indexed
 from devito.tools import flatten
 
 pytestmark = skipif(['yask', 'ops'])
@@ -476,6 +480,196 @@ class TestAllocation(object):
         Operator([set_f, set_g])()
         assert f.data[index] == 2.
 
+    @pytest.mark.parametrize('dtype', [np.float16, bfloat16])
+    def test_compact_storage(self, dtype):
+        """
+        Test Functions with a compact storage data type, with arithmetic
+        carried out in single precision.
+        """
+        grid = Grid(shape=(8, 8))
+        i = Dimension(name='i')
+
+        u = TimeFunction(name='u', grid=grid, space_order=2, save=4, dtype=dtype)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        s = Function(name='s', shape=(1,), dimensions=(i,), dtype=dtype)
+        u.data[0] = 1.5
+
+        op = Operator([Eq(u.forward, u + 0.25), Eq(v.forward, 2*u), Inc(s[0], u)])
+        op.apply(time_M=2)
+
+        assert np.all(u.data.as_float()[:, 3, 3] == [1.5, 1.75, 2., 2.25])
+        assert np.all(v.data[:, 3, 3] == [3.5, 4.])
+
+        # The increments are rounded to the storage data type one by one, so
+        # the reduction isn't as accurate as in single precision
+        if dtype is np.float16:
+            rnd = lambda i: np.float32(np.float16(i))  # noqa
+        else:
+            rnd = lambda i: bfloat16.decode(bfloat16.encode(i))  # noqa
+        expected = np.float32(0.)
+        for i in [1.5, 1.75, 2.]:
+            for _ in range(64):
+                expected = rnd(expected + np.float32(i))
+        assert s.data.as_float()[0] == expected
+
+        # Storage is 2 bytes per point, compute is single precision
+        assert FindNodes(ArrayCast).visit(op)[1].function is u
+        assert 'unsigned short (*restrict u)' in str(op)
+        assert all(e.dtype == np.float32 for e in FindNodes(Expression).visit(op))
+        summary = evaluate(op._mem_summary['external'], time_size=4, t_size=2,
+                           x_size=8, y_size=8, i_size=1)
+        assert summary == 2*4*12*12 + 4*2*12*12 + 2*1
+
+    @switchconfig(cache_invariants=1, dse_accuracy='relaxed')
+    def test_cache_invariants(self):
+        """
+        Test that the time-invariant Arrays are kept across Operator runs, and
+        only recomputed when the data they are computed from changes.
+        """
+        grid = Grid(shape=(8, 8), extent=(7., 7.))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = 2.
+        eqn = Eq(u.forward, u + 0.1*u.laplace/m)
+
+        op = Operator(eqn, dse='advanced')
+        assert len(op._invariants.arrays) == 1
+        assert all(i._mem_external for i in op._invariants.arrays)
+        summary = evaluate(op._mem_summary['persistent'], x_size=8, y_size=8)
+        assert summary == 4*8*8
+
+        assert op.arguments(time_M=1)['refresh_invariants'] == 1
+        op.apply(time_M=1)
+        assert op.arguments(time_M=1)['refresh_invariants'] == 0
+        op.apply(time_M=1)
+        m.data[:] = 4.
+        assert op.arguments(time_M=1)['refresh_invariants'] == 1
+        u.data[:] = 1.
+        op.apply(time_M=1)
+        assert op.arguments(time_M=1)['refresh_invariants'] == 0
+        m1 = Function(name='m', grid=grid)
+        assert op.arguments(time_M=1, m=m1)['refresh_invariants'] == 1
+
+        # In-place modifications are tracked ...
+        m.data.fill(3.)
+        assert op.arguments(time_M=1)['refresh_invariants'] == 1
+        op.apply(time_M=1)
+        np.multiply(m.data[2:4], 2., out=m.data[2:4])
+        assert op.arguments(time_M=1)['refresh_invariants'] == 1
+        op.apply(time_M=1)
+        # ... unless they bypass Data, which is a documented limitation
+        np.copyto(m.data, 4.)
+        m.data.view(np.ndarray)[:] = 4.
+        assert op.arguments(time_M=1)['refresh_invariants'] == 0
+        m.data[:] = 4.
+        u.data[:] = 1.
+        op.apply(time_M=1)
+
+        # Same results as if the Arrays were recomputed at each run
+        expected = np.array(u.data)
+        configuration['cache-invariants'] = 0
+        u.data[:] = 1.
+        Operator(eqn, dse='advanced').apply(time_M=1)
+        assert np.allclose(u.data, expected, rtol=1e-6)
+
+    @switchconfig(cache_invariants=1)
+    def test_cache_invariants_w_halo(self):
+        """
+        Test the caching of time-invariant Arrays accessed at shifted points,
+        and thus having a halo.
+        """
+        grid = Grid(shape=(8, 8), extent=(7., 7.))
+        x, y = grid.dimensions
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid, space_order=2)
+        m.data[:] = 2.
+        invariant = sin(m)*cos(m)
+        eqn = Eq(u.forward, u + 0.1*u.laplace*invariant + invariant.subs(x, x + 1)*u)
+
+        op = Operator(eqn, dse='advanced')
+        assert any(any(j != (0, 0) for j in i.halo) for i in op._invariants.arrays)
+
+        u.data[:] = 1.
+        op.apply(time_M=1)
+        expected = np.array(u.data)
+        configuration['cache-invariants'] = 0
+        u.data[:] = 1.
+        Operator(eqn, dse='advanced').apply(time_M=1)
+        assert np.allclose(u.data, expected, rtol=1e-6)
+
+    @switchconfig(pool_arrays=1, dse_accuracy='relaxed')
+    def test_pool_arrays(self):
+        """
+        Test that the temporary Arrays are drawn from a pool of buffers, which
+        are reused across Operator runs.
+        """
+        assert ArrayPool.size_class(1) == 4096
+        assert ArrayPool.size_class(2**20) == 2**20
+        assert ArrayPool.size_class(2**20 + 1) == 5*2**18
+
+        grid = Grid(shape=(8, 8), extent=(7., 7.))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        m = Function(name='m', grid=grid)
+        m.data[:] = 2.
+        eqn = Eq(u.forward, u + 0.1*u.laplace/m)
+
+        op = Operator(eqn, dse='advanced')
+        assert len(op._pooled.arrays) == 1
+        assert all(i._mem_pooled for i in op._pooled.arrays)
+        assert evaluate(op._mem_summary['pooled'], x_size=8, y_size=8) == 4*8*8
+        assert op._mem_summary['heap'] == 0
+
+        op.arguments(time_M=1)
+        buf = op._pooled.buffers[0]
+        op.apply(time_M=1)
+        assert op._pooled.buffers == []
+        op.apply(time_M=1)
+        op.arguments(time_M=1)
+        assert op._pooled.buffers[0] is buf
+
+        # Concurrent runs from different threads never share buffers
+        buffers = []
+
+        def run():
+            op.arguments(time_M=1)
+            buffers.append(op._pooled.buffers[0])
+            op._pooled.release()
+        for _ in range(2):
+            op.arguments(time_M=1)
+            thread = Thread(target=run)
+            thread.start()
+            thread.join()
+            buffers.append(op._pooled.buffers[0])
+        assert buffers[0] is not buffers[1]
+
+        # Same results as if the Arrays were allocated at each run
+        expected = np.array(u.data)
+        configuration['pool-arrays'] = 0
+        u.data[:] = 0.
+        Operator(eqn, dse='advanced').apply(time_M=1)
+        Operator(eqn, dse='advanced').apply(time_M=1)
+        assert np.allclose(u.data, expected, rtol=1e-6)
+
+    def test_pool_arrays_eviction(self):
+        """
+        Test that the least recently released buffers are freed once the idle
+        buffers exceed the capacity of the pool.
+        """
+        pool = ArrayPool(maxbytes=3*4096)
+        buffers = [pool.acquire(4096) for _ in range(3)] + [pool.acquire(8192)]
+
+        pool.release(buffers[:3])
+        assert pool.nbytes == 3*4096
+        pool.release(buffers[3:])
+        assert pool.nbytes == 4096 + 8192
+        assert pool.acquire(4096) is buffers[2]
+        assert pool.acquire(8192) is buffers[3]
+        buf = pool.acquire(4096)
+        assert all(buf is not i for i in buffers)
+
+        pool.clear()
+        assert pool.nbytes == 0
+
 
 class TestArguments(object):
 
@@ -1456,3 +1650,78 @@ class TestLoopScheduler(object):
         trees = retrieve_iteration_tree(op)
         assert len(trees) == 4
         assert all(trees[0][0] is i[0] for i in trees)
+
+    @switchconfig(fusion='traffic')
+    def test_fusion_traffic_costmodel(self, monkeypatch):
+        """
+        Test that, with the traffic-based cost model, Clusters are not fused
+        if the working set of the fused Cluster breaks the layer condition.
+        """
+        from devito.ir.clusters.algorithms import cache_size
+
+        grid = Grid(shape=(100, 100, 100))
+        fs = [TimeFunction(name='u%d' % i, grid=grid, space_order=8) for i in range(3)]
+        eqns = [Eq(f.forward, f.laplace) for f in fs]
+
+        # The 9 planes read by each stencil (~480KB) fit in half of a 1MB cache,
+        # but those read by any two stencils don't
+        monkeypatch.setattr(cache_size, 'value', 2**20)
+        op = Operator(eqns, dle='noop')
+        assert len(retrieve_iteration_tree(op)) == 3
+        report = op._state['fusion']
+        assert len(report) == 2
+        assert all(not i.fused for i in report)
+        assert all(i.cost[0] < i.cost[1] for i in report)
+
+        # With a large enough cache, all Clusters get fused
+        monkeypatch.setattr(cache_size, 'value', 2**30)
+        op = Operator(eqns, dle='noop')
+        assert len(retrieve_iteration_tree(op)) == 1
+        assert len(op._state['fusion']) == 2
+        assert all(i.fused for i in op._state['fusion'])
+
+    @switchconfig(fusion='traffic')
+    def test_fusion_traffic_dependences(self, monkeypatch):
+        """
+        Test that a Cluster isn't fused with an earlier Cluster if fusion with
+        an intervening Cluster, on which it depends, has been deemed unprofitable.
+        """
+        from devito.ir.clusters.algorithms import cache_size
+
+        grid = Grid(shape=(100, 100, 100))
+        f = Function(name='f', grid=grid, space_order=8)
+        g = Function(name='g', grid=grid, space_order=8)
+        a, b, c = [Function(name=i, grid=grid, space_order=8) for i in 'abc']
+        f.data[:] = np.random.rand(*f.shape)
+        g.data[:] = np.random.rand(*g.shape)
+
+        # `c` reads `b`, so it can't be fused with `a` if `b` isn't
+        eqns = [Eq(a, f.laplace), Eq(b, g.laplace), Eq(c, b + f.laplace)]
+        monkeypatch.setattr(cache_size, 'value', 2**30)
+        Operator(eqns).apply()
+        expected = np.array(c.data)
+
+        b.data[:] = 0.
+        c.data[:] = 0.
+        monkeypatch.setattr(cache_size, 'value', 2**20)
+        op = Operator(eqns)
+        op.apply()
+
+        assert len(retrieve_iteration_tree(op)) == 3
+        assert not any(i.fused for i in op._state['fusion'])
+        assert np.abs(c.data - expected).max() <= 1e-6*np.abs(expected).max()
+
+    @pytest.mark.parametrize('value,expected', [
+        (262144, 262144),
+        ('256 KB', 262144),
+        ('2048K', 2097152),
+        ('1 MiB', 1048576),
+        ('4 mb', 4194304),
+    ])
+    def test_fusion_cache_size(self, value, expected):
+        """
+        Test that the cache sizes reported by sysfs and by the various versions
+        of py-cpuinfo are correctly parsed.
+        """
+        from devito.ir.clusters.algorithms import parse_size
+        assert parse_size(value) == expected
@@ -7,7 +7,8 @@ from conftest import skipif
 from devito import (Constant, Eq, Function, TimeFunction, SparseFunction, Grid,
                     TimeDimension, SteppingDimension, Operator)
 from devito.mpi.routines import MPIStatusObject, MPIRequestObject
-from devito.profiling import Timer
+from devito.profiling import Timer, TimelineTimer, PerfEventTimer, ThreadTimer
+from devito.tracing import Tracer
 from devito.symbolics import IntDiv, ListInitializer, FunctionFromPointer
 from examples.seismic import (demo_model, AcquisitionGeometry,
                               TimeAxis, RickerSource, Receiver)
@@ -138,9 +139,10 @@ def test_symbolics():
     assert li == new_li
 
 
-def test_timers():
+@pytest.mark.parametrize('cls', [Timer, TimelineTimer, PerfEventTimer, ThreadTimer])
+def test_timers(cls):
     """Pickling for Timers used in Operators for C-level profiling."""
-    timer = Timer('timer', ['sec0', 'sec1'])
+    timer = cls('timer', ['sec0', 'sec1'])
     pkl_obj = pickle.dumps(timer)
     new_obj = pickle.loads(pkl_obj)
     assert new_obj.name == timer.name
@@ -149,6 +151,16 @@ def test_timers():
     assert new_obj.value._obj.sec1 == timer.value._obj.sec1 == 0.0
 
 
+def test_tracer():
+    """Pickling for Tracers used in Operators for C-level tracing."""
+    tracer = Tracer('tracer', ['section0', 'haloupdate0_0'], ['section', 'mpi'])
+    pkl_obj = pickle.dumps(tracer)
+    new_obj = pickle.loads(pkl_obj)
+    assert new_obj.name == tracer.name
+    assert new_obj.regions == tracer.regions
+    assert new_obj.categories == tracer.categories
+
+
 def test_operator_parameters():
     grid = Grid(shape=(3, 3, 3))
     f = Function(name='f', grid=grid)
@@ -0,0 +1,424 @@
+import json
+
+import pytest
+import numpy as np
+
+from conftest import skipif
+from devito import Grid, TimeFunction, Eq, Operator, configuration, switchconfig
+from devito.machine import MachineModel, measure_bandwidth, measure_gflopss
+from devito.profiling import TimelineTimer
+from devito.perfevents import PerfEvents
+from devito.registry import PerformanceRegistry, perf_registry
+from devito.tracing import trace_recorder
+
+pytestmark = skipif(['yask', 'ops'])
+
+
+class TestTimeline(object):
+
+    @pytest.mark.parametrize('period,size,nsamples,retained', [
+        (1, 100, 20, 20),
+        (3, 100, 7, 7),
+        (1, 8, 20, 8),
+        (3, 4, 7, 4),
+    ])
+    @switchconfig(profiling='timeline')
+    def test_samples(self, period, size, nsamples, retained):
+        """
+        Test that each section gets one sample every ``period`` time steps,
+        and that only the ``size`` most recent ones are retained.
+        """
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+
+        apply = switchconfig(timeline_period=period, timeline_size=size)(op.apply)
+        summary = apply(time_M=19)
+
+        assert np.all(u.data[0] == 20)
+
+        timeline = summary.timelines['section0']
+        assert timeline.period == period
+        assert timeline.nsamples == nsamples
+        assert len(timeline.samples) == retained
+        assert timeline.dropped == nsamples - retained
+        assert np.all(timeline.samples >= 0)
+        assert timeline.p50 <= timeline.p99 <= timeline.samples.max()
+        if retained == nsamples:
+            total = op._profiler.timer.value._obj.section0
+            assert np.isclose(timeline.samples.sum(), total, rtol=1e-5, atol=1e-6)
+
+    @switchconfig(timeline_period=2, timeline_size=4)
+    def test_ring_buffer(self):
+        """Test the chronological unrolling of the ring buffer."""
+        timer = TimelineTimer('timers', ['section0'])
+        obj = timer.reset()._obj
+        assert obj.period == 2 and obj.size == 4
+
+        # Emulate 13 executions of `section0`, lasting 0, 1, ..., 12 seconds
+        for i in range(13):
+            slot = (i // obj.period) % obj.size
+            prev = obj.section0_samples[slot] if i % obj.period else 0.
+            obj.section0_samples[slot] = prev + i
+
+        # Seven samples, of which the three oldest overwritten
+        assert np.all(timer.samples('section0', 13) == [6+7, 8+9, 10+11, 12])
+
+    @switchconfig(profiling='timeline', timeline_size=16)
+    def test_reuse_buffers(self):
+        """Test that the buffers are allocated once and reused across runs."""
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+        op.apply(time_M=4)
+        buf = op._profiler.timer._buffers['section0']
+        summary = op.apply(time_M=2)
+
+        assert op._profiler.timer._buffers['section0'] is buf
+        assert summary.timelines['section0'].nsamples == 3
+
+    @switchconfig(profiling='timeline')
+    def test_autotuning(self):
+        """
+        Test that the autotuning runs are not part of the timeline, as they
+        are not part of the section totals.
+        """
+        grid = Grid(shape=(64, 64, 64))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f + 1.), dle=('advanced', {'openmp': False}))
+        summary = op.apply(time=100, autotune=('basic', 'runtime'))
+
+        # Autotuning is expected to have executed 30 timesteps
+        assert summary.timelines['section0'].nsamples == 101-30
+        assert np.all(f.data[0] == 100)
+
+
+class TestTrace(object):
+
+    def test_events(self, tmpdir):
+        """
+        Test that each execution of a section is traced, within the span
+        of the Operator run.
+        """
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid)
+        filename = str(tmpdir.join('trace.json'))
+
+        @switchconfig(trace=filename)
+        def run():
+            op = Operator(Eq(u.forward, u + 1))
+            assert 'tracer' in [i.name for i in op.parameters]
+            op.apply(time_M=9)
+            return trace_recorder()
+
+        run().save(filename)
+        with open(filename) as f:
+            events = json.load(f)['traceEvents']
+
+        names = [i['name'] for i in events]
+        assert names.count('section0') >= 10
+        for i in ['arguments', 'jit-compilation', 'run', 'postprocessing']:
+            assert i in names
+
+        run = [i for i in events if i['name'] == 'run'][-1]
+        sections = [i for i in events if i['name'] == 'section0'][-10:]
+        assert all(i['cat'] == 'section' for i in sections)
+        assert all(run['ts'] <= i['ts'] for i in sections)
+        assert all(i['ts'] + i['dur'] <= run['ts'] + run['dur'] + 1 for i in sections)
+
+    def test_disabled(self):
+        """Test that nothing is traced by default."""
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+        assert op._tracer is None
+        assert 'tracer' not in [i.name for i in op.parameters]
+        assert 'tracer' not in str(op.ccode)
+        assert trace_recorder() is None
+
+
+class TestRoofline(object):
+
+    @switchconfig(profiling='advanced', roofline=(10., 100.))
+    def test_attainable(self):
+        """
+        Test that the attainable performance is bounded by the ceilings
+        provided by the user.
+        """
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        entry = op.apply(time_M=9)['section0']
+
+        assert np.isclose(entry.attainable, min(100., entry.oi*10.))
+        assert np.isclose(entry.roofline, 100*entry.gflopss/entry.attainable)
+
+    @switchconfig(profiling='advanced')
+    def test_disabled(self):
+        """Test that the roofline model is disabled by default."""
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        entry = op.apply(time_M=1)['section0']
+
+        assert entry.attainable is None
+        assert entry.roofline is None
+
+    def test_microbenchmarks(self):
+        """Test the micro-benchmarks characterising the machine."""
+        assert measure_bandwidth(size=2**16, repeat=2) > 0
+        assert measure_gflopss(niters=2**10, repeat=2) > 0
+
+
+class TestPerfEvents(object):
+
+    @switchconfig(profiling='perf', perf_events=('task-clock', 'page-faults'))
+    def test_counters(self):
+        """
+        Test that the events occurred within each section are counted. Software
+        events are used, as the hardware ones may not be available (e.g., in
+        virtual machines).
+        """
+        if PerfEvents(configuration['perf-events']).open().size == 0:
+            pytest.skip("Access to the performance counters forbidden")
+
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        summary = op.apply(time_M=9)
+
+        counters = summary.counters['section0']
+        assert list(counters) == ['task-clock', 'page-faults']
+        # The task clock, in nanoseconds, ticks while the section is running
+        assert 0 < counters['task-clock'] <= 2*summary['section0'].time*10**9
+        assert counters.ipc is None and counters.bandwidth is None
+
+    @switchconfig(profiling='perf', perf_events=('cycles', 'instructions',
+                                                 'task-clock'))
+    def test_unavailable(self):
+        """
+        Test that the Operator runs as usual, and that only the events that
+        can be counted are reported, regardless of what the kernel allows.
+        """
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        u.data[:] = np.random.rand(*u.shape)
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+        v.data[:] = u.data
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        summary = op.apply(time_M=4)
+
+        build = switchconfig(profiling='basic')(Operator)
+        build(Eq(v.forward, v.laplace + 1)).apply(time_M=4)
+        assert np.all(u.data == v.data)
+
+        events = op._profiler.timer.events
+        assert set(events) <= {'cycles', 'instructions', 'task-clock'}
+        assert bool(events) == bool(summary.counters)
+        for counters in summary.counters.values():
+            assert tuple(counters) == events
+            if 'cycles' in events and 'instructions' in events:
+                assert counters.ipc > 0
+
+
+class TestMemory(object):
+
+    def test_footprint(self):
+        """
+        Test that the memory footprint is evaluated with the runtime arguments,
+        and that the resident set size is only sampled if it is to be logged.
+        """
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        memory = op.apply(time_M=9).memory
+
+        assert memory.footprint['external'] == u.data_with_halo.nbytes
+        assert memory.footprint['total'] >= memory.footprint['external']
+        assert memory.rss is None and memory.peak is None
+        assert sum(i.nbytes for i in memory.allocators.values()) >= u.data.nbytes
+
+        memory = switchconfig(log_level='PERF')(op.apply)(time_M=9).memory
+
+        assert memory.footprint['external'] == u.data_with_halo.nbytes
+        assert 0 < memory.rss <= memory.peak
+        assert memory.peak_delta >= 0
+
+
+class TestRegistry(object):
+
+    def test_records(self):
+        """
+        Test that the Operators generating the same code share the same record,
+        accounting for all of their builds and applies.
+        """
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        ops = [Operator(Eq(u.forward, u.laplace + 1)) for _ in range(2)]
+        for op in ops:
+            op.apply(time_M=4)
+            op.apply(time_M=4, autotune=('basic', 'runtime'))
+
+        records = [v for k, v in perf_registry.records.items() if k == ops[0]._soname]
+        assert len(records) == 1
+        record = records[0]
+        assert record.name == 'Kernel'
+        assert record.nbuilds >= 2 and record.build > 0
+        assert record.ncompilations + record.ncache_hits >= 2
+        assert record.napplies >= 4
+        assert record.run >= record.sections['section0'] > 0
+        assert record.overhead > 0
+
+    def test_dump(self, tmpdir):
+        """Test the JSON and CSV dumps."""
+        registry = PerformanceRegistry()
+        record = registry.new('Kernel')
+        record.add_build(1.)
+        record.add_compilation('abc', 2., True)
+        record.add_apply(0.1, 3., {'section0': 2., 'section1': 0.5})
+        registry.new('Kernel').add_build(1.)
+
+        filename = str(tmpdir.join('registry.json'))
+        registry.save(filename)
+        with open(filename) as f:
+            records = json.load(f)
+        assert [i['soname'] for i in records] == ['abc', None]
+        assert records[0]['sections'] == {'section0': 2., 'section1': 0.5}
+        assert records[0]['napplies'] == 1 and records[1]['nbuilds'] == 1
+
+        filename = str(tmpdir.join('registry.csv'))
+        registry.save(filename)
+        with open(filename) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3
+        assert lines[0].endswith('section0,section1')
+        assert lines[2].endswith(',0.0,0.0')
+
+    def test_merge_on_resolve(self):
+        """
+        Test that the records are merged as soon as their ``soname`` is known,
+        or by name once their owner is gone, so that the registry doesn't grow
+        with the number of Operators.
+        """
+        class Owner(object):
+            pass
+
+        registry = PerformanceRegistry()
+        for _ in range(3):
+            record = registry.new('Kernel')
+            record.add_build(1.)
+            record.add_compilation('abc', 2., False)
+            record = registry.resolve(record)
+            record.add_apply(0.1, 3., {})
+        owner = Owner()
+        registry.new('Kernel', owner=owner).add_build(1.)
+
+        assert len(registry._records) == 1 and len(registry._pending) == 1
+        assert list(registry.records) == ['abc', 'Kernel']
+        record = registry.records['abc']
+        assert record.nbuilds == 3 and record.ncache_hits == 3
+        assert record.napplies == 3
+
+        del owner
+        assert len(registry._records) == 2 and len(registry._pending) == 0
+        assert registry.records['Kernel'].nbuilds == 1
+
+
+class TestPredict(object):
+
+    def test_roofline(self):
+        """
+        Test that the predicted time is that of the roofline model, and that
+        the Operator isn't run.
+        """
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        prediction = op.predict(machine=MachineModel(10., 100.), time_M=9)
+
+        assert np.all(u.data == 0)
+
+        entry = prediction['section0']
+        assert entry.ops > 0 and entry.traffic > 0
+        assert np.isclose(entry.oi, entry.ops/entry.traffic)
+        assert np.isclose(entry.time, max(entry.ops/(100.*10**9),
+                                          entry.traffic/(10.*10**9)))
+        assert entry.bound == ('memory' if entry.oi < 10. else 'compute')
+        assert prediction.time == entry.time
+        assert prediction.memory['external'] == u.data_with_halo.nbytes
+
+    @switchconfig(profiling='advanced')
+    def test_vs_apply(self):
+        """
+        Test that the predicted FLOPs and operational intensity match those
+        measured by the advanced profiler.
+        """
+        grid = Grid(shape=(64, 64))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        prediction = op.predict(machine=MachineModel(10., 100.), time_M=9)
+        summary = op.apply(time_M=9)
+
+        assert list(prediction) == list(summary)
+        entry = summary['section0']
+        assert np.isclose(prediction['section0'].oi, entry.oi)
+        assert np.isclose(prediction['section0'].ops, entry.gflopss*entry.time*10**9)
+        assert list(prediction.error(summary)) == ['section0']
+
+
+class TestThreads(object):
+
+    @switchconfig(profiling='threads', openmp=1)
+    def test_busy(self):
+        """
+        Test that the time each thread spends working is recorded, across all
+        of the parallel regions, full and remainder blocks, of a section.
+        """
+        grid = Grid(shape=(37, 37, 37))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        u.data[:] = np.random.rand(*u.shape)
+        v = TimeFunction(name='v', grid=grid, space_order=4)
+        v.data[:] = u.data
+
+        op = Operator(Eq(u.forward, u.laplace + 1), dle=('advanced', {'openmp': True}))
+        assert 'nowait' in str(op)
+        summary = op.apply(time_M=4, nthreads=3, x0_block_size=8, y0_block_size=8)
+
+        threads = summary.threads['section0']
+        assert threads.nthreads == 3
+        assert np.all(threads.busy > 0)
+        assert threads.tmax <= summary['section0'].time
+        assert 0 <= threads.imbalance < 1
+        assert threads.ratio >= 1
+
+        configuration['profiling'] = 'basic'
+        try:
+            Operator(Eq(v.forward, v.laplace + 1), dle=('advanced', {'openmp': True}))\
+                .apply(time_M=4, nthreads=3)
+        finally:
+            configuration['profiling'] = 'threads'
+        assert np.allclose(u.data, v.data)
+
+    @switchconfig(profiling='threads', openmp=0)
+    def test_no_openmp(self):
+        """Test that nothing is timed unless the generated code is multithreaded."""
+        grid = Grid(shape=(16, 16))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+
+        op = Operator(Eq(u.forward, u.laplace + 1))
+        summary = op.apply(time_M=4)
+
+        assert 'omp_get_wtime' not in str(op)
+        assert not summary.threads
@@ -1,8 +1,11 @@
+import sympy
 from sympy.abc import a, b, c, d, e
 import pytest
 
 from conftest import skipif
-from devito.tools import toposort
+from devito import Eq, Grid, Operator, TimeFunction
+from devito.symbolics.inspection import _estimate_cost
+from devito.tools import memoized_queries, memoized_query, toposort
 
 pytestmark = skipif(['yask', 'ops'])
 
@@ -20,3 +23,64 @@ def test_toposort(elements, expected):
         assert ordering == expected
     except ValueError:
         assert expected is None
+
+
+def test_memoized_query():
+    calls = []
+
+    @memoized_query
+    def query(expr):
+        calls.append(expr)
+        return [expr]
+
+    query.maxsize = 2
+
+    # Outside of a `memoized_queries` context, nothing is memoized
+    query(a + b)
+    assert len(calls) == 1
+    assert len(query.cache) == 0
+
+    with memoized_queries() as summary:
+        expr = a + b
+        assert query(expr) == [a + b]
+        assert query(expr) == [a + b]
+        assert len(calls) == 2
+        assert (query.hits, query.misses) == (1, 1)
+
+        # The returned lists may safely be modified
+        query(expr).append(c)
+        assert query(expr) == [a + b]
+
+        # The cache is keyed on identity, not on equality
+        other = sympy.Add(a, b, evaluate=False)
+        assert other == expr and other is not expr
+        assert query(other)[0] is other
+
+        # The least recently used entry is evicted first
+        query(expr)
+        query(a - b)
+        assert [i[0] for i in query.cache.values()] == [(expr,), (a - b,)]
+
+    assert summary['query'] == {'hits': 4, 'misses': 3}
+    assert len(query.cache) == 0
+    assert (query.hits, query.misses) == (0, 0)
+
+    # The caches are dropped even upon exceptions
+    with pytest.raises(ValueError):
+        with memoized_queries():
+            query(a + b)
+            raise ValueError
+    assert len(query.cache) == 0
+    assert memoized_query.active == 0
+
+    memoized_query.registry.remove(query)
+
+
+def test_memoized_queries_cleared_after_build():
+    grid = Grid(shape=(4, 4))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    op = Operator(Eq(u.forward, u.dx*u.dy + (u.dx*u.dy + 1.)**2))
+
+    assert op._state['queries']['_estimate_cost']['hits'] > 0
+    assert all(len(i.cache) == 0 for i in memoized_query.registry)
+    assert len(_estimate_cost.cache) == 0
@@ -4,8 +4,8 @@ import pytest
 
 from conftest import skipif
 from devito.ir.equations import DummyEq
-from devito.ir.iet import (Block, Expression, Callable, FindSections,
-                           FindSymbols, IsPerfectIteration, Transformer,
+from devito.ir.iet import (Block, Expression, Callable, FindNodes, FindSections,
+                           FindSymbols, IsPerfectIteration, Iteration, Transformer,
                            Conditional, printAST)
 
 pytestmark = skipif(['yask', 'ops'])
@@ -181,6 +181,41 @@ def test_find_sections(exprs, block1, block2, block3):
     assert len(found[2]) == 1
 
 
+def test_find_nodes(exprs, block1, block2, block3, block4):
+    """
+    Test that the lookups through the cached pre-order of the Nodes return the
+    same Nodes, in the same order, as actual tree traversals.
+    """
+    for block in [block1, block2, block3, block4]:
+        for match in [Expression, Iteration, Conditional]:
+            # A tuple is actually traversed
+            expected = FindNodes(match).visit((block,))
+            assert FindNodes(match).visit(block) == expected
+
+    assert FindNodes(Expression).visit(block3) == exprs
+    assert FindNodes(exprs[1], mode='scope').visit(block3) ==\
+        [block3.nodes[1].nodes[0]]
+
+
+def test_rebuild_reuses_index(block3):
+    """
+    Test that the cached pre-order and symbols of the Nodes shared by a
+    rebuilt Node are reused, rather than recomputed.
+    """
+    expected = FindSymbols().visit(block3)
+    preorders = [i._preorder for i in block3.nodes]
+
+    rebuilt = block3._rebuild(*block3.children, **block3.args_frozen)
+    assert all(i._preorder is j for i, j in zip(rebuilt.nodes, preorders))
+    assert FindNodes(Iteration).visit(rebuilt)[1:] ==\
+        FindNodes(Iteration).visit(block3)[1:]
+    assert FindSymbols().visit(rebuilt) == expected
+
+    # Callers may freely modify the returned lists
+    FindSymbols().visit(block3).clear()
+    assert FindSymbols().visit(block3) == expected
+
+
 def test_is_perfect_iteration(block1, block2, block3, block4):
     checker = IsPerfectIteration()
 